@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify, make_response
+from flask import Flask, request, jsonify, make_response, Response, stream_with_context
 import os
 from pathlib import Path
 from dotenv import load_dotenv
@@ -13,6 +13,7 @@ from service.ingredient_service import IngredientService
 from service.meal_planner_service import MealPlannerService
 from service.user_service import UserService
 from service.store_service import StoreService
+from service.store_match_service import StoreMatchService
 from service.recipe_service import RecipeService
 from service.payment_service import PaymentService
 from service.order_service import OrderService
@@ -21,6 +22,8 @@ from service.cart_service import CartService
 
 from utils.get_userid_token import get_userid_token
 from utils.authenticate_user import authenticate
+from utils.csv_stream import iter_stream_lines, GZIP_MIMETYPES
+from utils.json_provider import FastJSONProvider
 
 env_path = Path(__file__).resolve().parent.parent.parent / '.env'
 load_dotenv(dotenv_path=env_path)
@@ -29,6 +32,7 @@ secret_key = os.getenv("JWT_SECRET_KEY")
 origin_url = os.getenv("REACT_APP_URL")
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 CORS(app, supports_credentials=True, resources={r'/*': {"origins": origin_url}})
 
 RecommendationServiceSingleton.get_instance()
@@ -169,7 +173,24 @@ def update_user_details_call():
 def get_all_stores():
     page_no = request.args.get("page")
     store_service = StoreService()
-    output = store_service.get_all_stores(page_no, False)
+    output = store_service.get_all_stores(page_no, False, after=request.args.get("after"))
+    return make_response(output["response"], output['code'])
+
+
+@app.route('/api/v1/stores/nearest', methods=["GET"])
+@authenticate(Roles.USER.value)
+def get_nearest_stores():
+    store_service = StoreService()
+    output = store_service.get_nearest_stores(request.args.get("post_code"), request.args.get("limit"))
+    return make_response(output["response"], output['code'])
+
+
+@app.route('/api/v1/stores/match', methods=["GET"])
+@authenticate(Roles.USER.value)
+def match_stores_to_shopping_list():
+    user_id = get_userid_token(None)
+    store_match_service = StoreMatchService()
+    output = store_match_service.match_user_shopping_list(user_id, request.args.get("limit"))
     return make_response(output["response"], output['code'])
 
 
@@ -196,7 +217,9 @@ def get_store_inventory():
     page = request.args.get("page")
     store_id = get_userid_token('store_id')
     store_service = StoreService()
-    output = store_service.get_store_inventory(store_id, page)
+    output = store_service.get_store_inventory(store_id, page, item_type=request.args.get("type"),
+                                               name_prefix=request.args.get("name"),
+                                               sort_by=request.args.get("sort"), order=request.args.get("order"))
     return make_response(output['response'], output['code'])
 
 
@@ -234,15 +257,36 @@ def get_ingredients():
     return make_response(jsonify(output["response"]), output["code"])
 
 
+@app.route('/api/v1/ingredients/autocomplete', methods=["GET"])
+@authenticate("")
+def autocomplete_ingredients():
+    i_service = IngredientService()
+    output = i_service.autocomplete(request.args.get("q"), limit=request.args.get("limit"),
+                                    i_type=request.args.get("type"))
+    return make_response(jsonify(output["response"]), output["code"])
+
+
 @app.route('/api/v1/store-upload', methods=["POST"])
 @authenticate(Roles.STORE.value)
 def upload_store_inventory():
-    file = request.form.get("csvFile")
+    # The CSV can arrive as a raw text/csv body (optionally Content-Encoding: gzip), a multipart file or the
+    # original base64 data URL form field
     store_id = get_userid_token('store_id')
     user_id = get_userid_token(None)
-    store_image = request.form.get("store_image")
     store_service = StoreService()
-    output = store_service.update_store_onboarding(store_id, store_image=store_image, store_inventory_file=file)
+    if request.mimetype == "text/csv":
+        lines = iter_stream_lines(request.stream, is_gzip=request.content_encoding == "gzip")
+        output = store_service.update_store_onboarding(store_id, store_image=None, store_inventory_file=None,
+                                                       store_inventory_lines=lines)
+    else:
+        csv_upload = request.files.get("csvFile")
+        lines = None
+        if csv_upload:
+            is_gzip = csv_upload.mimetype in GZIP_MIMETYPES or (csv_upload.filename or "").endswith(".gz")
+            lines = iter_stream_lines(csv_upload.stream, is_gzip=is_gzip)
+        output = store_service.update_store_onboarding(store_id, store_image=request.form.get("store_image"),
+                                                       store_inventory_file=request.form.get("csvFile"),
+                                                       store_inventory_lines=lines)
     if output["code"] == 200:
         user_service = UserService()
         user_service.update_preferences({"is_onboarding_complete": True}, user_id)
@@ -261,12 +305,42 @@ def get_personalized_recipes():
     is_fetch_all = request.args.get("all")
 
     if is_fetch_all:
-        output = recipe_service.get_all_recipes(False)
+        # Keyset pages: pass the previous page's next_cursor as after
+        output = recipe_service.get_recipes_page(after=request.args.get("after"))
     else:
         output = rs_service.get_user_recommendations(user_id, page_no=page_number)
     return make_response(jsonify(output["response"]), output["code"])
 
 
+@app.route('/api/v1/recipes/export', methods=["GET"])
+@authenticate(Roles.USER.value)
+def export_recipes():
+    # Newline delimited JSON, one recipe per line, written as the database cursor is read
+    recipe_service = RecipeService()
+    lines = (app.json.dumps(recipe) + "\n" for recipe in recipe_service.export_recipes())
+    return Response(stream_with_context(lines), mimetype="application/x-ndjson")
+
+
+@app.route('/api/v1/recipes/search', methods=["GET"])
+@authenticate(Roles.USER.value)
+def search_recipes():
+    # allergens is a comma separated list of ingredient ids whose recipes are left out
+    recipe_service = RecipeService()
+    allergens = [ingredient_id for ingredient_id in request.args.get("allergens", "").split(",") if ingredient_id]
+    output = recipe_service.search_recipes(request.args.get("q"), page=request.args.get("page"),
+                                           allergens=allergens)
+    return make_response(jsonify(output["response"]), output["code"])
+
+
+@app.route('/api/v1/recipes/cache-stats', methods=["GET"])
+@authenticate("")
+def get_recommendation_cache_stats():
+    rs_service = RecommendationServiceSingleton.get_instance()
+    stats = rs_service.get_ranking_cache_stats()
+    return make_response(jsonify({"data": stats, "message": "Successfully fetched cache stats", "status": "success"}),
+                         200)
+
+
 @app.route('/api/v1/recipe/<recipe_id>', methods=["GET"])
 @authenticate(Roles.USER.value)
 def get_recipe_details(recipe_id):
@@ -281,8 +355,8 @@ def add_recipe():
     recipe_service = RecipeService()
     payload = request.get_json()
     user_id = get_userid_token(None)
-    output = recipe_service.add_user_recipe(user_id, payload)
-    return make_response(output["response"], output["code"])
+    output = recipe_service.add_recipe(user_id, payload)
+    return make_response(jsonify(output["response"]), output["code"])
 
 
 # @app.route('/api/v1/recipes-remove', methods=["GET"])
@@ -377,7 +451,7 @@ def place_user_order():
 def get_user_orders():
     user_id = get_userid_token(None)
     order_service = OrderService()
-    output = order_service.get_user_orders(user_id, False)
+    output = order_service.get_user_orders(user_id, False, page=request.args.get("page"))
     return make_response(output['response'], output['code'])
 
 
@@ -386,8 +460,7 @@ def get_user_orders():
 def get_store_orders():
     store_id = get_userid_token('store_id')
     order_service = OrderService()
-    user_service = UserService()
-    output = order_service.get_store_orders(store_id, user_service.get_all_users())
+    output = order_service.get_store_orders(store_id, page=request.args.get("page"))
     return make_response(output['response'], output['code'])
 
 
@@ -0,0 +1,83 @@
+# Compares the sparse collaborative filtering in UserPreferenceIndexService against the previous per-user loop.
+# Run from recipe-route-be:  python -m benchmarks.bench_collaborative_filtering [--users 10000 100000] [--legacy]
+import argparse
+import random
+import time
+
+from service.user_preference_index_service import UserPreferenceIndexService
+
+
+def synthetic_users(user_count, recipe_count, ingredient_count, seed=7):
+    rng = random.Random(seed)
+    return [{
+        "id": f"user{u}",
+        "favorites": [f"recipe{r}" for r in rng.sample(range(recipe_count), rng.randint(0, 20))],
+        "allergens_and_not_preferred": [f"ingredient{i}" for i in rng.sample(range(ingredient_count), rng.randint(0, 4))]
+    } for u in range(user_count)]
+
+
+def legacy_collaborative_filtering(other_users, user):
+    # Same algorithm as the previous RecommendationService.__collaborative_filtering, minus the DataFrame lookup
+    similar_users = []
+    for prefs in other_users:
+        if prefs['id'] == user['id']:
+            continue
+        common_favorites = set(user['favorites']).intersection(prefs['favorites'])
+        common_not_preferred = set(user['allergens_and_not_preferred']).intersection(
+            prefs['allergens_and_not_preferred'])
+        if len(common_favorites) > 0 or len(common_not_preferred) > 0:
+            similar_users.append((prefs['id'], len(common_favorites) - len(common_not_preferred)))
+    similar_users = sorted(similar_users, key=lambda x: x[1], reverse=True)
+
+    recommendation_list = []
+    for user_id, similarity in similar_users:
+        for prefs in other_users:
+            if prefs['id'] == user_id:
+                recommendation_list.extend(r_id for r_id in prefs['favorites'] if r_id not in recommendation_list)
+                break
+    return recommendation_list
+
+
+def timed(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--recipes", type=int, default=50000)
+    parser.add_argument("--ingredients", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument("--legacy", action="store_true", help="also time the previous per-user loop (slow)")
+    args = parser.parse_args()
+
+    for user_count in args.users:
+        users = synthetic_users(user_count, args.recipes, args.ingredients)
+        queries = users[:args.queries]
+
+        user_index = UserPreferenceIndexService()
+        load_time, _ = timed(lambda: user_index.load(users), 1)
+        user_index.recommend_recipes(queries[0], top_k=args.top_k)
+
+        sparse_time, _ = timed(lambda: [user_index.recommend_recipes(q, top_k=args.top_k) for q in queries], 3)
+        print(f"{user_count} users: load {load_time * 1000:.1f} ms, "
+              f"sparse {sparse_time / len(queries) * 1000:.2f} ms/query")
+
+        user_index.update_user(queries[0]["id"], favorites=["recipe1"])
+        rebuild_time, _ = timed(lambda: user_index.recommend_recipes(queries[0], top_k=args.top_k), 1)
+        print(f"{user_count} users: first query after a preference write {rebuild_time * 1000:.2f} ms")
+
+        if args.legacy:
+            legacy_time, _ = timed(lambda: [legacy_collaborative_filtering(users, q) for q in queries[:3]], 1)
+            print(f"{user_count} users: legacy {legacy_time / 3 * 1000:.2f} ms/query")
+
+
+if __name__ == '__main__':
+    main()
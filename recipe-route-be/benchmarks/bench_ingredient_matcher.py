@@ -0,0 +1,109 @@
+# Compares IngredientMatcher with the previous process.extractOne lookup over the whole ingredient dictionary,
+# both for speed and for agreement at the 86 confidence threshold.
+# Run from recipe-route-be:  python -m benchmarks.bench_ingredient_matcher [--queries 500] [--ingredients 2000]
+import argparse
+import random
+import time
+
+from fuzzywuzzy import process
+
+from utils.ingredient_matcher import IngredientMatcher
+
+BASES = ["chicken breast", "chicken thigh", "beef mince", "pork belly", "lamb shoulder", "salmon fillet", "cod",
+         "prawns", "tofu", "egg", "milk", "butter", "double cream", "yoghurt", "cheddar", "parmesan", "mozzarella",
+         "feta", "onion", "shallot", "garlic", "ginger", "carrot", "celery", "potato", "sweet potato", "tomato",
+         "cherry tomato", "cucumber", "courgette", "aubergine", "pepper", "chilli", "spinach", "kale", "lettuce",
+         "cabbage", "broccoli", "cauliflower", "mushroom", "pea", "sweetcorn", "green bean", "leek", "lemon", "lime",
+         "orange", "apple", "banana", "strawberry", "blueberry", "raspberry", "mango", "pineapple", "coconut milk",
+         "rice", "basmati rice", "pasta", "spaghetti", "noodles", "flour", "bread", "oats", "quinoa", "lentils",
+         "chickpeas", "kidney beans", "black beans", "sugar", "brown sugar", "honey", "maple syrup", "salt",
+         "black pepper", "paprika", "cumin", "coriander", "turmeric", "cinnamon", "nutmeg", "oregano", "basil",
+         "thyme", "rosemary", "parsley", "mint", "dill", "bay leaf", "olive oil", "vegetable oil", "sesame oil",
+         "soy sauce", "fish sauce", "vinegar", "balsamic vinegar", "mustard", "mayonnaise", "ketchup", "stock",
+         "chicken stock", "vegetable stock", "wine", "almonds", "walnuts", "peanuts", "cashews", "sesame seeds"]
+MODIFIERS = ["fresh", "dried", "ground", "smoked", "red", "green", "white", "organic", "frozen", "tinned",
+             "low fat", "free range", "baby", "large", "wholemeal", "unsalted", "extra virgin", "spring", "sweet",
+             "hot"]
+NOISE = ["finely chopped", "to taste", "sliced", "diced", "for serving", "crushed", "peeled", "minced"]
+
+
+def synthetic_ingredients(ingredient_count, seed=7):
+    rng = random.Random(seed)
+    names = list(BASES)
+    while len(names) < ingredient_count:
+        name = f"{rng.choice(MODIFIERS)} {rng.choice(BASES)}"
+        if name not in names:
+            names.append(name)
+    return {name: f"ingredient{i}" for i, name in enumerate(names)}
+
+
+def perturb(name, rng):
+    kind = rng.randrange(6)
+    if kind == 0:
+        return name.upper()
+    if kind == 1 and len(name) > 4:
+        position = rng.randrange(1, len(name) - 1)
+        return name[:position] + name[position + 1:]
+    if kind == 2 and len(name) > 4:
+        position = rng.randrange(1, len(name) - 2)
+        return name[:position] + name[position + 1] + name[position] + name[position + 2:]
+    if kind == 3:
+        return f"{name}, {rng.choice(NOISE)}"
+    if kind == 4:
+        return ' '.join(reversed(name.split()))
+    return f"{rng.choice(NOISE)} {rng.choice(['quinoa flakes', 'star anise', 'saffron threads', name])}"
+
+
+def legacy_match(ingredient_ids, name_str):
+    # Same algorithm as the previous IngredientService.get_ingredient_id once its dictionary was loaded
+    matched_ingredient, confidence = process.extractOne(str(name_str).lower(),
+                                                        [str(x).lower() for x in ingredient_ids.keys()])
+    if confidence > 86:
+        return ingredient_ids.get(matched_ingredient)
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ingredients", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--legacy-queries", type=int, default=100, help="the legacy matcher takes most of a second per query")
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    ingredient_ids = synthetic_ingredients(args.ingredients)
+    names = list(ingredient_ids.keys())
+    queries = [perturb(rng.choice(names), rng) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    matcher = IngredientMatcher(ingredient_ids)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matched = [matcher.match(query) for query in queries]
+    cold_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for query in queries:
+        matcher.match(query)
+    memo_time = time.perf_counter() - start
+
+    legacy_queries = queries[:args.legacy_queries]
+    start = time.perf_counter()
+    legacy_matched = [legacy_match(ingredient_ids, query) for query in legacy_queries]
+    legacy_time = time.perf_counter() - start
+
+    agreed = sum(1 for new, old in zip(matched, legacy_matched) if new == old)
+    print(f"{len(ingredient_ids)} ingredients: index built in {build_time * 1000:.1f} ms")
+    print(f"matcher {cold_time / len(queries) * 1000:.2f} ms/query, memoised {memo_time / len(queries) * 1e6:.1f} "
+          f"us/query, legacy {legacy_time / len(legacy_queries) * 1000:.2f} ms/query")
+    print(f"agreement with legacy at the 86 threshold: {agreed}/{len(legacy_queries)} "
+          f"({sum(1 for m in legacy_matched if m)} legacy matches, "
+          f"{sum(1 for m in matched[:len(legacy_queries)] if m)} matcher matches)")
+    for query, new, old in zip(legacy_queries, matched, legacy_matched):
+        if new != old:
+            print(f"  differs: {query!r} matcher={new} legacy={old}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# Compares FastJSONProvider with Flask's default provider on recommendation-sized payloads, timing the whole
+# jsonify path (encode + response object).
+# Run from recipe-route-be:  python -m benchmarks.bench_json_encoding [--recipes 20] [--rounds 2000]
+import argparse
+import random
+import time
+
+import numpy as np
+from bson import ObjectId
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from benchmarks.bench_ingredient_matcher import synthetic_ingredients
+from schemas.recipes import recipe_list_entity
+from utils.json_provider import FastJSONProvider
+
+
+def synthetic_recipes(recipe_count, seed=3):
+    rng = random.Random(seed)
+    names = list(synthetic_ingredients(500).keys())
+    recipes = []
+    for _ in range(recipe_count):
+        ingredients = rng.sample(names, rng.randint(6, 14))
+        recipes.append({
+            "_id": ObjectId(),
+            "title": f"{rng.choice(ingredients)} {rng.choice(['soup', 'curry', 'salad', 'stew', 'pie'])}",
+            "desc": "A quick weeknight dinner that the whole family will enjoy. " * rng.randint(1, 4),
+            "calories": float(rng.randint(150, 900)),
+            "directions": [f"Step {i}: prepare the {rng.choice(ingredients)} and cook gently." for i in range(8)],
+            "ingredients": [f"{rng.randint(1, 4)} cups {name}" for name in ingredients],
+            "formatted_ingredients": [{"ingredient": name, "qty": str(rng.randint(1, 4)), "measurement": "cups",
+                                       "id": str(ObjectId())} for name in ingredients],
+            # Ranking leaves NumPy scores on the documents
+            "final_score": np.float64(rng.random()),
+        })
+    return recipes
+
+
+def measure(app, payload, rounds):
+    with app.app_context():
+        start = time.perf_counter()
+        for _ in range(rounds):
+            app.json.response(payload).get_data()
+        return (time.perf_counter() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recipes", type=int, default=20, help="recipes per page, RecordCount.RECIPES by default")
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    payload = {"data": recipe_list_entity(synthetic_recipes(args.recipes)), "total_records": 100000,
+               "message": "Successfully fetched personalized recipes", "status": "success"}
+
+    default_app, fast_app = Flask(__name__), Flask(__name__)
+    default_app.json = DefaultJSONProvider(default_app)
+    fast_app.json = FastJSONProvider(fast_app)
+
+    with default_app.app_context():
+        size = len(default_app.json.response(payload).get_data())
+    default_time = measure(default_app, payload, args.rounds)
+    fast_time = measure(fast_app, payload, args.rounds)
+    print(f"{args.recipes} recipes, {size / 1024:.1f} KiB per response")
+    print(f"default provider {default_time * 1e6:.1f} us/response, fast provider {fast_time * 1e6:.1f} us/response "
+          f"({default_time / fast_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
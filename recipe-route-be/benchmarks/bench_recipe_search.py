@@ -0,0 +1,77 @@
+# Measures RecipeSearchService latency over a synthetic catalog, with and without allergen filtering.
+# Run from recipe-route-be:  python -m benchmarks.bench_recipe_search [--recipes 100000] [--queries 500]
+import argparse
+import random
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from benchmarks.bench_ingredient_matcher import synthetic_ingredients
+from service.recipe_search_service import RecipeSearchService
+
+DISHES = ["soup", "curry", "salad", "stew", "pie", "risotto", "stir fry", "tart", "bake", "roast", "pasta", "burger",
+          "wrap", "noodles", "casserole", "omelette", "pancakes", "smoothie", "skewers", "tacos"]
+DESCRIPTIONS = ["quick weeknight dinner", "family favourite", "easy lunch", "slow cooked comfort food",
+                "light and fresh", "spicy and warming", "make ahead meal", "perfect for summer", "ready in minutes",
+                "budget friendly"]
+STOP_WORDS = {"a", "an", "and", "the", "with", "for", "in", "of", "to"}
+
+
+def synthetic_recipes(recipe_count, ingredient_ids, seed=5):
+    rng = random.Random(seed)
+    names = list(ingredient_ids.keys())
+    recipes = []
+    for i in range(recipe_count):
+        ingredients = rng.sample(names, rng.randint(4, 12))
+        recipes.append({
+            "_id": f"{i:024x}",
+            "title": f"{rng.choice(ingredients)} {rng.choice(DISHES)}",
+            "desc": rng.choice(DESCRIPTIONS),
+            "all_ingredients": ' '.join(ingredients),
+            "formatted_ingredients": [{"id": ingredient_ids[name]} for name in ingredients],
+        })
+    return recipes
+
+
+def measure(search_service, queries, **kwargs):
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        search_service.search(query, **kwargs)
+        timings.append(time.perf_counter() - start)
+    return np.percentile(timings, 50) * 1000, np.percentile(timings, 95) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recipes", type=int, default=100000)
+    parser.add_argument("--ingredients", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(13)
+    ingredient_ids = synthetic_ingredients(args.ingredients)
+    recipe_repo = MagicMock()
+    recipe_repo.get_search_documents.return_value = synthetic_recipes(args.recipes, ingredient_ids)
+    recipe_repo.get_estimated_size.return_value = args.recipes
+    names = list(ingredient_ids.keys())
+    queries = [f"{rng.choice(names)} {rng.choice(DISHES)}" for _ in range(args.queries)]
+    allergens = [ingredient_ids[name] for name in rng.sample(names, 5)]
+
+    search_service = RecipeSearchService(recipe_repo, stop_words=STOP_WORDS)
+    start = time.perf_counter()
+    search_service.load()
+    build_time = time.perf_counter() - start
+    # The first search after a load computes the BM25 weights
+    search_service.search(queries[0])
+
+    print(f"{args.recipes} recipes: index built in {build_time:.2f} s")
+    for label, kwargs in [("first page", {}), ("fifth page", {"skip": 80}),
+                          ("5 allergens", {"excluded_ingredient_ids": allergens})]:
+        p50, p95 = measure(search_service, queries, **kwargs)
+        print(f"{label}: p50 {p50:.2f} ms, p95 {p95:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
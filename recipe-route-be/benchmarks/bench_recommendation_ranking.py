@@ -0,0 +1,125 @@
+# Compares the final-score assembly in RecommendationService.__recommendation_system against the previous loop,
+# which looked every candidate up in Python lists and scanned the DataFrame once per candidate.
+# Run from recipe-route-be:  python -m benchmarks.bench_recommendation_ranking [--recipes 2000 5000 50000] [--legacy]
+import argparse
+import random
+
+import pandas as pd
+from flask_pymongo import ObjectId
+
+from service.recommendation_service import RecommendationService, SIMILAR_USER_COUNT
+from service.recipe_index_service import RecipeIndexService
+from service.user_preference_index_service import UserPreferenceIndexService
+from benchmarks.bench_collaborative_filtering import synthetic_users, timed
+
+
+class CatalogSource:
+    # Stands in for the recipe, user and cache services so the benchmark never touches the database
+    def __init__(self, recipes):
+        self.recipes = recipes
+
+    def get_all_recipes(self, is_raw_data):
+        return self.recipes
+
+    def get_cache(self, key):
+        return True
+
+    def get_users_preferences(self, updated_since=None):
+        return []
+
+
+def synthetic_recipes(recipe_count, ingredient_count, seed=7):
+    rng = random.Random(seed)
+    recipes = []
+    for r in range(recipe_count):
+        ingredient_ids = rng.sample(range(ingredient_count), rng.randint(3, 12))
+        recipes.append({
+            "_id": ObjectId(), "title": f"Recipe {r}", "ingredients": [], "directions": [], "desc": "",
+            "categories": [], "calories": 0,
+            "formatted_ingredients": [{"ingredient": f"ingredient{i}", "id": f"ingredient{i}"}
+                                      for i in ingredient_ids],
+            "all_ingredients": ' '.join(f"ingredient{i}" for i in ingredient_ids)
+        })
+    return recipes
+
+
+def legacy_content_based_results(df, content_scores, user):
+    # Same DataFrame the previous RecommendationService.__content_based_filtering returned
+    allowed_mask, similarity_scores = content_scores(user)
+    filtered_df = df[allowed_mask].copy()
+    filtered_df['similarity_score'] = similarity_scores[allowed_mask]
+    return filtered_df.sort_values(by='similarity_score', ascending=False)
+
+
+def legacy_final_scores(df, content_based_results, collaborative_results):
+    # Same algorithm as the previous RecommendationService.__recommendation_system after both filtering steps
+    def get_index_by_recipe_id(recipe_id, content_based):
+        index = content_based[content_based['_id'] == ObjectId(recipe_id)].index
+        if not index.empty:
+            return index.item()
+
+    recommendation_list = \
+        [str(recipe_id) for recipe_id in content_based_results["_id"].tolist()] + collaborative_results
+    content_based_ids = [str(r_id) for r_id in content_based_results["_id"].tolist()]
+    final_scores = []
+    filtered_recommendation_list = []
+    for recipe_id in recommendation_list:
+        if recipe_id in content_based_ids and ObjectId(recipe_id) not in filtered_recommendation_list:
+            recipe_index = get_index_by_recipe_id(recipe_id, content_based_results)
+            final_scores.append(content_based_results.loc[recipe_index, 'similarity_score'])
+            filtered_recommendation_list.append(ObjectId(recipe_id))
+
+    recommendation_df = df.loc[df['_id'].isin(filtered_recommendation_list)].copy()
+    recommendation_df['final_score'] = final_scores
+    return recommendation_df.sort_values(by='final_score', ascending=False)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recipes", type=int, nargs="+", default=[2000, 5000, 50000])
+    parser.add_argument("--ingredients", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=10)
+    parser.add_argument("--legacy", action="store_true", help="also time the previous loop")
+    parser.add_argument("--legacy-max-recipes", type=int, default=5000,
+                        help="larger catalogs extrapolate the legacy time, which grows with the square of the size")
+    args = parser.parse_args()
+
+    legacy_measured = None
+
+    for recipe_count in args.recipes:
+        recipes = synthetic_recipes(recipe_count, args.ingredients)
+        source = CatalogSource(recipes)
+        users = synthetic_users(args.users, recipe_count, args.ingredients)
+        for user in users:
+            user["favorites"] = [str(recipes[int(r_id[len("recipe"):])]["_id"]) for r_id in user["favorites"]]
+        user_index = UserPreferenceIndexService()
+        user_index.load(users)
+        service = RecommendationService(cache_service=source, recipe_service=source, user_service=source,
+                                        is_service_provided=True, recipe_index=RecipeIndexService(),
+                                        user_index=user_index)
+        queries = users[:args.queries]
+        rank_recipes = service._RecommendationService__rank_recipes
+
+        indexed_time, _ = timed(lambda: [rank_recipes(q) for q in queries], 3)
+        print(f"{recipe_count} recipes: indexed ranking {indexed_time / len(queries) * 1000:.1f} ms/query")
+        top_time, _ = timed(lambda: [rank_recipes(q, top_k=20) for q in queries], 3)
+        print(f"{recipe_count} recipes: indexed top-20 {top_time / len(queries) * 1000:.1f} ms/query")
+
+        if args.legacy and recipe_count > args.legacy_max_recipes:
+            if legacy_measured is not None:
+                measured_count, measured_time = legacy_measured
+                estimate = measured_time * (recipe_count / measured_count) ** 2
+                print(f"{recipe_count} recipes: legacy ranking ~{estimate * 1000:.0f} ms/query (extrapolated)")
+        elif args.legacy:
+            content_scores = service._RecommendationService__content_scores
+            df = pd.DataFrame(recipes)
+            legacy_time, _ = timed(lambda: legacy_final_scores(
+                df, legacy_content_based_results(df, content_scores, queries[0]),
+                user_index.recommend_recipes(queries[0], top_k=SIMILAR_USER_COUNT)), 1)
+            legacy_measured = (recipe_count, legacy_time)
+            print(f"{recipe_count} recipes: legacy ranking {legacy_time * 1000:.1f} ms/query")
+
+
+if __name__ == '__main__':
+    main()
@@ -10,6 +10,7 @@ class Ingredient:
     def get_ingredient(self):
         return {
             "name": self.__name,
+            "name_lc": self.__name.lower(),
             "type": self.__type,
             "calorie": self.__calorie
         }
@@ -23,4 +23,5 @@ recipes_collection = db["recipes"]
 cache_collection = db["cache"]
 cart_collection = db["cart"]
 store_inventory_collection = db["store-inventory"]
+store_inventory_items_collection = db["store-inventory-items"]
 order_collection = db["orders"]
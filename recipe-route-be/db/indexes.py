@@ -0,0 +1,104 @@
+# Every index the repositories rely on, keyed by collection name. Apply them at deploy time with
+#   python -m db.indexes [--collection users --collection orders ...]
+# create_indexes is idempotent, so re-running only builds what is missing. Fields the indexed lookups rely on are
+# backfilled on older documents first, so deploy order is: run this, then start the new web workers.
+import argparse
+import logging
+
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+from db import db
+
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True),
+        IndexModel([("role", ASCENDING), ("preferences_updated_on", ASCENDING)]),
+    ],
+    "cart": [
+        IndexModel([("user_id", ASCENDING)]),
+    ],
+    "meal-plans": [
+        IndexModel([("user_id", ASCENDING)]),
+    ],
+    "stores": [
+        IndexModel([("user_id", ASCENDING)]),
+        IndexModel([("location", GEOSPHERE)]),
+    ],
+    "store-inventory": [
+        IndexModel([("store_id", ASCENDING)]),
+    ],
+    "store-inventory-items": [
+        IndexModel([("store_id", ASCENDING), ("item_id", ASCENDING)], unique=True),
+        IndexModel([("store_id", ASCENDING), ("item_type", ASCENDING), ("item_name_lc", ASCENDING)]),
+        IndexModel([("store_id", ASCENDING), ("item_name_lc", ASCENDING), ("item_id", ASCENDING)]),
+        IndexModel([("store_id", ASCENDING), ("stock_qty", ASCENDING), ("item_id", ASCENDING)]),
+        # Ingredient -> (store, price, stock) lookup used for store matching; covers the whole aggregation
+        IndexModel([("item_id", ASCENDING), ("stock_qty", ASCENDING), ("store_id", ASCENDING),
+                    ("unit_price", ASCENDING)]),
+    ],
+    "orders": [
+        IndexModel([("user_id", ASCENDING), ("created", DESCENDING)]),
+        IndexModel([("store_id", ASCENDING), ("created", DESCENDING)]),
+    ],
+    "cache": [
+        IndexModel([("key", ASCENDING)], unique=True),
+    ],
+    "ingredients": [
+        IndexModel([("type", ASCENDING), ("name_lc", ASCENDING)]),
+        IndexModel([("name_lc", ASCENDING)]),
+    ],
+    "recipes": [
+        # Fallback for recipe search while the in-process BM25 index is loading
+        IndexModel([("title", TEXT), ("desc", TEXT), ("all_ingredients", TEXT)], weights={"title": 2}),
+    ],
+}
+
+
+def backfill_ingredient_names(collection):
+    # Ingredients inserted before name_lc existed are invisible to the name lookups until it is set. An update
+    # pipeline lowercases every name on the server in one round trip; once done it only matches new gaps.
+    result = collection.update_many({"name_lc": {"$exists": False}}, [{"$set": {"name_lc": {"$toLower": "$name"}}}])
+    return result.modified_count
+
+
+BACKFILLS = {
+    "ingredients": backfill_ingredient_names,
+}
+
+
+def ensure_collection_indexes(collection):
+    if collection.name in BACKFILLS:
+        BACKFILLS[collection.name](collection)
+    return collection.create_indexes(INDEXES[collection.name])
+
+
+def ensure_indexes(collection_names=None):
+    # Returns the created index names per collection; a collection that fails (e.g. duplicate emails blocking the
+    # unique index) is logged and skipped so the others still get built
+    created, failed = {}, {}
+    for name in collection_names or INDEXES:
+        try:
+            created[name] = ensure_collection_indexes(db[name])
+        except OperationFailure as ex:
+            logging.error(f"Failed to create indexes on {name}: {ex}")
+            failed[name] = str(ex)
+    return created, failed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--collection", action="append", choices=sorted(INDEXES),
+                        help="only build the indexes of this collection, can be repeated")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    created, failed = ensure_indexes(args.collection)
+    for name, index_names in created.items():
+        logging.info(f"{name}: {', '.join(index_names)}")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
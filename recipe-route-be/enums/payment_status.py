@@ -7,3 +7,5 @@ class PaymentStatus(Enum):
     CANCELLED = "CANCELLED"
     IN_STORE_PAY = 'IN_STORE_PAY'
     PENDING = 'PENDING'
+    REFUND_PENDING = 'REFUND_PENDING'
+    REFUNDED = 'REFUNDED'
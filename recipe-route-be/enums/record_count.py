@@ -4,3 +4,5 @@ from enum import Enum
 class RecordCount(Enum):
     RECIPES = 20
     INVENTORY = 25
+    STORES = 20
+    ORDERS = 20
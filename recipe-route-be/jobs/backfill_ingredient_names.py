@@ -0,0 +1,19 @@
+# Adds name_lc (the lowercased name used by ingredient lookups and autocomplete) to ingredients inserted before it
+# existed, then builds the ingredient indexes. `python -m db.indexes` runs the same backfill, so this is only needed
+# to fix up the ingredients on their own. Safe to re-run: only ingredients without name_lc are updated.
+# Run from recipe-route-be:  python -m jobs.backfill_ingredient_names
+import logging
+
+from db import ingredients_collection
+from db.indexes import backfill_ingredient_names, ensure_collection_indexes
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    updated = backfill_ingredient_names(ingredients_collection)
+    ensure_collection_indexes(ingredients_collection)
+    logging.info(f"Done, {updated} ingredients updated")
+
+
+if __name__ == '__main__':
+    main()
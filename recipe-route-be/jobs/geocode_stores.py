@@ -0,0 +1,42 @@
+# Creates the 2dsphere index on stores.location and fills in the location of stores registered before stores were
+# geocoded, using the bundled postcode area table. Safe to re-run: only stores without a location are touched.
+# Run from recipe-route-be:  python -m jobs.geocode_stores [--dry-run]
+import argparse
+import logging
+
+from repo.store_repository import StoreRepository
+from utils.postcode_locations import get_postcode_location
+
+
+def geocode_stores(dry_run=False):
+    repo = StoreRepository()
+    if not dry_run:
+        repo.ensure_indexes()
+
+    located_count, skipped_count = 0, 0
+    for store in list(repo.get_stores_without_location()):
+        address = store.get("address")
+        location = get_postcode_location(address.get("post_code")) if isinstance(address, dict) else None
+        if location is None:
+            skipped_count += 1
+            logging.warning(f"No location for store {store['_id']}, post code not recognised")
+            continue
+        if not dry_run:
+            repo.update_store(store["_id"], {"location": location})
+        located_count += 1
+    return located_count, skipped_count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dry-run", action="store_true", help="count what would be geocoded without writing")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    located_count, skipped_count = geocode_stores(dry_run=args.dry_run)
+    logging.info(f"Done, {located_count} stores located, {skipped_count} skipped"
+                 f"{' (dry run)' if args.dry_run else ''}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+# Moves each store's embedded `inventory.{item_id}` subdocument into one store-inventory-items document per item
+# and creates the item indexes. Safe to re-run: items are upserted and migrated stores are skipped.
+# Run from recipe-route-be:  python -m jobs.migrate_store_inventory [--batch-size 1000] [--dry-run]
+import argparse
+import logging
+from datetime import datetime
+from itertools import islice
+
+from repo.store_inventory_item_repository import StoreInventoryItemRepository
+from repo.store_inventory_repository import StoreInventoryRepository
+
+
+def migrate_store_inventory(batch_size=1000, dry_run=False):
+    inventory_repo = StoreInventoryRepository()
+    item_repo = StoreInventoryItemRepository()
+    if not dry_run:
+        item_repo.ensure_indexes()
+
+    store_count, item_count = 0, 0
+    for inventory in inventory_repo.get_unmigrated_inventories():
+        store_id = str(inventory["store_id"])
+        items = iter(inventory["inventory"].items())
+        while True:
+            batch = dict(islice(items, batch_size))
+            if not batch:
+                break
+            if not dry_run:
+                item_repo.upsert_items(store_id, batch)
+            item_count += len(batch)
+        if not dry_run:
+            inventory_repo.mark_inventory_migrated(inventory["store_id"], datetime.now())
+        store_count += 1
+        logging.info(f"Migrated {len(inventory['inventory'])} items for store {store_id}")
+    return store_count, item_count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="count what would be migrated without writing")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    store_count, item_count = migrate_store_inventory(batch_size=args.batch_size, dry_run=args.dry_run)
+    logging.info(f"Done, {item_count} items from {store_count} stores{' (dry run)' if args.dry_run else ''}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# Parses recipe ingredients offline and records the pipeline version so web workers never do it on boot.
+# Run from recipe-route-be:  python -m jobs.preprocess_recipes [--all] [--workers 4] [--batch-size 500]
+import argparse
+import logging
+import os
+import time
+from multiprocessing import Pool
+
+from nltk.corpus import stopwords
+
+from repo.cache_repository import CacheRepository
+from repo.ingredient_repository import IngredientRepository
+from repo.recipe_repository import RecipeRepository
+from service.recipe_index_service import RecipeIndexService, MODEL_DIR
+from utils.ingredient_matcher import IngredientMatcher
+from utils.recipe_preprocessing import preprocess_recipe, PREPROCESSING_VERSION, PREPROCESSING_VERSION_KEY
+
+_worker_state = {}
+
+
+def _init_worker(stop_words, ingredient_ids):
+    _worker_state["stop_words"] = stop_words
+    _worker_state["matcher"] = IngredientMatcher(ingredient_ids)
+
+
+def _preprocess(recipe):
+    fields = preprocess_recipe(recipe, _worker_state["stop_words"], _worker_state["matcher"].match)
+    return str(recipe["_id"]), fields
+
+
+def preprocess_recipes(include_processed=False, workers=None, batch_size=500):
+    recipe_repo = RecipeRepository()
+    stop_words = set(stopwords.words('english'))
+    ingredient_ids = {str(ingredient["name"]).lower(): str(ingredient["_id"])
+                      for ingredient in IngredientRepository().get_all()}
+    recipes = list(recipe_repo.get_recipes_to_preprocess(include_processed))
+    logging.info(f"Preprocessing {len(recipes)} recipes on {workers or os.cpu_count()} workers")
+
+    started_on = time.perf_counter()
+
+    def report_progress(progress):
+        rate = (progress["processed"] + progress["errors"]) / (time.perf_counter() - started_on)
+        logging.info(f"Preprocessed {progress['processed']}/{len(recipes)} recipes ({rate:.0f} recipes/s, "
+                     f"{progress['errors']} write errors)")
+
+    with Pool(workers, initializer=_init_worker, initargs=(stop_words, ingredient_ids)) as pool:
+        results = pool.imap_unordered(_preprocess, recipes, chunksize=max(1, batch_size // 10))
+        progress = recipe_repo.update_all(({"_id": recipe_id, **fields} for recipe_id, fields in results),
+                                          batch_size=batch_size, progress_callback=report_progress)
+    processed = progress["processed"]
+    if progress["errors"]:
+        # Leave the version marker alone so web workers keep warning until a rerun writes every recipe
+        logging.error(f"{progress['errors']} recipes failed to save; the recipe index and the pipeline version "
+                      f"were not updated. Rerun the job.")
+        return processed
+
+    # Refits the TF-IDF vocabulary over the whole catalog. This is the only writer of the stored index, so it also
+    # picks up recipes web workers added since the last run.
+    catalog = [recipe for recipe in recipe_repo.get_all() if "all_ingredients" in recipe]
+    RecipeIndexService(model_dir=MODEL_DIR).rebuild([recipe["_id"] for recipe in catalog],
+                                                    [recipe["all_ingredients"] for recipe in catalog])
+    CacheRepository().update_cache(PREPROCESSING_VERSION_KEY, PREPROCESSING_VERSION)
+    return processed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--all", action="store_true", help="reprocess recipes that were already preprocessed")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    processed = preprocess_recipes(include_processed=args.all, workers=args.workers, batch_size=args.batch_size)
+    logging.info(f"Done, {processed} recipes preprocessed (pipeline version {PREPROCESSING_VERSION})")
+
+
+if __name__ == '__main__':
+    main()
@@ -16,7 +16,7 @@ class CacheRepository:
         self.cache.insert_one({"key": key, "value": value})
 
     def update_cache(self, key, value):
-        self.cache.update_one({"key": key}, {"$set": {"value": value}})
-
-
+        self.cache.update_one({"key": key}, {"$set": {"value": value}}, upsert=True)
 
+    def increment_cache(self, key):
+        self.cache.update_one({"key": key}, {"$inc": {"value": 1}}, upsert=True)
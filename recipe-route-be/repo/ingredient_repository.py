@@ -1,4 +1,9 @@
+import re
+
 from db import ingredients_collection
+from pymongo import ASCENDING
+
+AUTOCOMPLETE_PROJECTION = {"name": 1, "type": 1}
 
 
 class IngredientRepository:
@@ -9,8 +14,21 @@ class IngredientRepository:
         result = self.ingredients.insert_one(ingredient)
         return result
 
+    def add_ingredients(self, ingredients):
+        result = self.ingredients.insert_many(ingredients, ordered=False)
+        return result
+
     def get_ingredient(self, name):
-        result = self.ingredients.find({"name": {"$regex": name, "$options": "i"}})
+        # name_lc is the lowercased name, so this is a case-insensitive exact match on an index
+        result = self.ingredients.find_one({"name_lc": str(name).lower()})
+        return result
+
+    def search_by_prefix(self, prefix, limit, i_type=None):
+        # Anchored and escaped, so the regex is a bounded range scan on the name_lc index
+        query = {"name_lc": {"$regex": "^" + re.escape(prefix.lower())}}
+        if i_type:
+            query["type"] = i_type
+        result = self.ingredients.find(query, AUTOCOMPLETE_PROJECTION).sort("name_lc", ASCENDING).limit(limit)
         return result
 
     def get_by_id_list(self, id_list):
@@ -21,6 +39,11 @@ class IngredientRepository:
         result = self.ingredients.find({"type": i_type})
         return result
 
+    def get_names(self, since_id=None):
+        query = {"_id": {"$gt": since_id}} if since_id else {}
+        result = self.ingredients.find(query, {"name": 1})
+        return result
+
     def get_all(self):
         result = self.ingredients.find()
         return result
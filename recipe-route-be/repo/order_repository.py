@@ -1,21 +1,35 @@
 from db import order_collection
+from db.indexes import ensure_collection_indexes
+from pymongo import DESCENDING
+
+# Newest first; orders placed before "created" was recorded sort last, by _id
+ORDER_SORT = [("created", DESCENDING), ("_id", DESCENDING)]
 
 
 class OrderRepository:
     def __init__(self):
         self.orders = order_collection
 
-    def add_order(self, order):
-        return self.orders.insert_one(order)
+    def ensure_indexes(self):
+        ensure_collection_indexes(self.orders)
+
+    def add_order(self, order, session=None):
+        return self.orders.insert_one(order, session=session)
 
-    def get_user_orders(self, user_id):
-        return self.orders.find({"user_id": user_id})
+    def get_user_orders(self, user_id, skip=0, limit=0):
+        return self.orders.find({"user_id": user_id}).sort(ORDER_SORT).skip(skip).limit(limit)
+
+    def count_user_orders(self, user_id):
+        return self.orders.count_documents({"user_id": user_id})
 
     def get_all(self):
         return self.orders.find({})
 
-    def get_store_orders(self, store_id):
-        return self.orders.find({"store_id": store_id})
+    def get_store_orders(self, store_id, skip=0, limit=0):
+        return self.orders.find({"store_id": store_id}).sort(ORDER_SORT).skip(skip).limit(limit)
+
+    def count_store_orders(self, store_id):
+        return self.orders.count_documents({"store_id": store_id})
 
     def update_order(self, query, data ):
         return self.orders.update_one(query, {"$set": data})
@@ -1,5 +1,15 @@
 from db import recipes_collection
 from flask_pymongo import ObjectId
+from pymongo import ASCENDING, UpdateOne
+from pymongo.errors import BulkWriteError
+
+UPDATE_BATCH_SIZE = 1000
+EXPORT_BATCH_SIZE = 500
+
+PREPROCESSING_PROJECTION = {"title": 1, "ingredients": 1, "directions": 1}
+RECIPE_LIST_PROJECTION = {"title": 1, "desc": 1, "calories": 1, "directions": 1, "ingredients": 1,
+                          "formatted_ingredients": 1}
+SEARCH_PROJECTION = {"title": 1, "desc": 1, "all_ingredients": 1, "formatted_ingredients.id": 1}
 
 
 class RecipeRepository:
@@ -14,18 +24,81 @@ class RecipeRepository:
         result = self.recipes.find_one({"_id": ObjectId(r_id)})
         return result
 
+    def get_recipes_by_ids(self, recipe_ids):
+        result = self.recipes.find({"_id": {"$in": [ObjectId(r_id) for r_id in recipe_ids]}}, RECIPE_LIST_PROJECTION)
+        return result
+
+    def get_page(self, limit, after_id=None):
+        # Pages in _id order; after_id continues from the last recipe of the previous page without skipping
+        query = {"_id": {"$gt": ObjectId(after_id)}} if after_id else {}
+        result = self.recipes.find(query, RECIPE_LIST_PROJECTION).sort("_id", ASCENDING).limit(limit)
+        return result
+
+    def iter_recipes(self, batch_size=EXPORT_BATCH_SIZE):
+        # Documents are fetched batch_size at a time as the cursor is consumed
+        result = self.recipes.find({}, RECIPE_LIST_PROJECTION).sort("_id", ASCENDING).batch_size(batch_size)
+        return result
+
+    def get_search_documents(self):
+        result = self.recipes.find({}, SEARCH_PROJECTION)
+        return result
+
+    def search_text(self, text, excluded_ingredient_ids, skip, limit):
+        # Uses the recipes text index; returns (recipe ids of the page, total matching recipes)
+        query = {"$text": {"$search": text}}
+        if excluded_ingredient_ids:
+            query["formatted_ingredients.id"] = {"$nin": excluded_ingredient_ids}
+        total = self.recipes.count_documents(query)
+        cursor = self.recipes.find(query, {"_id": 1, "score": {"$meta": "textScore"}}) \
+            .sort([("score", {"$meta": "textScore"}), ("_id", 1)]).skip(skip).limit(limit)
+        return [str(recipe["_id"]) for recipe in cursor], total
+
     def get_all(self):
         result = self.recipes.find()
         return result
 
-    def update_all(self, data_list):
-        result = []
+    def get_recipes_to_preprocess(self, include_processed=False):
+        query = {} if include_processed else {"formatted_ingredients": {"$exists": False}}
+        result = self.recipes.find(query, PREPROCESSING_PROJECTION)
+        return result
+
+    def update_all(self, data_list, batch_size=UPDATE_BATCH_SIZE, progress_callback=None):
+        # data_list can be any iterable of documents with an _id, so callers can stream results into it.
+        # processed only counts writes that went through; failed ones are counted in errors.
+        result = {"matched": 0, "modified": 0, "errors": 0, "processed": 0}
+        batch = []
         for data in data_list:
-            result.append(self.recipes.update_one({"_id": ObjectId(data["_id"])}, {"$set": data}))
+            # _id is immutable, so $set must not carry it even when it holds the same value
+            fields = {key: value for key, value in data.items() if key != "_id"}
+            batch.append(UpdateOne({"_id": ObjectId(data["_id"])}, {"$set": fields}))
+            if len(batch) >= batch_size:
+                self.__write_batch(batch, result, progress_callback)
+                batch = []
+        if batch:
+            self.__write_batch(batch, result, progress_callback)
         return result
 
+    def __write_batch(self, batch, result, progress_callback):
+        errors = 0
+        try:
+            batch_result = self.recipes.bulk_write(batch, ordered=False).bulk_api_result
+        except BulkWriteError as ex:
+            # Unordered batches still apply every operation that did not fail
+            batch_result = ex.details
+            errors = len(batch_result.get("writeErrors", []))
+        result["matched"] += batch_result.get("nMatched", 0)
+        result["modified"] += batch_result.get("nModified", 0)
+        result["errors"] += errors
+        result["processed"] += len(batch) - errors
+        if progress_callback:
+            progress_callback(result)
+
     def remove_one(self, doc_id):
         self.recipes.delete_one({"_id": doc_id})
 
     def get_collection_size(self):
         return self.recipes.count_documents({})
+
+    def get_estimated_size(self):
+        # Reads the collection metadata instead of counting, cheap enough to poll
+        return self.recipes.estimated_document_count()
@@ -0,0 +1,125 @@
+import re
+
+from db import client, store_inventory_items_collection
+from db.indexes import ensure_collection_indexes
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+ITEM_PROJECTION = {"_id": 0, "store_id": 0, "import_id": 0, "item_name_lc": 0}
+SORT_FIELDS = {"name": "item_name_lc", "stock": "stock_qty"}
+STOCK_DECREMENT_ATTEMPTS = 3
+
+
+class StoreInventoryItemRepository:
+    # One document per store item, keyed by (store_id, item_id) where item_id is the ingredient id
+    def __init__(self):
+        self.__client = client
+        self.__items = store_inventory_items_collection
+
+    def ensure_indexes(self):
+        ensure_collection_indexes(self.__items)
+
+    @staticmethod
+    def __with_name_lc(item):
+        # item_name_lc backs the anchored name prefix search and the name sort
+        if "item_name" not in item:
+            return item
+        return {**item, "item_name_lc": str(item["item_name"]).lower()}
+
+    def get_items(self, store_id, item_ids=None):
+        query = {"store_id": store_id}
+        if item_ids is not None:
+            query["item_id"] = {"$in": list(item_ids)}
+        result = self.__items.find(query, ITEM_PROJECTION)
+        return result
+
+    def get_items_page(self, store_id, item_type=None, name_prefix=None, sort_by="name", descending=False, skip=0,
+                       limit=25):
+        query = {"store_id": store_id}
+        if item_type:
+            query["item_type"] = item_type
+        if name_prefix:
+            query["item_name_lc"] = {"$regex": "^" + re.escape(name_prefix.lower())}
+        direction = DESCENDING if descending else ASCENDING
+        items = self.__items.find(query, ITEM_PROJECTION).sort(
+            [(SORT_FIELDS[sort_by], direction), ("item_id", direction)]).skip(skip).limit(limit)
+        return list(items), self.__items.count_documents(query)
+
+    def get_store_matches(self, item_ids, limit):
+        # Stores ranked by how many of item_ids they have in stock, then by the summed unit price of those items
+        result = self.__items.aggregate([
+            {"$match": {"item_id": {"$in": list(item_ids)}, "stock_qty": {"$gt": 0}}},
+            {"$group": {"_id": "$store_id", "matched_count": {"$sum": 1}, "total_price": {"$sum": "$unit_price"},
+                        "item_ids": {"$push": "$item_id"}}},
+            {"$sort": {"matched_count": -1, "total_price": 1, "_id": 1}},
+            {"$limit": limit}
+        ])
+        return result
+
+    def is_exist(self, store_id, item_id):
+        return self.__items.count_documents({"store_id": store_id, "item_id": item_id}, limit=1)
+
+    def add_item(self, store_id, item_id, item):
+        try:
+            result = self.__items.insert_one({**self.__with_name_lc(item), "store_id": store_id,
+                                              "item_id": item_id})
+        except DuplicateKeyError:
+            return None
+        return result
+
+    def update_item(self, store_id, item_id, item):
+        result = self.__items.update_one({"store_id": store_id, "item_id": item_id},
+                                          {"$set": self.__with_name_lc(item)})
+        return result
+
+    def upsert_items(self, store_id, items, import_id=None):
+        # items maps item ids to the fields to $set
+        if import_id:
+            items = {item_id: {**item, "import_id": import_id} for item_id, item in items.items()}
+        operations = [UpdateOne({"store_id": store_id, "item_id": item_id}, {"$set": self.__with_name_lc(item)},
+                                upsert=True) for item_id, item in items.items()]
+        if not operations:
+            return None
+        result = self.__items.bulk_write(operations, ordered=False)
+        return result
+
+    def decrement_stock(self, store_id, quantities, on_decremented=None):
+        # Takes quantities off every item or off none of them. Returns the items without enough stock as
+        # item id -> {"requested", "available"}, empty when the stock was decremented.
+        # on_decremented(session) runs inside the same transaction once the stock is taken, so its writes are
+        # committed or rolled back together with the decrement.
+        if not quantities:
+            if on_decremented:
+                on_decremented(None)
+            return {}
+        operations = [UpdateOne({"store_id": store_id, "item_id": item_id, "stock_qty": {"$gte": qty}},
+                                {"$inc": {"stock_qty": -qty}}) for item_id, qty in quantities.items()]
+        for _ in range(STOCK_DECREMENT_ATTEMPTS):
+            with self.__client.start_session() as session:
+                shortfalls = session.with_transaction(
+                    lambda s: self.__apply_decrement(store_id, quantities, operations, s, on_decremented))
+            if shortfalls is not None:
+                return shortfalls
+        raise OperationFailure("Stock kept changing while it was being decremented.")
+
+    def __apply_decrement(self, store_id, quantities, operations, session, on_decremented):
+        stock = {item["item_id"]: item.get("stock_qty", 0) for item in self.__items.find(
+            {"store_id": store_id, "item_id": {"$in": list(quantities)}}, {"_id": 0, "item_id": 1, "stock_qty": 1},
+            session=session)}
+        shortfalls = {item_id: {"requested": qty, "available": stock.get(item_id, 0)}
+                      for item_id, qty in quantities.items() if stock.get(item_id, 0) < qty}
+        if shortfalls:
+            session.abort_transaction()
+            return shortfalls
+        result = self.__items.bulk_write(operations, ordered=False, session=session)
+        if result.matched_count != len(operations):
+            # An item changed after it was read, so nothing is written and the caller tries again
+            session.abort_transaction()
+            return None
+        if on_decremented:
+            on_decremented(session)
+        return {}
+
+    def remove_items_not_imported(self, store_id, import_id):
+        result = self.__items.delete_many({"store_id": store_id, "import_id": {"$ne": import_id}})
+        return result
@@ -9,16 +9,11 @@ class StoreInventoryRepository:
         result = self.__store_inventory.insert_one(data)
         return result
 
-    def get_inventory(self, store_id):
-        result = self.__store_inventory.find_one({"store_id": store_id})
+    def get_unmigrated_inventories(self):
+        result = self.__store_inventory.find({"inventory": {"$nin": [{}, None]}})
         return result
 
-    def update_inventory(self, store_id, inventory_data):
-        result = self.__store_inventory.update_one({"store_id": store_id}, {"$set": inventory_data})
+    def mark_inventory_migrated(self, store_id, migrated_on):
+        result = self.__store_inventory.update_one({"store_id": store_id},
+                                                   {"$set": {"inventory": {}, "inventory_migrated_on": migrated_on}})
         return result
-
-    def replace_store_inventory(self, query, store_inventory):
-        return self.__store_inventory.replace_one(query, store_inventory)
-
-    def is_exist(self, query):
-        return self.__store_inventory.count_documents(query)
@@ -1,5 +1,10 @@
 from db import stores_collection
+from db.indexes import ensure_collection_indexes
 from flask_pymongo import ObjectId
+from pymongo import ASCENDING
+
+# Fields store_entity reads
+STORE_LIST_PROJECTION = {"store_name": 1, "address": 1, "business_phonenumber": 1, "store_image": 1}
 
 
 class StoreRepository:
@@ -14,10 +19,42 @@ class StoreRepository:
         result = self.stores.find_one(query)
         return result
 
+    def get_stores_by_ids(self, store_ids):
+        result = self.stores.find({"_id": {"$in": [ObjectId(store_id) for store_id in store_ids]}},
+                                  STORE_LIST_PROJECTION)
+        return result
+
     def get_all(self):
         result = self.stores.find()
         return result
 
+    def get_page(self, limit, skip=0, after_id=None):
+        # Pages in _id order; after_id continues from the last store of the previous page without skipping
+        query = {"_id": {"$gt": ObjectId(after_id)}} if after_id else {}
+        result = self.stores.find(query, STORE_LIST_PROJECTION).sort("_id", ASCENDING).skip(skip).limit(limit)
+        return result
+
+    def ensure_indexes(self):
+        ensure_collection_indexes(self.stores)
+
+    def get_nearest(self, location, limit):
+        # $geoNear has to be the first stage and uses the 2dsphere index on location; distance is in metres.
+        # Stores geocoded from the same postcode area share a point and tie on distance, so _id breaks the tie
+        result = self.stores.aggregate([
+            {"$geoNear": {"near": location, "distanceField": "distance", "spherical": True}},
+            {"$sort": {"distance": ASCENDING, "_id": ASCENDING}},
+            {"$limit": limit},
+            {"$project": {**STORE_LIST_PROJECTION, "distance": 1}}
+        ])
+        return result
+
+    def get_stores_without_location(self):
+        result = self.stores.find({"location": {"$exists": False}}, {"address": 1})
+        return result
+
+    def count(self):
+        return self.stores.count_documents({})
+
     def update_store(self, store_id, store_details):
         result = self.stores.update_one({"_id": ObjectId(store_id)}, {"$set": store_details})
         return result
@@ -1,6 +1,10 @@
 from db import user_collection
 from flask_pymongo import ObjectId
 
+PREFERENCES_PROJECTION = {"preferences.favorites": 1, "preferences.allergens_and_not_preferred": 1}
+# Fields user_store_entity reads
+USER_CONTACT_PROJECTION = {"name": 1, "email": 1, "address": 1, "phone_number": 1}
+
 
 class UserRepository:
     def __init__(self):
@@ -18,6 +22,19 @@ class UserRepository:
         result = self.users.find(query)
         return result
 
+    def get_users_by_ids(self, user_ids):
+        result = self.users.find({"_id": {"$in": [ObjectId(user_id) for user_id in user_ids]}},
+                                 USER_CONTACT_PROJECTION)
+        return result
+
+    def get_all_preferences(self, query):
+        result = self.users.find(query, PREFERENCES_PROJECTION)
+        return result
+
+    def get_user_preferences(self, user_id):
+        result = self.users.find_one({"_id": ObjectId(user_id)}, PREFERENCES_PROJECTION)
+        return result
+
     def get_user_by_id(self, user_id):
         result = self.users.find_one({"_id": ObjectId(user_id)})
         return result
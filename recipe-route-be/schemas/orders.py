@@ -24,13 +24,13 @@ def order_user_entity(order_item):
     return entity
 
 
-def order_list_user_entity(order_list, store_list):
+def order_list_user_entity(order_list, stores_by_id):
     new_list = []
     for item in list(order_list):
-        store = [store_item for store_item in store_list if str(ObjectId(store_item["_id"])) in item['store_id']]
+        store = stores_by_id.get(item.get('store_id'))
         store_details = {}
-        if len(store) > 0:
-            store_details = store_entity(store[0])
+        if store:
+            store_details = store_entity(store)
 
         new_item = {"store_details": store_details}
         new_item.update(item)
@@ -38,14 +38,14 @@ def order_list_user_entity(order_list, store_list):
     return new_list
 
 
-def order_list_store_entity(order_list, user_list):
+def order_list_store_entity(order_list, users_by_id):
     new_list = []
     for item in list(order_list):
-        user = [user_item for user_item in user_list if str(ObjectId(user_item["_id"])) in item['user_id']]
+        user = users_by_id.get(item.get('user_id'))
         user_details = {}
 
-        if len(user) > 0:
-            user_details = user_store_entity(user[0], item.get("order_type") is OrderType.PICKUP.value)
+        if user:
+            user_details = user_store_entity(user, item.get("order_type") is OrderType.PICKUP.value)
         new_item = {"user_details": user_details}
         new_item.update(item)
         new_list.append(order_user_entity(new_item))
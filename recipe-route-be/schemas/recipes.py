@@ -49,6 +49,7 @@ def user_created_recipe_entity(recipe_details, user_id):
         "formatted_ingredients": recipe_details["formatted_ingredients"],
         "title": recipe_details["title"],
         "calories": recipe_details["calories"],
-        "description": recipe_details["desc"],
+        "desc": recipe_details["desc"],
+        "categories": recipe_details.get("categories", []),
         "all_ingredients": ingredients_str
     }
\ No newline at end of file
@@ -43,6 +43,15 @@ def inventory_list_entity(inventory_list):
     return new_list
 
 
+def inventory_page_entity(items):
+    new_list = []
+    for item in items:
+        entity_item = inventory_entity(item, True)
+        entity_item.update({'item_id': item['item_id']})
+        new_list.append(entity_item)
+    return new_list
+
+
 def store_inventory_entity(store, inventory):
     store_details = store_entity(store)
     inventory_list = {}
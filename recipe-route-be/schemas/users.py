@@ -22,10 +22,12 @@ def user_entity(user_data):
 
 
 def user_preferences_entity(user):
-    user_preferences = user["preferences"]
-    del user_preferences['is_onboarding_complete']
-    user_preferences.update({"id": str(ObjectId(user["_id"]))})
-    return user_preferences
+    user_preferences = user.get("preferences", {})
+    return {
+        "id": str(ObjectId(user["_id"])),
+        "favorites": user_preferences.get("favorites", []),
+        "allergens_and_not_preferred": user_preferences.get("allergens_and_not_preferred", [])
+    }
 
 
 def users_preferences_entity(user_list):
@@ -0,0 +1,92 @@
+import threading
+from datetime import datetime, timedelta
+
+from flask_pymongo import ObjectId
+
+from repo.cache_repository import CacheRepository
+from repo.ingredient_repository import IngredientRepository
+from utils.ingredient_matcher import IngredientMatcher
+
+CATALOG_VERSION_KEY = 'ingredient_catalog_version'
+CATALOG_REFRESH_INTERVAL = timedelta(seconds=30)
+# Ids from other workers are only roughly time ordered, so delta loads reach back a little before the newest id
+DELTA_LOAD_OVERLAP = timedelta(minutes=5)
+
+
+class IngredientCatalogService:
+    # Process-wide ingredient name -> id catalog. Ingredients added through this process are applied in place;
+    # ingredients added by other workers are picked up when the shared version in the cache collection moves.
+    def __init__(self):
+        self.__repo = IngredientRepository()
+        self.__cache_repo = CacheRepository()
+        self.__lock = threading.Lock()
+        self.__load_lock = threading.Lock()
+        self.__ingredient_ids = {}
+        self.__matcher = None
+        self.__version = None
+        self.__newest_id = None
+        self.__checked_on = None
+
+    def get_ingredient_id(self, name):
+        self.__refresh()
+        return self.__matcher.match(name)
+
+    def add_ingredient(self, name, ingredient_id):
+        self.add_ingredients([(name, ingredient_id)])
+
+    def add_ingredients(self, ingredients):
+        # ingredients is a list of (name, id) pairs; the shared version moves once per call
+        with self.__lock:
+            if self.__matcher is not None:
+                for name, ingredient_id in ingredients:
+                    self.__add(name, ingredient_id)
+        self.__cache_repo.increment_cache(CATALOG_VERSION_KEY)
+
+    def __add(self, name, ingredient_id):
+        name, ingredient_id = str(name).lower(), str(ingredient_id)
+        if name in self.__ingredient_ids:
+            return
+        self.__ingredient_ids[name] = ingredient_id
+        self.__matcher.add(name, ingredient_id)
+        if self.__newest_id is None or ObjectId(ingredient_id) > self.__newest_id:
+            self.__newest_id = ObjectId(ingredient_id)
+
+    def __refresh(self):
+        # __lock is only held to claim a refresh and to apply its result; the Mongo reads run outside it so matches
+        # and adds are not held up by them
+        if self.__matcher is None:
+            self.__load()
+        with self.__lock:
+            checked_on = datetime.now()
+            if checked_on - self.__checked_on < CATALOG_REFRESH_INTERVAL:
+                return
+            # Claimed here, so concurrent requests keep using the current catalog instead of refreshing it too
+            self.__checked_on = checked_on
+            known_version, newest_id = self.__version, self.__newest_id
+        version = self.__cache_repo.get_cache(CATALOG_VERSION_KEY)
+        if version == known_version:
+            return
+        since_id = ObjectId.from_datetime(newest_id.generation_time - DELTA_LOAD_OVERLAP) if newest_id else None
+        ingredients = list(self.__repo.get_names(since_id))
+        with self.__lock:
+            for ingredient in ingredients:
+                self.__add(ingredient["name"], ingredient["_id"])
+            self.__version = version
+
+    def __load(self):
+        with self.__load_lock:
+            if self.__matcher is not None:
+                return
+            version = self.__cache_repo.get_cache(CATALOG_VERSION_KEY)
+            ingredients = list(self.__repo.get_names())
+            ingredient_ids = {str(ingredient["name"]).lower(): str(ObjectId(ingredient["_id"]))
+                              for ingredient in ingredients}
+            matcher = IngredientMatcher(ingredient_ids)
+            newest_id = max((ObjectId(ingredient["_id"]) for ingredient in ingredients), default=None)
+            with self.__lock:
+                self.__ingredient_ids = ingredient_ids
+                self.__newest_id = newest_id
+                self.__version = version
+                # Adds made by this process during the load were skipped, so the next call checks the version
+                self.__checked_on = datetime.min
+                self.__matcher = matcher
@@ -0,0 +1,16 @@
+from service.ingredient_catalog_service import IngredientCatalogService
+
+
+class IngredientCatalogServiceSingleton:
+    __instance = None
+
+    @staticmethod
+    def get_instance():
+        if IngredientCatalogServiceSingleton.__instance is None:
+            IngredientCatalogServiceSingleton()
+        return IngredientCatalogServiceSingleton.__instance
+
+    def __init__(self):
+        if IngredientCatalogServiceSingleton.__instance is not None:
+            raise Exception("This class is a singleton! Use 'get_instance()' to get the instance.")
+        IngredientCatalogServiceSingleton.__instance = IngredientCatalogService()
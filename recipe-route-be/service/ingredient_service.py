@@ -2,18 +2,61 @@ from repo.ingredient_repository import IngredientRepository
 from data_model.ingredient import Ingredient
 from schemas.ingredients import ingredient_entity, ingredient_type_list_entity, ingredient_list_entity
 
-from fuzzywuzzy import process
-from flask_pymongo import ObjectId
+from service.ingredient_catalog_service_singleton import IngredientCatalogServiceSingleton
+from pymongo.errors import BulkWriteError
+
+AUTOCOMPLETE_LIMIT = 10
+MAX_AUTOCOMPLETE_LIMIT = 50
 
 
 class IngredientService:
     def __init__(self):
         self.repo = IngredientRepository()
-        self.__ingredient_dict = {}
+        self.__catalog = IngredientCatalogServiceSingleton.get_instance()
 
     def add_ingredient(self, name, i_type):
         ingredient = Ingredient(name, i_type)
-        return self.repo.add_ingredient(ingredient.get_ingredient())
+        result = self.repo.add_ingredient(ingredient.get_ingredient())
+        if result.inserted_id:
+            self.__catalog.add_ingredient(name, result.inserted_id)
+        return result
+
+    def get_or_add_ingredient_ids(self, ingredients):
+        # ingredients is a list of (name, type) pairs; names the catalog cannot match are inserted in one batch.
+        # Names that could not be saved are missing from the returned ids.
+        ingredient_ids = {}
+        new_ingredients = {}
+        for name, i_type in ingredients:
+            if name in ingredient_ids:
+                continue
+            ingredient_id = self.__catalog.get_ingredient_id(name)
+            if ingredient_id:
+                ingredient_ids[name] = ingredient_id
+            elif name.lower() not in new_ingredients:
+                new_ingredients[name.lower()] = Ingredient(name, i_type).get_ingredient()
+        if new_ingredients:
+            documents = list(new_ingredients.values())
+            try:
+                inserted_ids = self.repo.add_ingredients(documents).inserted_ids
+            except BulkWriteError as ex:
+                # Unordered inserts keep every document that did not fail, and insert_many has set their _id.
+                # A name another worker inserted meanwhile is looked up; names still missing are left out.
+                failed = {error["index"] for error in ex.details.get("writeErrors", [])}
+                inserted_ids = [None if position in failed else document["_id"]
+                                for position, document in enumerate(documents)]
+            added = [(document["name"], str(inserted_id)) for document, inserted_id in zip(documents, inserted_ids)
+                     if inserted_id is not None]
+            self.__catalog.add_ingredients(added)
+            resolved_ids = {name.lower(): ingredient_id for name, ingredient_id in added}
+            for document, inserted_id in zip(documents, inserted_ids):
+                existing = self.repo.get_ingredient(document["name"]) if inserted_id is None else None
+                if existing:
+                    resolved_ids[document["name_lc"]] = str(existing["_id"])
+            for name, _ in ingredients:
+                if name not in ingredient_ids and name.lower() in resolved_ids:
+                    ingredient_ids[name] = resolved_ids[name.lower()]
+            return ingredient_ids, len(added)
+        return ingredient_ids, 0
 
     def get_ingredients_by_id_list(self, id_list):
         return self.repo.get_by_id_list(id_list)
@@ -66,17 +109,17 @@ class IngredientService:
 
         return {"response": res, "code": code}
 
-    def get_ingredient_id(self, name_str):
-        if len(self.__ingredient_dict) <= 0:
-            ingredient_list = list(self.repo.get_all())
-            self.__ingredient_dict = {str(ingredient["name"]).lower(): str(ObjectId(ingredient["_id"]))
-                                      for ingredient in ingredient_list}
+    def autocomplete(self, prefix, limit=None, i_type=None):
+        prefix = (prefix or "").strip()
+        if not prefix:
+            return {"response": {"message": "Search text is required.", "status": "fail"}, "code": 400}
+        if limit and not str(limit).isdigit():
+            return {"response": {"message": "Invalid limit.", "status": "fail"}, "code": 400}
+        limit = max(1, min(int(limit or AUTOCOMPLETE_LIMIT), MAX_AUTOCOMPLETE_LIMIT))
+        result = [{"id": str(ingredient["_id"]), "name": ingredient["name"], "type": ingredient.get("type")}
+                  for ingredient in self.repo.search_by_prefix(prefix, limit, i_type)]
+        return {"response": {"data": result, "message": "Ingredients fetched successfully", "status": "success"},
+                "code": 200}
 
-        matched_ingredient, confidence = process.extractOne(str(name_str).lower(),
-                                                            [str(x).lower() for x in self.__ingredient_dict.keys()])
-
-        # Confidence threshold is 86, below which ingredient is not considered
-        if confidence > 86:
-            ingredient_id = self.__ingredient_dict.get(matched_ingredient)
-            return ingredient_id
-        return None
+    def get_ingredient_id(self, name_str):
+        return self.__catalog.get_ingredient_id(name_str)
@@ -1,11 +1,18 @@
+import logging
+
 from enums.order_type import OrderType
 from enums.order_status import OrderStatus
 from enums.payment_status import PaymentStatus
+from enums.record_count import RecordCount
 from repo.order_repository import OrderRepository
+from repo.user_repository import UserRepository
 from service.cart_service import CartService
+from service.payment_service import PaymentService
 from service.store_service import StoreService
 from schemas.orders import order_list_user_entity, order_list_store_entity
 from flask_pymongo import ObjectId
+from datetime import datetime
+from pymongo.errors import OperationFailure
 
 
 class OrderService:
@@ -13,11 +20,12 @@ class OrderService:
         self.__repo = OrderRepository()
         self.__cart_service = CartService()
         self.__store_service = StoreService()
+        self.__user_repo = UserRepository()
 
     def add_user_order(self, user_id, payment_id, order_type):
         # set payment id as key in the orders
         new_cart_details = {}
-        required_order_details = {"user_id": user_id, "payment_id": payment_id}
+        required_order_details = {"user_id": user_id, "payment_id": payment_id, "created": datetime.now()}
         total_price = 0
         cart_items = self.__cart_service.get_user_cart_items(user_id, True)
         store_id = None
@@ -43,11 +51,30 @@ class OrderService:
                     new_shopping_list.update({item: cart_items["shoppingList"][item]})
             new_cart_details.update({"shopping_list": new_shopping_list, "cart_list": {}, "store_id": ''})
 
-        result = self.__repo.add_order(required_order_details)
+        added_order = {}
+
+        def add_order(session):
+            added_order["result"] = self.__repo.add_order(required_order_details, session=session)
+
+        if store_id:
+            # The order is inserted in the stock decrement's transaction, so a failed insert puts the stock back
+            try:
+                shortfalls = self.__store_service.update_store_inventory_order(store_id, inventory_cart_items,
+                                                                               on_decremented=add_order)
+            except OperationFailure as ex:
+                logging.warning(f"EXCEPTION => {ex} ")
+                return self.__reject_paid_order(required_order_details,
+                                                "Could not reserve the stock, your payment is being refunded.", 503)
+            if shortfalls:
+                return self.__reject_paid_order(required_order_details,
+                                                "Some items are out of stock, your payment is being refunded.", 409,
+                                                shortfalls)
+        else:
+            add_order(None)
+
+        result = added_order["result"]
         is_success = result.inserted_id
         result_cart_order = self.__cart_service.update_cart_order(user_id=user_id, cart_order=new_cart_details)
-        if is_success:
-            self.__store_service.update_store_inventory_order(store_id, inventory_cart_items)
         if result_cart_order['code'] != 200 and is_success:
             return {"response": {"message": "Successfully placed an order, but failed to update cart.", "status":
                     'success', "data": str(result)}, "code": 200}
@@ -57,30 +84,56 @@ class OrderService:
         else:
             return {"response": {"message": "Failed to place an order.", "status": 'fail'}, "code": 500}
 
-    def get_user_orders(self, user_id, is_raw_data):
+    def __reject_paid_order(self, order, message, code, data=None):
+        # The customer has already paid by the time the stock is taken, so the order is kept as rejected and the
+        # payment refunded. It is recorded as refund pending first so a failed refund can still be traced.
+        order.update({"status": OrderStatus.REJECTED.value, "payment_status": PaymentStatus.REFUND_PENDING.value})
+        result = self.__repo.add_order(order)
+        if PaymentService.refund_payment(order["payment_id"]):
+            order["payment_status"] = PaymentStatus.REFUNDED.value
+            self.__repo.update_order({"_id": result.inserted_id}, {"payment_status": order["payment_status"]})
+        response = {"message": message, "status": 'fail', "payment_status": order["payment_status"]}
+        if data:
+            response["data"] = data
+        return {"response": response, "code": code}
+
+    def get_user_orders(self, user_id, is_raw_data, page=None):
         output = {"response": {"message": "", 'status': 'success'}, 'code': 200}
-        res_data = self.__repo.get_user_orders(user_id)
         if is_raw_data:
-            return res_data;
-        res = order_list_user_entity(res_data, self.__store_service.get_all_stores(0, True))
+            return self.__repo.get_user_orders(user_id)
+        start_index, record_count = self.__page_range(page)
+        res_data = list(self.__repo.get_user_orders(user_id, skip=start_index, limit=record_count))
+        store_ids = {order["store_id"] for order in res_data if ObjectId.is_valid(order.get("store_id"))}
+        res = order_list_user_entity(res_data, self.__store_service.get_stores_by_ids(list(store_ids)))
         if len(res) <= 0:
             output['response']['message'] = 'No orders placed.'
         else:
             output['response']['message'] = 'Successfully fetched all orders of user'
             output['response']['data'] = res
+            output['response']['total_records'] = self.__repo.count_user_orders(user_id)
         return output
 
-    def get_store_orders(self, store_id, user_list):
-        all_orders = list(self.__repo.get_store_orders(store_id))
+    def get_store_orders(self, store_id, page=None):
+        start_index, record_count = self.__page_range(page)
+        all_orders = list(self.__repo.get_store_orders(store_id, skip=start_index, limit=record_count))
         output = {"response": {"message": 'No orders found for the store', "status": 'success', 'data': []}, "code": 200
                   }
 
-        if len(all_orders) >= 0:
+        if len(all_orders) > 0:
+            user_ids = {order["user_id"] for order in all_orders if ObjectId.is_valid(order.get("user_id"))}
+            users_by_id = {str(user["_id"]): user for user in self.__user_repo.get_users_by_ids(list(user_ids))}
             output['response']['message'] = 'Successfully fetched all orders for the store.'
-            output['response']['data'] = order_list_store_entity(all_orders, user_list)
+            output['response']['data'] = order_list_store_entity(all_orders, users_by_id)
+            output['response']['total_records'] = self.__repo.count_store_orders(store_id)
 
         return output
 
+    @staticmethod
+    def __page_range(page):
+        page_number = int(page) if page else 1
+        record_count = RecordCount.ORDERS.value
+        return (page_number - 1) * record_count, record_count
+
     def update_order_status(self, store_id, order_id, status):
         res = self.__repo.update_order({"_id": ObjectId(order_id), "store_id": store_id}, {"status": status})
         if res.raw_result.get("ok") > 0 and res.raw_result.get("updatedExisting"):
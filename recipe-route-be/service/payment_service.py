@@ -32,6 +32,16 @@ class PaymentService:
             logging.warning(f"EXCEPTION => {ex} ")
             return {"response": {"message": "Failed to setup stripe environment", "status": 'fail'}, "code": 500}
 
+    @staticmethod
+    def refund_payment(payment_id):
+        # The idempotency key makes a retried refund of the same payment a no-op on Stripe's side
+        try:
+            stripe.Refund.create(payment_intent=payment_id, idempotency_key=f"refund-{payment_id}")
+            return True
+        except Exception as ex:
+            logging.warning(f"EXCEPTION => {ex} ")
+            return False
+
     @staticmethod
     def stripe_payment_hook(payload, header):
         event = None
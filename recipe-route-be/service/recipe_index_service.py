@@ -0,0 +1,144 @@
+import logging
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+MODEL_DIR = Path(__file__).resolve().parent.parent / 'rs_model'
+INDEX_FILE = 'recipe_tfidf.npz'
+
+
+class RecipeIndexService:
+    # Rows follow the order of the recipe ids given to sync(), so they line up with the caller's DataFrame.
+    # Recipes added later are transformed with the stored vocabulary instead of refitting the whole catalog.
+    # Only rebuild(), run by jobs.preprocess_recipes, writes the index file. Web workers keep their additions in
+    # memory; sync() transforms recipes missing from the file when a worker starts, so nothing is lost.
+    def __init__(self, model_dir=None):
+        self.__model_dir = Path(model_dir) if model_dir else None
+        self.__lock = threading.Lock()
+        self.__vectorizer = None
+        self.__matrix = None
+        self.__recipe_ids = []
+        self.__row_by_id = {}
+        self.__listeners = []
+        self.version = 0
+
+    def is_ready(self):
+        return self.__matrix is not None
+
+    def add_listener(self, listener):
+        self.__listeners.append(listener)
+
+    def get_recipe_ids(self):
+        return list(self.__recipe_ids)
+
+    def sync(self, recipe_ids, documents):
+        recipe_ids = [str(r_id) for r_id in recipe_ids]
+        documents = list(documents)
+        with self.__lock:
+            if self.__vectorizer is None and not self.__load():
+                if self.__model_dir is not None:
+                    logging.warning("No stored recipe index, fitting one in memory. Run jobs.preprocess_recipes "
+                                    "to store it.")
+                self.__fit(recipe_ids, documents)
+            elif recipe_ids != self.__recipe_ids:
+                self.__realign(recipe_ids, documents)
+            self.version += 1
+
+    def rebuild(self, recipe_ids, documents):
+        # Refits the vocabulary, for when the recipe documents themselves have been reprocessed
+        with self.__lock:
+            self.__fit([str(r_id) for r_id in recipe_ids], list(documents))
+            self.__save()
+            self.version += 1
+
+    def add_recipe(self, recipe):
+        recipe_id = str(recipe["_id"])
+        with self.__lock:
+            # Nothing to update until this process has synced the index with the catalog
+            if self.__vectorizer is None or recipe_id in self.__row_by_id:
+                return False
+            vector = self.__vectorizer.transform([recipe.get("all_ingredients", '')])
+            self.__matrix = sparse.vstack([self.__matrix, vector], format='csr')
+            row = len(self.__recipe_ids)
+            self.__row_by_id[recipe_id] = row
+            self.__recipe_ids.append(recipe_id)
+            self.version += 1
+        # Listeners run outside the lock so they can read the index; concurrent adds may notify out of order,
+        # so each one is told the row its recipe took
+        for listener in self.__listeners:
+            listener(recipe, row)
+        return True
+
+    def score(self, document):
+        # Rows and the transformed profile are both L2 normalised, so the dot product is the cosine similarity.
+        # The matrix only grows by appending, so row i always belongs to the same recipe.
+        with self.__lock:
+            vectorizer, matrix = self.__vectorizer, self.__matrix
+        profile_vec = vectorizer.transform([document])
+        return (matrix @ profile_vec.T).toarray().ravel()
+
+    def __set_recipe_ids(self, recipe_ids):
+        self.__recipe_ids = list(recipe_ids)
+        self.__row_by_id = {r_id: row for row, r_id in enumerate(self.__recipe_ids)}
+
+    def __fit(self, recipe_ids, documents):
+        self.__vectorizer = TfidfVectorizer()
+        self.__matrix = self.__vectorizer.fit_transform(documents).tocsr()
+        self.__set_recipe_ids(recipe_ids)
+
+    def __realign(self, recipe_ids, documents):
+        rows = [self.__row_by_id.get(r_id) for r_id in recipe_ids]
+        missing = [position for position, row in enumerate(rows) if row is None]
+        matrix = self.__matrix
+        if missing:
+            offset = matrix.shape[0]
+            new_rows = self.__vectorizer.transform([documents[position] for position in missing])
+            matrix = sparse.vstack([matrix, new_rows], format='csr')
+            for count, position in enumerate(missing):
+                rows[position] = offset + count
+        self.__matrix = matrix[rows]
+        self.__set_recipe_ids(recipe_ids)
+
+    def __index_path(self):
+        return self.__model_dir / INDEX_FILE
+
+    def __save(self):
+        if self.__model_dir is None:
+            return
+        terms = sorted(self.__vectorizer.vocabulary_, key=self.__vectorizer.vocabulary_.get)
+        os.makedirs(self.__model_dir, exist_ok=True)
+        tmp_path = self.__model_dir / f"{INDEX_FILE}.tmp"
+        # Matrix, vocabulary and row ids share one file so a reader never sees them out of step
+        with open(tmp_path, 'wb') as index_file:
+            np.savez(index_file, data=self.__matrix.data, indices=self.__matrix.indices,
+                     indptr=self.__matrix.indptr, shape=np.array(self.__matrix.shape),
+                     terms=np.array(terms, dtype=str), idf=self.__vectorizer.idf_,
+                     recipe_ids=np.array(self.__recipe_ids, dtype=str))
+        os.replace(tmp_path, self.__index_path())
+
+    def __load(self):
+        if self.__model_dir is None or not self.__index_path().exists():
+            return False
+        try:
+            with np.load(self.__index_path(), allow_pickle=False) as stored:
+                matrix = sparse.csr_matrix((stored["data"], stored["indices"], stored["indptr"]),
+                                           shape=tuple(stored["shape"]))
+                terms = stored["terms"].tolist()
+                idf = stored["idf"]
+                recipe_ids = stored["recipe_ids"].tolist()
+            if matrix.shape != (len(recipe_ids), len(terms)) or len(idf) != len(terms):
+                raise ValueError("stored recipe index is inconsistent")
+        except (OSError, ValueError, KeyError) as ex:
+            logging.warning(f"Discarding stored recipe index: {ex}")
+            return False
+
+        vectorizer = TfidfVectorizer(vocabulary={term: column for column, term in enumerate(terms)})
+        vectorizer.idf_ = idf
+        self.__vectorizer = vectorizer
+        self.__matrix = matrix
+        self.__set_recipe_ids(recipe_ids)
+        return True
@@ -0,0 +1,16 @@
+from service.recipe_index_service import RecipeIndexService, MODEL_DIR
+
+
+class RecipeIndexServiceSingleton:
+    __instance = None
+
+    @staticmethod
+    def get_instance():
+        if RecipeIndexServiceSingleton.__instance is None:
+            RecipeIndexServiceSingleton()
+        return RecipeIndexServiceSingleton.__instance
+
+    def __init__(self):
+        if RecipeIndexServiceSingleton.__instance is not None:
+            raise Exception("This class is a singleton! Use 'get_instance()' to get the instance.")
+        RecipeIndexServiceSingleton.__instance = RecipeIndexService(model_dir=MODEL_DIR)
@@ -0,0 +1,164 @@
+import logging
+import math
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+from utils.recipe_preprocessing import search_terms
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Title words count this many times towards a recipe's term frequencies
+TITLE_WEIGHT = 2
+REFRESH_INTERVAL_SECONDS = 60
+
+
+class RecipeSearchService:
+    # In-process BM25 index over recipe titles, descriptions and ingredient names. Each term keeps the rows that use
+    # it with their precomputed BM25 term-frequency weight, so a query only sums idf-scaled weights for its own terms.
+    # The index is built in a background thread; until it is ready searches go to the Mongo text index.
+    def __init__(self, recipe_repo, stop_words=frozenset()):
+        self.__repo = recipe_repo
+        self.__stop_words = stop_words
+        self.__lock = threading.Lock()
+        self.__is_loading = False
+        self.__checked_on = 0
+        self.__recipe_ids = []
+        self.__row_by_id = {}
+        self.__doc_lengths = np.array([], dtype=np.float32)
+        self.__term_postings = {}
+        self.__ingredient_rows = {}
+        self.__weights = None
+
+    def is_ready(self):
+        return self.__weights is not None
+
+    def load(self):
+        recipe_ids, doc_lengths, term_postings, ingredient_rows = [], [], {}, {}
+        for recipe in self.__repo.get_search_documents():
+            row = len(recipe_ids)
+            recipe_ids.append(str(recipe["_id"]))
+            term_counts = self.__term_counts(recipe)
+            doc_lengths.append(sum(term_counts.values()))
+            for term, count in term_counts.items():
+                rows, counts = term_postings.setdefault(term, ([], []))
+                rows.append(row)
+                counts.append(count)
+            for ingredient_id in self.__ingredient_ids(recipe):
+                ingredient_rows.setdefault(ingredient_id, []).append(row)
+
+        term_postings = {term: (np.array(rows, dtype=np.int32), np.array(counts, dtype=np.float32))
+                         for term, (rows, counts) in term_postings.items()}
+        ingredient_rows = {ingredient_id: np.array(rows, dtype=np.int32)
+                           for ingredient_id, rows in ingredient_rows.items()}
+        doc_lengths = np.array(doc_lengths, dtype=np.float32)
+        weights = self.__bm25_weights(term_postings, doc_lengths)
+        with self.__lock:
+            self.__recipe_ids = recipe_ids
+            self.__row_by_id = {r_id: row for row, r_id in enumerate(recipe_ids)}
+            self.__doc_lengths = doc_lengths
+            self.__term_postings = term_postings
+            self.__ingredient_rows = ingredient_rows
+            self.__weights = weights
+            self.__checked_on = time.monotonic()
+        logging.info(f"Recipe search index built for {len(recipe_ids)} recipes and {len(term_postings)} terms")
+
+    def add_recipe(self, recipe):
+        with self.__lock:
+            recipe_id = str(recipe["_id"])
+            # A recipe added while the index is loading is picked up by that load
+            if not self.is_ready() or recipe_id in self.__row_by_id:
+                return False
+            row = len(self.__recipe_ids)
+            term_counts = self.__term_counts(recipe)
+            for term, count in term_counts.items():
+                rows, counts = self.__term_postings.get(term, (np.array([], dtype=np.int32),
+                                                                np.array([], dtype=np.float32)))
+                self.__term_postings[term] = (np.append(rows, np.int32(row)), np.append(counts, np.float32(count)))
+            for ingredient_id in self.__ingredient_ids(recipe):
+                rows = self.__ingredient_rows.get(ingredient_id, np.array([], dtype=np.int32))
+                self.__ingredient_rows[ingredient_id] = np.append(rows, np.int32(row))
+            self.__recipe_ids.append(recipe_id)
+            self.__row_by_id[recipe_id] = row
+            self.__doc_lengths = np.append(self.__doc_lengths, np.float32(sum(term_counts.values())))
+            # The average document length moved, so every weight is recomputed on the next search
+            self.__weights = {}
+        return True
+
+    def search(self, text, excluded_ingredient_ids=(), skip=0, limit=20):
+        # Returns (recipe ids of the page, total matching recipes)
+        self.__refresh_if_stale()
+        if not self.is_ready():
+            return self.__repo.search_text(text, list(excluded_ingredient_ids), skip, limit)
+
+        with self.__lock:
+            if not self.__weights:
+                self.__weights = self.__bm25_weights(self.__term_postings, self.__doc_lengths)
+            recipe_count = len(self.__recipe_ids)
+            scores = np.zeros(recipe_count, dtype=np.float32)
+            for term in set(search_terms(text, self.__stop_words)):
+                postings = self.__term_postings.get(term)
+                if postings is None:
+                    continue
+                rows = postings[0]
+                idf = math.log(1 + (recipe_count - len(rows) + 0.5) / (len(rows) + 0.5))
+                scores[rows] += idf * self.__weights[term]
+            for ingredient_id in excluded_ingredient_ids:
+                rows = self.__ingredient_rows.get(str(ingredient_id))
+                if rows is not None:
+                    scores[rows] = 0
+            recipe_ids = self.__recipe_ids
+
+        rows = np.flatnonzero(scores)
+        total = len(rows)
+        end = min(skip + limit, total)
+        if skip >= end:
+            return [], total
+        if end < total:
+            rows = rows[np.argpartition(-scores[rows], end - 1)[:end]]
+        # Best score first, ties in catalog order so pages never overlap
+        rows = rows[np.lexsort((rows, -scores[rows]))][skip:end]
+        return [recipe_ids[row] for row in rows], total
+
+    def __term_counts(self, recipe):
+        terms = search_terms(recipe.get("title"), self.__stop_words) * TITLE_WEIGHT
+        terms += search_terms(recipe.get("desc"), self.__stop_words)
+        terms += search_terms(recipe.get("all_ingredients"), self.__stop_words)
+        return Counter(terms)
+
+    @staticmethod
+    def __ingredient_ids(recipe):
+        return {str(ingredient["id"]) for ingredient in recipe.get("formatted_ingredients") or []
+                if ingredient.get("id")}
+
+    @staticmethod
+    def __bm25_weights(term_postings, doc_lengths):
+        if len(doc_lengths) == 0:
+            return {}
+        length_norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths / max(float(doc_lengths.mean()), 1.0))
+        return {term: counts * (BM25_K1 + 1) / (counts + length_norm[rows])
+                for term, (rows, counts) in term_postings.items()}
+
+    def __refresh_if_stale(self):
+        # Recipes added by other workers show up as a change in the collection size
+        with self.__lock:
+            if self.__is_loading:
+                return
+            if self.is_ready() and time.monotonic() - self.__checked_on < REFRESH_INTERVAL_SECONDS:
+                return
+            self.__checked_on = time.monotonic()
+            if self.is_ready() and self.__repo.get_estimated_size() == len(self.__recipe_ids):
+                return
+            self.__is_loading = True
+        threading.Thread(target=self.__load_in_background, daemon=True).start()
+
+    def __load_in_background(self):
+        try:
+            self.load()
+        except Exception as ex:
+            logging.warning(f"Recipe search index load failed: {ex}")
+        finally:
+            with self.__lock:
+                self.__is_loading = False
@@ -0,0 +1,20 @@
+from nltk.corpus import stopwords
+
+from repo.recipe_repository import RecipeRepository
+from service.recipe_search_service import RecipeSearchService
+
+
+class RecipeSearchServiceSingleton:
+    __instance = None
+
+    @staticmethod
+    def get_instance():
+        if RecipeSearchServiceSingleton.__instance is None:
+            RecipeSearchServiceSingleton()
+        return RecipeSearchServiceSingleton.__instance
+
+    def __init__(self):
+        if RecipeSearchServiceSingleton.__instance is not None:
+            raise Exception("This class is a singleton! Use 'get_instance()' to get the instance.")
+        RecipeSearchServiceSingleton.__instance = RecipeSearchService(RecipeRepository(),
+                                                                      stop_words=set(stopwords.words('english')))
@@ -1,4 +1,8 @@
 from repo.recipe_repository import RecipeRepository
+from service.recipe_index_service_singleton import RecipeIndexServiceSingleton
+from service.recipe_search_service_singleton import RecipeSearchServiceSingleton
+from enums.record_count import RecordCount
+from flask_pymongo import ObjectId
 from schemas.recipes import recipe_list_entity, recipe_entity, user_created_recipe_entity
 import logging
 
@@ -23,6 +27,21 @@ class RecipeService:
             code = 200
         return {"response": response, "code": code}
 
+    def get_recipes_page(self, after=None):
+        if after and not ObjectId.is_valid(after):
+            return {"response": {"message": "Invalid recipe cursor.", "status": "fail"}, "code": 400}
+        record_count = RecordCount.RECIPES.value
+        recipes = list(self.__repo.get_page(record_count, after_id=after))
+        next_cursor = str(recipes[-1]["_id"]) if len(recipes) == record_count else None
+        return {"response": {"message": "Successfully fetched all recipes", "status": "success",
+                             "data": recipe_list_entity(recipes), "total_records": self.__repo.get_estimated_size(),
+                             "next_cursor": next_cursor}, "code": 200}
+
+    def export_recipes(self):
+        # Yields one recipe entity at a time straight off the cursor
+        for recipe in self.__repo.iter_recipes():
+            yield recipe_entity(recipe)
+
     def update_all_recipes(self, data):
         try:
             self.__repo.update_all(data)
@@ -39,11 +58,33 @@ class RecipeService:
                     "code": 200}
         return data
 
+    def get_recipes_by_ids(self, recipe_ids):
+        # Documents come back in the order of recipe_ids; ids that no longer exist are skipped
+        recipes_by_id = {str(recipe["_id"]): recipe for recipe in self.__repo.get_recipes_by_ids(recipe_ids)}
+        return [recipes_by_id[str(r_id)] for r_id in recipe_ids if str(r_id) in recipes_by_id]
+
+    def search_recipes(self, text, page=None, allergens=None):
+        if not text or not text.strip():
+            return {"response": {"message": "Enter a search term.", "status": "fail"}, "code": 400}
+        page_number = int(page) if page else 1
+        record_count = RecordCount.RECIPES.value
+        recipe_ids, total_records = RecipeSearchServiceSingleton.get_instance().search(
+            text, excluded_ingredient_ids=allergens or [], skip=(page_number - 1) * record_count, limit=record_count)
+        response = {"message": "Successfully fetched matching recipes", "status": "success",
+                    "data": recipe_list_entity(self.get_recipes_by_ids(recipe_ids)), "total_records": total_records}
+        if total_records <= 0:
+            response["message"] = "No recipes match your search."
+        return {"response": response, "code": 200}
+
     def add_recipe(self, user_id, recipe_data):
-        result = self.__repo.add_recipe(user_created_recipe_entity(recipe_data, user_id=user_id))
+        recipe = user_created_recipe_entity(recipe_data, user_id=user_id)
+        result = self.__repo.add_recipe(recipe)
         if result.inserted_id:
+            recipe["_id"] = result.inserted_id
+            RecipeIndexServiceSingleton.get_instance().add_recipe(recipe)
+            RecipeSearchServiceSingleton.get_instance().add_recipe(recipe)
             return {"response": {"message": "Successfully added your recipe.",
-                                 "status": "success", "data": result.inserted_id}, "code": 200}
+                                 "status": "success", "data": str(result.inserted_id)}, "code": 200}
         else:
             return {"response": {"message": "Failed to add your recipe.", "status": "success"}, "code": 500}
 
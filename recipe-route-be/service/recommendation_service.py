@@ -1,43 +1,56 @@
+import logging
+import threading
+import numpy as np
 import pandas as pd
-import re
-from fractions import Fraction
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import string
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from flask_pymongo import ObjectId
+from datetime import datetime, timedelta
 
 from service.recipe_service import RecipeService
 from service.user_service import UserService
 from service.cache_service import CacheService
-from service.ingredient_service import IngredientService
-from schemas.users import users_preferences_entity, user_preferences_entity
+from service.recipe_index_service import RecipeIndexService
+from service.recipe_index_service_singleton import RecipeIndexServiceSingleton
+from service.user_preference_index_service import UserPreferenceIndexService
+from service.user_preference_index_service_singleton import UserPreferenceIndexServiceSingleton
 from schemas.recipes import recipe_list_entity
 from enums.record_count import RecordCount
+from utils.lru_cache import LRUCache
+from utils.recipe_preprocessing import PREPROCESSING_VERSION, PREPROCESSING_VERSION_KEY
+
+SIMILAR_USER_COUNT = 50
+# Share of the final score that comes from what similar users favorited; content similarity makes up the rest
+COLLABORATIVE_WEIGHT = 0.2
+PREFERENCES_REFRESH_INTERVAL = timedelta(seconds=30)
+RANKING_CACHE_SIZE = 1000
+RANKING_CACHE_TTL_SECONDS = 600
 
 
 class RecommendationService:
-    def __init__(self, cache_service=None, recipe_service=None, ingredient_service=None, is_service_provided=False,
-                 user_service=None):
+    def __init__(self, cache_service=None, recipe_service=None, is_service_provided=False, user_service=None,
+                 recipe_index=None, user_index=None):
         self.__cache = CacheService()
         self.__recipe_service = RecipeService()
-        self.__ingredient_service = IngredientService()
+        self.__recipe_index = RecipeIndexServiceSingleton.get_instance()
+        self.__user_index = UserPreferenceIndexServiceSingleton.get_instance()
+        self.__user_index_synced_on = None
+        self.__ranking_cache = LRUCache(RANKING_CACHE_SIZE, ttl=RANKING_CACHE_TTL_SECONDS)
+        self.__lock = threading.Lock()
         self.__df = None
-        self.__all_records = []
+        self.__pending_recipes = {}
+        self.__ingredient_rows = {}
+        self.__row_by_id = {}
         self.__user_service = UserService()
-        self.__stop_words = None
 
         if is_service_provided:
             self.__cache = cache_service
             self.__recipe_service = recipe_service
-            self.__ingredient_service = ingredient_service
             self.__user_service = user_service
+            self.__recipe_index = recipe_index if recipe_index is not None else RecipeIndexService()
+            self.__user_index = user_index if user_index is not None else UserPreferenceIndexService()
+        self.__recipe_index.add_listener(self.__on_recipe_added)
         self.__load_df()
 
     def __setup_df(self):
-        self.__all_records = self.__recipe_service.get_all_recipes(True)
-        self.__df = pd.DataFrame(self.__all_records)
+        self.__df = pd.DataFrame(self.__recipe_service.get_all_recipes(True))
         self.__df.isnull().sum()
         self.__df.dropna(inplace=True)
 
@@ -47,204 +60,156 @@ class RecommendationService:
         if "all_ingredients" in self.__df.columns:
             selected_features.append("all_ingredients")
         self.__df = self.__df[selected_features]
+        self.__df.reset_index(drop=True, inplace=True)
+        self.__build_row_index()
+        if "all_ingredients" in self.__df.columns:
+            self.__sync_recipe_index()
+        if "formatted_ingredients" in self.__df.columns:
+            self.__build_ingredient_rows()
+
+    def __build_ingredient_rows(self):
+        # Inverted index: ingredient id -> positions of the DataFrame rows whose recipe uses it
+        ingredient_rows = {}
+        for row, ingredients in enumerate(self.__df["formatted_ingredients"]):
+            for ingredient_id in {ingredient.get("id") for ingredient in ingredients}:
+                if ingredient_id:
+                    ingredient_rows.setdefault(ingredient_id, []).append(row)
+        self.__ingredient_rows = {ingredient_id: np.array(rows, dtype=np.int64)
+                                  for ingredient_id, rows in ingredient_rows.items()}
+
+    def __sync_recipe_index(self):
+        # The index keeps its rows in DataFrame order, so row i of the index always scores row i of the DataFrame
+        self.__recipe_index.sync(self.__df["_id"], self.__df["all_ingredients"])
+
+    def __on_recipe_added(self, recipe, row):
+        # DataFrame rows have to stay in index row order, so a recipe notified ahead of an earlier one waits
+        with self.__lock:
+            self.__pending_recipes[row] = recipe
+            while len(self.__df) in self.__pending_recipes:
+                self.__append_recipe(self.__pending_recipes.pop(len(self.__df)))
+
+    def __append_recipe(self, recipe):
+        new_row = pd.DataFrame([recipe]).reindex(columns=self.__df.columns)
+        row = len(self.__df)
+        self.__df = pd.concat([self.__df, new_row], ignore_index=True)
+        self.__row_by_id[str(recipe["_id"])] = row
+        for ingredient_id in {ingredient.get("id") for ingredient in recipe.get("formatted_ingredients", [])}:
+            if ingredient_id:
+                rows = self.__ingredient_rows.get(ingredient_id, np.array([], dtype=np.int64))
+                self.__ingredient_rows[ingredient_id] = np.append(rows, row)
 
     def __load_df(self):
         if self.__df is None:
             self.__setup_df()
-            if not self.__cache.get_cache('is_preprocessed'):
-                self.__preprocess_model()
-                self.__cache.update_cache('is_preprocessed', True)
-                pass
-        pass
-
-    def __convert_ingredients(self, data):
-        measurement_terms = [
-            "sprigs", "cups", "cup", "cloves", "teaspoon", "teaspoons", "tsp",
-            "tablespoon", "tablespoons", "tbsp", "ribs", "pound", "pounds",
-            "piece", "pieces", "ounce", "pinch", "lb", "clove", "stick", "ounces", "heads", "head"
-        ]
-        converted_data = []
-        ingredients = data
-        ingredients_str = ''
-
-        for ingredient in ingredients:
-
-            ingredient_obj = {"ingredient": "", "qty": "", "measurement": ""}
-            # Check if the ingredient is not equipment, garnish, or accompaniment
-            if "equipment" not in ingredient.lower() and "garnish" not in ingredient.lower() \
-                    and "accompaniment" not in ingredient.lower() and "water" not in ingredient.lower() \
-                    and "ice" not in ingredient.lower() and "Available at Asian markets" not in ingredient.lower() and \
-                    "optional" not in ingredient.lower() and "Optional" not in ingredient.lower():
-                # Extract quantity and measurement
-                amount_match = re.match(r"((\d+\s+)?\d+\s+\d+/\d+|\d+/\d+|\d+)", ingredient)
-                measurement_match = re.search(r"\b(" + "|".join(measurement_terms) + r")\b", ingredient)
-
-                if amount_match:
-                    qty = amount_match.group(0)
-                    # Convert fraction to float
-                    if "/" in qty:
-                        qty = str(round(float(sum(Fraction(s) for s in qty.split())), 2)).rstrip("0").rstrip(".")
-                    ingredient_obj["qty"] = qty.strip()
-
-                if measurement_match:
-                    measurement = measurement_match.group(0)
-                    ingredient_obj["measurement"] = measurement.strip()
-
-                # Extract ingredient name
-                ingredient_name = re.sub(r"(\d+(\s+\d+\/\d+)?)\s*(\b(" + "|".join(measurement_terms) + r")\b)?", "",
-                                         ingredient).strip().lstrip("/")
-                ingredient_obj["ingredient"] = ingredient_name
-                ingredient_obj["id"] = self.__ingredient_service.get_ingredient_id(ingredient_name)
-                ingredients_str = ingredients_str + " " + ingredient_name
-                converted_data.append(ingredient_obj)
-        return converted_data, ingredients_str
-
-    def __remove_stopwords(self, stop_text):
-        return ' '.join([word for word in stop_text.split() if word.lower() not in self.__stop_words])
-
-    def __preprocess_model(self):
-        self.__setup_df()
-        # Handle missing values in specific columns
-        self.__df['directions'] = self.__df['directions'].fillna('')
-        self.__df['ingredients'] = self.__df['ingredients'].fillna('')
-        self.__df["title"] = self.__df["title"].fillna('')
-
-        # self.__df['title'] = self.__df['title'].str.lower()
-        # self.__df['ingredients'] = self.__df['ingredients'].str.lower()
-        # self.__df['directions'] = self.__df['directions'].str.lower()
-
-        # Remove punctuation
-        self.__df['title'] = self.__df['title'].str.translate(str.maketrans('', '', string.punctuation))
-        self.__df['ingredients'] = self.__df['ingredients'].apply(
-            lambda x: [s.translate(str.maketrans('', '', string.punctuation.replace('/', ''))) for s in
-                       x] if isinstance(x, list) else x)
-        self.__df['directions'] = self.__df['directions'].apply(
-            lambda x: [s.translate(str.maketrans('', '', string.punctuation.replace('/', ''))) for s in
-                       x] if isinstance(x, list) else x)
-
-        # Remove stop words
-        self.__stop_words = set(stopwords.words('english'))
-        self.__df['title'] = self.__df['title'].apply(
-            lambda x: ' '.join([word for word in word_tokenize(x) if word not in self.__stop_words]))
-        self.__df['ingredients'] = self.__df['ingredients'].apply(
-            lambda x: [self.__remove_stopwords(s) for s in x] if isinstance(x, list) else x)
-        self.__df['directions'] = self.__df['directions'].apply(
-            lambda x: [self.__remove_stopwords(s) for s in x] if isinstance(x, list) else x)
-
-        if 'formatted_ingredients' not in self.__df.columns:
-            self.__df["formatted_ingredients"], self.__df["all_ingredients"] = zip(
-                *self.__df["ingredients"].apply(self.__convert_ingredients))
-            data_list = self.__df.to_dict(orient="records")
-            self.__recipe_service.update_all_recipes(data_list)
-        pass
-
-    @staticmethod
-    def __is_allergen_np_in_ingredients(ingredients, allergens_np):
-        ingredient_ids = [ingredient["id"] for ingredient in ingredients]
-        is_allergen = [allergen in ingredient_ids for allergen in allergens_np]
-        return True in is_allergen
-
-    # Content-Based Filtering
-    def __content_based_filtering(self, user):
-        # Remove recipes with allergens and not preferred ingredients
-
-        filtered_df = self.__df[
-            ~self.__df['formatted_ingredients'].apply(self.__is_allergen_np_in_ingredients,
-                                                      allergens_np=user["allergens_and_not_preferred"])]
-        # Calculate content-based similarity score
-        tfidf = TfidfVectorizer()
-        recipe_profiles = tfidf.fit_transform(filtered_df['all_ingredients'])
-
-        # Create a user profile based on their favorite recipes
-        favorite_ids = [ObjectId(fav_id) for fav_id in user["favorites"]]
-        print(favorite_ids, 'FAV IDS')
-        print(filtered_df['_id'].values, 'f_df')
-        user_favorites = filtered_df[filtered_df["_id"].isin(favorite_ids)]
-        user_profile = user_favorites['all_ingredients'].str.cat(sep=' ')
-
-        # Calculate cosine similarity between user profile and recipe profiles
-        user_profile_vec = tfidf.transform([user_profile])
-        similarity_scores = cosine_similarity(recipe_profiles, user_profile_vec)
-        # Rank recipes based on similarity scores
-        filtered_df.loc[:, 'similarity_score'] = similarity_scores.flatten()
-        filtered_df = filtered_df.sort_values(by='similarity_score', ascending=False)
-
-        return filtered_df
+            # Parsing runs offline in jobs/preprocess_recipes.py; web workers only read its output
+            if self.__cache.get_cache(PREPROCESSING_VERSION_KEY) != PREPROCESSING_VERSION:
+                logging.warning("Recipes have not been preprocessed by the current pipeline version. "
+                                "Run `python -m jobs.preprocess_recipes`.")
+
+    def __allowed_recipes_mask(self, allergens_np):
+        allowed_mask = np.ones(len(self.__df), dtype=bool)
+        for allergen in set(allergens_np):
+            rows = self.__ingredient_rows.get(allergen)
+            if rows is not None:
+                allowed_mask[rows] = False
+        return allowed_mask
+
+    def __content_scores(self, user):
+        # Similarity of every DataFrame row to the user's favorites, plus the mask of rows free of their allergens
+        with self.__lock:
+            allowed_mask = self.__allowed_recipes_mask(user["allergens_and_not_preferred"])
+            favorite_rows = self.__get_rows_by_recipe_ids(user["favorites"])
+            favorite_rows = favorite_rows[allowed_mask[favorite_rows]]
+            user_profile = ' '.join(self.__df["all_ingredients"].values[favorite_rows])
+        # The index takes a recipe before this service hears about it, so it can hold rows the DataFrame does not
+        # have yet; those are left out until they are appended
+        return allowed_mask, self.__recipe_index.score(user_profile)[:len(allowed_mask)]
 
     # Collaborative Filtering
-    def __collaborative_filtering(self, other_users, user):
-        # Filter user preferences to exclude the current user
-        other_users_preferences = [prefs for prefs in other_users if prefs['id'] != user['id']]
-
-        # Find users with similar preferences
-        similar_users = []
-        for prefs in other_users_preferences:
-            common_favorites = set(user['favorites']).intersection(prefs['favorites'])
-            common_not_preferred = set(user['allergens_and_not_preferred']).intersection(
-                prefs['allergens_and_not_preferred'])
-            if len(common_favorites) > 0 or len(common_not_preferred) > 0:
-                similarity = len(common_favorites) - len(common_not_preferred)
-                similar_users.append((prefs['id'], similarity))
-
-        # Sort similar users based on similarity score
-        similar_users = sorted(similar_users, key=lambda x: x[1], reverse=True)
-
-        # Generate collaborative filtering recommendation list
-        recommendation_list = []
-        for user_id, similarity in similar_users:
-            for prefs in other_users:
-                if prefs['id'] == user_id:
-                    pref_obj_ids = [ObjectId(str_id) for str_id in prefs['favorites']]
-                    user_recipes = self.__df.loc[self.__df['_id'].isin(pref_obj_ids)]
-                    new_recipes = [str(recipe) for recipe in user_recipes['_id'].tolist() if
-                                   recipe not in recommendation_list]
-                    recommendation_list.extend(new_recipes)
-                    break
-        return recommendation_list
-
-    @staticmethod
-    def __get_index_by_recipe_id(recipe_id, content_based):
-        condition = content_based['_id'] == ObjectId(recipe_id)
-        index = content_based[condition].index
-        if not index.empty:
-            return index.item()
-        else:
-            print("No rows found with the specified condition.")
-        # index = content_based.loc[str(content_based['_id']) is str(recipe_id)].index
-        # return index
-
-    def __recommendation_system(self, other_users, user):
-        # Content-based filtering
-        content_based_results = self.__content_based_filtering(user)
-
-        # Collaborative filtering
-        collaborative_results = self.__collaborative_filtering(other_users, user)
-        recommendation_list = \
-            [str(recipe_id) for recipe_id in content_based_results["_id"].tolist()] + collaborative_results
-        recommendation_list = list(recommendation_list)
-
-        content_based_ids = [str(r_id) for r_id in content_based_results["_id"].tolist()]
-        # Sort recipes based on the final scores
-        final_scores = []
-        filtered_recommendation_list = []  # New list to store the filtered recommendation indices
-        for recipe_id in recommendation_list:
-            if recipe_id in content_based_ids and ObjectId(recipe_id) not in filtered_recommendation_list:
-                recipe_index = self.__get_index_by_recipe_id(recipe_id, content_based_results)
-                content_score = content_based_results.loc[recipe_index, 'similarity_score']
-                final_scores.append(content_score)
-                filtered_recommendation_list.append(ObjectId(recipe_id))  # Add the recipe index to the filtered list
-
-        recommendation_df = self.__df.loc[self.__df['_id'].isin(filtered_recommendation_list)]
-        recommendation_df['final_score'] = final_scores
-        recommendation_df = recommendation_df.sort_values(by='final_score', ascending=False)
-        return recommendation_df
+    def __collaborative_scores(self, user, recipe_count):
+        # Score of every DataFrame row among the favorites of the most similar users, 0 for the rest
+        scores = np.zeros(recipe_count)
+        for recipe_id, score in self.__user_index.recommend_recipe_scores(user, top_k=SIMILAR_USER_COUNT):
+            row = self.__row_by_id.get(str(recipe_id))
+            if row is not None and row < recipe_count:
+                scores[row] = score
+        return scores
+
+    def __build_row_index(self):
+        self.__row_by_id = {str(recipe_id): row for row, recipe_id in enumerate(self.__df["_id"])}
+
+    def __get_rows_by_recipe_ids(self, recipe_ids):
+        rows = [self.__row_by_id.get(str(recipe_id)) for recipe_id in recipe_ids]
+        return np.array([row for row in rows if row is not None], dtype=np.int64)
+
+    def __rank_recipes(self, user, top_k=None):
+        allowed_mask, content_scores = self.__content_scores(user)
+        collaborative_scores = self.__collaborative_scores(user, len(allowed_mask))
+
+        # Collaborative picks still have to be free of the user's allergens
+        candidate_rows = np.flatnonzero(allowed_mask)
+        final_scores = (1 - COLLABORATIVE_WEIGHT) * content_scores[candidate_rows] + \
+            COLLABORATIVE_WEIGHT * collaborative_scores[candidate_rows]
+        total = len(candidate_rows)
+
+        if top_k is not None and total > top_k:
+            top = np.argpartition(-final_scores, top_k - 1)[:top_k]
+            candidate_rows, final_scores = candidate_rows[top], final_scores[top]
+        order = np.lexsort((candidate_rows, -final_scores))
+        return candidate_rows[order], final_scores[order], total
+
+    def __sync_user_index(self):
+        # Preference writes from this process update the index directly; writes made by other workers are
+        # picked up from their preferences_updated_on stamp at most once per refresh interval
+        synced_on = datetime.now()
+        last_synced_on = self.__user_index_synced_on
+        if not self.__user_index.is_loaded():
+            self.__user_index.load(self.__user_service.get_users_preferences())
+        elif last_synced_on is not None:
+            if synced_on - last_synced_on < PREFERENCES_REFRESH_INTERVAL:
+                return
+            for user in self.__user_service.get_users_preferences(updated_since=last_synced_on):
+                self.__user_index.update_user(user["id"], favorites=user["favorites"],
+                                              allergens=user["allergens_and_not_preferred"])
+        self.__user_index_synced_on = synced_on
+
+    def __get_user_preferences(self, user_id):
+        self.__sync_user_index()
+        current_user = self.__user_index.get_user(user_id)
+        if current_user is None:
+            current_user = self.__user_service.get_user_preferences(user_id)
+            if current_user:
+                self.__user_index.update_user(user_id, favorites=current_user["favorites"],
+                                              allergens=current_user["allergens_and_not_preferred"])
+        return current_user
+
+    def __get_ranked_recipes(self, current_user, top_k):
+        # Entries are keyed on the recipe index and user preference versions, so any change to either makes
+        # the old ranking unreachable and it ages out of the LRU. A deeper page than the cached one re-ranks.
+        cache_key = (current_user["id"], self.__recipe_index.version,
+                     self.__user_index.get_user_version(current_user["id"]))
+        ranked_recipes = self.__ranking_cache.get(cache_key)
+        if ranked_recipes is None or len(ranked_recipes[0]) < min(top_k, ranked_recipes[2]):
+            rows, final_scores, total = self.__rank_recipes(current_user, top_k)
+            ranked_recipes = ([str(r_id) for r_id in self.__df["_id"].values[rows]], final_scores.tolist(), total)
+            self.__ranking_cache.set(cache_key, ranked_recipes)
+        return ranked_recipes
+
+    def __get_recipe_records(self, recipe_ids, scores):
+        records = self.__recipe_service.get_recipes_by_ids(recipe_ids)
+        scores_by_id = dict(zip(recipe_ids, scores))
+        for record in records:
+            record["final_score"] = scores_by_id[str(record["_id"])]
+        return records
+
+    def get_ranking_cache_stats(self):
+        return self.__ranking_cache.get_stats()
 
     def get_user_recommendations(self, user_id, page_no):
         response = {}
-        current_user = user_preferences_entity(self.__user_service.get_user_details(user_id, is_raw_data=True))
-        all_users = users_preferences_entity(self.__user_service.get_all_users())
-        recommendation_list = self.__recommendation_system(all_users, current_user)
-        list_records = recipe_list_entity(recommendation_list.to_dict(orient="records"))
+        current_user = self.__get_user_preferences(user_id)
+        if current_user is None:
+            return {"response": {"message": "User does not exist", "status": "fail"}, "code": 404}
 
         if not page_no:
             page_number = 1
@@ -254,9 +219,12 @@ class RecommendationService:
         record_count = RecordCount.RECIPES.value
         start_index = (page_number - 1) * record_count
         end_index = start_index + record_count
-        response.update({"data": list_records[start_index:end_index], "total_records": len(list_records)})
+        ranked_ids, ranked_scores, total_records = self.__get_ranked_recipes(current_user, end_index)
+        list_records = recipe_list_entity(self.__get_recipe_records(ranked_ids[start_index:end_index],
+                                                                    ranked_scores[start_index:end_index]))
+        response.update({"data": list_records, "total_records": total_records})
 
-        if len(list_records) <= 0:
+        if total_records <= 0:
             response.update({
                 "message": 'Something went wrong. Try again after sometime.',
                 "status": 'fail'
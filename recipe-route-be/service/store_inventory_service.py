@@ -1,14 +1,29 @@
 from repo.store_inventory_repository import StoreInventoryRepository
+from repo.store_inventory_item_repository import StoreInventoryItemRepository
 from data_model.store_inventory import StoreInventory
 from service.ingredient_service import IngredientService
-import base64
+from utils.csv_stream import iter_base64_lines
+from flask_pymongo import ObjectId
+from pymongo.errors import PyMongoError
+import binascii
 import csv
-import io
+import logging
+
+IMPORT_BATCH_SIZE = 1000
+# Rows kept in the import report; error_count still counts every failed row
+MAX_REPORTED_ERRORS = 100
+
+
+def _record_error(report, row_number, error):
+    report["error_count"] += 1
+    if len(report["errors"]) < MAX_REPORTED_ERRORS:
+        report["errors"].append({"row": row_number, "error": error})
 
 
 class StoreInventoryService:
     def __init__(self):
         self.__repo = StoreInventoryRepository()
+        self.__item_repo = StoreInventoryItemRepository()
         self.__ingredient_service = IngredientService()
 
     def add_store_inventory(self, store_id):
@@ -26,69 +41,119 @@ class StoreInventoryService:
         return existing_ingredient_id
 
     def update_store_inventory(self, store_id, inventory_file):
-        items = {}
-        is_header_row = True
+        # inventory_file is the CSV as a base64 data URL
+        return self.import_inventory(store_id, iter_base64_lines(inventory_file))
 
-        base64_data = inventory_file.split(",")[1]
+    def import_inventory(self, store_id, lines):
+        # lines is any iterable of CSV text lines; rows are parsed, resolved and written one batch at a time
+        # Every written item is stamped with this import's id; items the file no longer lists are removed once
+        # the whole file has been read without errors, so a failed upload leaves the previous inventory in place
+        report = {"imported": 0, "ingredients_added": 0, "errors": [], "error_count": 0}
+        import_id = str(ObjectId())
+        csv_reader = csv.reader(lines)
+        try:
+            next(csv_reader, None)
+            batch = []
+            for row_number, line in enumerate(csv_reader, start=2):
+                item = self.__parse_inventory_row(row_number, line, report)
+                if item:
+                    batch.append((row_number, item))
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    self.__write_inventory_batch(store_id, batch, import_id, report)
+                    batch = []
+            if batch:
+                self.__write_inventory_batch(store_id, batch, import_id, report)
+            # A row that failed to parse or save is not stamped with import_id but may still be a listed item, so
+            # unlisted items are only removed when every row went through
+            if report["imported"] > 0 and report["error_count"] == 0:
+                self.__item_repo.remove_items_not_imported(str(store_id), import_id)
+        except (binascii.Error, UnicodeDecodeError, csv.Error, OSError, EOFError) as ex:
+            logging.warning(f"{ex}")
+            return {"response": {"message": "Inventory file could not be read.", "status": "fail", "data": report},
+                    "code": 400}
 
-        decoded_csv = base64.b64decode(base64_data)
-        csv_file = io.StringIO(decoded_csv.decode())
-        csv_reader = csv.reader(csv_file)
+        if report["imported"] == 0 and report["error_count"]:
+            return {"response": {"message": "No inventory rows could be imported.", "status": "fail",
+                                 "data": report}, "code": 400}
+        return {"response": {"message": "Successfully updated inventory.", "status": "success", "data": report},
+                "code": 200}
 
-        for line in csv_reader:
-            if is_header_row:
-                is_header_row = False
-                continue
-            if len(line) < 6:
-                continue
-
-            item_name = line[0].strip()
-            qty_measurement = line[1].strip()
+    @staticmethod
+    def __parse_inventory_row(row_number, line, report):
+        if not any(value.strip() for value in line):
+            return None
+        if len(line) < 6:
+            _record_error(report, row_number, f"Expected 6 columns, found {len(line)}.")
+            return None
+        if not line[0].strip():
+            _record_error(report, row_number, "Missing item name.")
+            return None
+        try:
             stock_qty = int(line[2].strip())
             price = float(line[3].strip())
-            item_type = line[4].strip()
-            stock_supplier = line[5].strip()
-
-            existing_ingredient_id = self.__fetch_ingredient_id(item_name, item_type)
-            # Create an item object with the extracted attributes
-            item = {existing_ingredient_id: {
-                'item_name': item_name,
-                'qty_measurement': qty_measurement,
-                'stock_qty': stock_qty,
-                "item_type": item_type,
-                'unit_price': price,
-                "stock_supplier": stock_supplier
-            }}
-            items.update(item)
-        if self.__repo.is_exist({"store_id": store_id}):
-            result = self.__repo.update_inventory(store_id, {"inventory": items})
-        else:
-            result = self.__repo.add_inventory({"store_id": str(store_id), "inventory": items})
-        if result.acknowledged:
-            return {"response": {"message": "Successfully updated inventory.", "status": "success"}, "code": 200}
-        return {"response": {"message": "Failed to update inventory.", "status": "fail"}, "code": 500}
+        except ValueError as ex:
+            _record_error(report, row_number, f"Invalid stock quantity or price: {ex}")
+            return None
+        return {
+            'item_name': line[0].strip(),
+            'qty_measurement': line[1].strip(),
+            'stock_qty': stock_qty,
+            "item_type": line[4].strip(),
+            'unit_price': price,
+            "stock_supplier": line[5].strip()
+        }
+
+    def __write_inventory_batch(self, store_id, batch, import_id, report):
+        # batch holds (row number, item) pairs. Rows that could not be saved are reported and the import carries
+        # on with the next batch.
+        try:
+            ingredient_ids, added_count = self.__ingredient_service.get_or_add_ingredient_ids(
+                [(item["item_name"], item["item_type"]) for _, item in batch])
+            report["ingredients_added"] += added_count
+            # Later rows for the same ingredient win, as they did when the whole file was loaded at once
+            items = {}
+            for row_number, item in batch:
+                ingredient_id = ingredient_ids.get(item['item_name'])
+                if ingredient_id:
+                    items[ingredient_id] = item
+                else:
+                    _record_error(report, row_number, "Ingredient could not be saved.")
+            self.__item_repo.upsert_items(str(store_id), items, import_id=import_id)
+        except PyMongoError as ex:
+            logging.warning(f"{ex}")
+            for row_number, _ in batch:
+                _record_error(report, row_number, "Row could not be saved.")
+            return
+        report["imported"] += sum(1 for _, item in batch if ingredient_ids.get(item['item_name']))
 
     def update_inventory_item(self, store_id, item_id, inventory_data):
-        result = self.__repo.update_inventory(store_id, {f"inventory.{item_id}": inventory_data})
+        result = self.__item_repo.update_item(store_id, item_id, inventory_data)
         if result.acknowledged:
             return {"response": {"message": "Successfully updated inventory item.", "status": "success"}, "code": 200}
         else:
             return {"response": {"message": "Failed to update inventory item.", "status": "fail"}, "code": 500}
 
-    def get_inventory(self, store_id):
-        result = self.__repo.get_inventory(store_id=store_id)
-        return result
+    def get_inventory(self, store_id, item_ids=None):
+        # Same shape as the old single inventory document: {"store_id", "inventory": {item_id: item}}
+        items = self.__item_repo.get_items(store_id, item_ids)
+        return {"store_id": store_id, "inventory": {item.pop("item_id"): item for item in items}}
+
+    def get_inventory_page(self, store_id, skip, limit, item_type=None, name_prefix=None, sort_by="name",
+                           descending=False):
+        return self.__item_repo.get_items_page(store_id, item_type=item_type, name_prefix=name_prefix,
+                                               sort_by=sort_by, descending=descending, skip=skip, limit=limit)
 
-    def update_store_inventory_stock(self, store_id, inventory_stock):
-        result = self.__repo.replace_store_inventory({"store_id": store_id}, inventory_stock)
-        return result
+    def decrement_stock(self, store_id, quantities, on_decremented=None):
+        # quantities maps item ids to the purchased qty
+        return self.__item_repo.decrement_stock(store_id, quantities, on_decremented=on_decremented)
 
     def add_inventory_item(self, store_id, inventory_item):
         item_id = self.__fetch_ingredient_id(inventory_item['item_name'], inventory_item['item_type'])
-        is_item_existing = self.__repo.is_exist({f"inventory.{item_id}": {"$exists": True}})
-        if int(is_item_existing) > 0:
+        if self.__item_repo.is_exist(store_id, item_id):
             return {"response": {"message": "Item already exists.", 'status': 'fail'}, 'code': 400}
-        result = self.__repo.update_inventory(store_id, {f"inventory.{item_id}": inventory_item})
-        if result.raw_result.get('ok') > 0 and result.raw_result.get('updatedExisting'):
+        result = self.__item_repo.add_item(store_id, item_id, inventory_item)
+        if result is None:
+            return {"response": {"message": "Item already exists.", 'status': 'fail'}, 'code': 400}
+        if result.acknowledged:
             return {'response': {'message': 'Item added to inventory successfully', 'status': 'success'}, 'code': 200}
         return {'response': {'message': 'Failed to add item in inventory', 'status': 'fail'}, 'code': 500}
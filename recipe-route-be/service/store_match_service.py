@@ -0,0 +1,45 @@
+from repo.store_inventory_item_repository import StoreInventoryItemRepository
+from repo.store_repository import StoreRepository
+from schemas.stores import store_entity
+from service.cart_service import CartService
+
+MAX_STORE_MATCHES = 20
+
+
+class StoreMatchService:
+    def __init__(self):
+        self.__item_repo = StoreInventoryItemRepository()
+        self.__store_repo = StoreRepository()
+        self.__cart_service = CartService()
+
+    def match_user_shopping_list(self, user_id, limit):
+        if limit and not str(limit).isdigit():
+            return {"response": {"message": "Invalid limit.", "status": "fail"}, "code": 400}
+        cart = self.__cart_service.get_user_cart_items(user_id, True)
+        if cart is None:
+            return {"response": {"message": "Failed to fetch user cart", "status": "fail"}, "code": 404}
+        return self.match_stores(list(cart.get("shoppingList", {}).keys()), limit)
+
+    def match_stores(self, item_ids, limit):
+        output = {"response": {"message": "Successfully matched stores", "status": "success", "data": []}, "code": 200}
+        item_ids = list(dict.fromkeys(item_ids))
+        if not item_ids:
+            output["response"]["message"] = "Shopping list is empty."
+            return output
+        limit = max(1, min(int(limit or MAX_STORE_MATCHES), MAX_STORE_MATCHES))
+
+        matches = list(self.__item_repo.get_store_matches(item_ids, limit))
+        stores = {str(store["_id"]): store for store in self.__store_repo.get_stores_by_ids(
+            [match["_id"] for match in matches])}
+        for match in matches:
+            store = stores.get(match["_id"])
+            if store is None:
+                continue
+            matched_ids = set(match["item_ids"])
+            store_details = store_entity(store)
+            store_details.update({"coverage": round(match["matched_count"] / len(item_ids), 2),
+                                  "matched_items": match["matched_count"],
+                                  "missing_items": [item_id for item_id in item_ids if item_id not in matched_ids],
+                                  "total_price": round(float(match["total_price"]), 2)})
+            output["response"]["data"].append(store_details)
+        return output
@@ -1,11 +1,27 @@
 from repo.store_repository import StoreRepository
-from schemas.stores import store_list_entity, store_entity, store_inventory_entity, inventory_list_entity
+from schemas.stores import store_list_entity, store_entity, store_inventory_entity, inventory_page_entity
+from repo.store_inventory_item_repository import SORT_FIELDS
 from service.store_inventory_service import StoreInventoryService
 from enums.record_count import RecordCount
+from utils.lru_cache import LRUCache
+from utils.postcode_locations import get_postcode_area, get_postcode_location
 from flask_pymongo import ObjectId
 
 from datetime import datetime
 
+STORE_COUNT_TTL_SECONDS = 60
+STORE_COUNT_KEY = "stores"
+NEAREST_STORES_CACHE_SIZE = 500
+NEAREST_STORES_TTL_SECONDS = 300
+MAX_NEAREST_STORES = 50
+
+# Shared by every StoreService instance; a new store resets it in this process and other workers catch up
+# within the TTL
+_store_count_cache = LRUCache(1, ttl=STORE_COUNT_TTL_SECONDS)
+# Keyed on (postcode area, limit); every postcode in an area geocodes to the same point, so the ranking is per area
+# rather than per street and shoppers in one area all get the same list
+_nearest_stores_cache = LRUCache(NEAREST_STORES_CACHE_SIZE, ttl=NEAREST_STORES_TTL_SECONDS)
+
 
 class StoreService:
     def __init__(self):
@@ -23,7 +39,12 @@ class StoreService:
         else:
             store["created_on"] = datetime.now()
             store["updated_on"] = datetime.now()
+            location = self.__get_location(store.get("address"))
+            if location:
+                store["location"] = location
             result = self.repo.add_store(store)
+            _store_count_cache.invalidate(STORE_COUNT_KEY)
+            _nearest_stores_cache.clear()
             self.__store_inventory_service.add_store_inventory(str(result.inserted_id))
             res.update({"data": str(result.inserted_id), "message": "Store successfully registered",
                         "status": "success"})
@@ -32,7 +53,13 @@ class StoreService:
         return {"response": res, "code": code}
 
     def update_store_details(self, store_id, store_details):
+        if "address" in store_details:
+            location = self.__get_location(store_details["address"])
+            if location:
+                store_details = {**store_details, "location": location}
         result = self.repo.update_store(store_id, store_details)
+        if "address" in store_details:
+            _nearest_stores_cache.clear()
         if result.acknowledged:
             return {"response": {"message": "Successfully update store details", "status": 'success'}, 'code': 200}
         return {"response": {"message": "Failed to update store details", "status": 'fail'}, 'code': 500}
@@ -53,27 +80,68 @@ class StoreService:
         else:
             return {"response": {"message": "Failed to fetch the store.", 'status': 'fail'}, "code": 500}
 
-    def get_all_stores(self, page_no, is_raw_data):
-
-        stores = list(self.repo.get_all())
+    def get_all_stores(self, page_no, is_raw_data, after=None):
 
         if is_raw_data:
-            return stores
+            return list(self.repo.get_all())
 
+        if after and not ObjectId.is_valid(after):
+            return {"response": {"message": "Invalid store cursor.", "status": "fail"}, "code": 400}
         if not page_no:
             page_number = 1
         else:
             page_number = int(page_no)
 
-        record_count = RecordCount.RECIPES.value
-        start_index = (page_number - 1) * record_count
-        end_index = start_index + record_count
+        record_count = RecordCount.STORES.value
+        # A cursor takes over from the page number, so deep pages do not have to skip over earlier stores
+        start_index = 0 if after else (page_number - 1) * record_count
+        stores = list(self.repo.get_page(record_count, skip=start_index, after_id=after))
+        next_cursor = str(stores[-1]["_id"]) if len(stores) == record_count else None
 
         return {"response": {"message": "Successfully fetched all stores", "data": {
-            "list": list(store_list_entity(stores))[start_index: end_index], "total_records": len(stores)}, "status":
-                                 "success"}, "code": 200}
-
-    def update_store_onboarding(self, store_id, store_image, store_inventory_file):
+            "list": store_list_entity(stores), "total_records": self.__count_stores(),
+            "next_cursor": next_cursor}, "status": "success"}, "code": 200}
+
+    def get_stores_by_ids(self, store_ids):
+        # Raw store documents keyed by id, limited to the store list fields
+        if not store_ids:
+            return {}
+        return {str(store["_id"]): store for store in self.repo.get_stores_by_ids(store_ids)}
+
+    def get_nearest_stores(self, post_code, limit):
+        area = get_postcode_area(post_code)
+        if area is None:
+            return {"response": {"message": "Invalid post code.", "status": "fail"}, "code": 400}
+        if limit and not str(limit).isdigit():
+            return {"response": {"message": "Invalid limit.", "status": "fail"}, "code": 400}
+        limit = max(1, min(int(limit or RecordCount.STORES.value), MAX_NEAREST_STORES))
+
+        stores = _nearest_stores_cache.get((area, limit))
+        if stores is None:
+            stores = []
+            for store in self.repo.get_nearest(get_postcode_location(post_code), limit):
+                store_details = store_entity(store)
+                store_details.update({"distance_km": round(store["distance"] / 1000, 1)})
+                stores.append(store_details)
+            _nearest_stores_cache.set((area, limit), stores)
+
+        return {"response": {"message": "Successfully fetched nearest stores", "data": {"list": stores},
+                             "status": "success"}, "code": 200}
+
+    @staticmethod
+    def __get_location(address):
+        if not isinstance(address, dict):
+            return None
+        return get_postcode_location(address.get("post_code"))
+
+    def __count_stores(self):
+        total_records = _store_count_cache.get(STORE_COUNT_KEY)
+        if total_records is None:
+            total_records = self.repo.count()
+            _store_count_cache.set(STORE_COUNT_KEY, total_records)
+        return total_records
+
+    def update_store_onboarding(self, store_id, store_image, store_inventory_file, store_inventory_lines=None):
         result_img = {}
         result_file = {}
         res = {'status': 'success'}
@@ -81,10 +149,15 @@ class StoreService:
         if store_image:
             result_img = self.update_store_details(store_id, {"store_image": store_image})
 
-        if store_inventory_file:
+        if store_inventory_lines is not None:
+            result_file = self.__store_inventory_service.import_inventory(store_id, store_inventory_lines)
+        elif store_inventory_file:
             result_file = self.__store_inventory_service.update_store_inventory(store_id=store_id,
                                                                                 inventory_file=store_inventory_file)
 
+        if result_file.get('response', {}).get('data'):
+            res.update({"inventory_report": result_file['response']['data']})
+
         if result_img.get('code') == 200 and result_file.get('code') == 200:
             res.update({"message": 'Successfully updated store image and inventory'})
             code = 200
@@ -95,7 +168,8 @@ class StoreService:
             res.update(
                 {"message": 'Successfully uploaded store image, but failed to update store inventory. Try again'})
             code = 200
-        elif result_img.get("code") != 200 and result_file.get('code') != 200 and store_image and store_inventory_file:
+        elif result_img.get("code") != 200 and result_file.get('code') != 200 and store_image and \
+                (store_inventory_file or store_inventory_lines is not None):
             res.update({"message": 'Failed to upload store image and store inventory. Try again after sometime.',
                         "status": 'fail'})
             code = 500
@@ -105,23 +179,16 @@ class StoreService:
 
         return {'response': res, 'code': code}
 
-    def update_store_inventory_order(self, store_id, inventory_stock_list):
-        store_details = self.__store_inventory_service.get_inventory(store_id)
-        for item_id, purchased_qty in inventory_stock_list.items():
-            if item_id in store_details["inventory"]:
-                current_stock_qty = store_details["inventory"][item_id]["stock_qty"]
-                new_stock_qty = current_stock_qty - purchased_qty
-                if new_stock_qty >= 0:
-                    store_details["inventory"][item_id]["stock_qty"] = new_stock_qty
-                else:
-                    print(f"Insufficient stock for item {item_id}")
-                    # Handle stock_qty check and inform user not available and return amount
-
-        self.__store_inventory_service.update_store_inventory_stock(store_details["_id"], store_details)
-
-    def get_store_inventory(self, store_id, page):
-        stores = self.__store_inventory_service.get_inventory(store_id)
-        inventory_list = inventory_list_entity(stores['inventory'])
+    def update_store_inventory_order(self, store_id, inventory_stock_list, on_decremented=None):
+        # Returns the items that are short of stock; nothing is decremented unless every item is available.
+        # on_decremented(session) writes in the decrement's transaction.
+        return self.__store_inventory_service.decrement_stock(store_id, inventory_stock_list,
+                                                              on_decremented=on_decremented)
+
+    def get_store_inventory(self, store_id, page, item_type=None, name_prefix=None, sort_by=None, order=None):
+        sort_by = sort_by or "name"
+        if sort_by not in SORT_FIELDS or order not in (None, "asc", "desc"):
+            return {"response": {"message": "Invalid inventory sort.", "status": "fail"}, "code": 400}
         if not page:
             page_number = 1
         else:
@@ -129,10 +196,12 @@ class StoreService:
 
         record_count = RecordCount.INVENTORY.value
         start_index = (page_number - 1) * record_count
-        end_index = start_index + record_count
+        items, total_records = self.__store_inventory_service.get_inventory_page(
+            store_id, start_index, record_count, item_type=item_type, name_prefix=name_prefix, sort_by=sort_by,
+            descending=order == "desc")
 
         return {"response": {"message": "Successfully fetched store inventory", "data": {
-            "list": list(inventory_list)[start_index: end_index], "total_records": len(inventory_list)}, "status":
+            "list": inventory_page_entity(items), "total_records": total_records}, "status":
                                  "success"}, "code": 200}
 
     def update_store_inventory_item(self, store_id, inventory_item):
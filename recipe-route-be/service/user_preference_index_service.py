@@ -0,0 +1,162 @@
+import threading
+
+import numpy as np
+from scipy import sparse
+
+
+class UserPreferenceIndexService:
+    # Sparse user x recipe favorites and user x ingredient aversion matrices used by collaborative filtering.
+    # Writes only touch the per-user column lists; the CSR matrices are rebuilt lazily on the next read.
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__is_loaded = False
+        self.__is_dirty = False
+        self.__generation = 0
+        self.__user_versions = {}
+        self.__user_ids = []
+        self.__row_by_user = {}
+        self.__recipe_ids = []
+        self.__recipe_cols = {}
+        self.__ingredient_ids = []
+        self.__ingredient_cols = {}
+        self.__favorite_cols = []
+        self.__aversion_cols = []
+        self.__favorites = None
+        self.__aversions = None
+
+    def is_loaded(self):
+        return self.__is_loaded
+
+    def load(self, users):
+        with self.__lock:
+            self.__user_ids = []
+            self.__row_by_user = {}
+            self.__recipe_ids = []
+            self.__recipe_cols = {}
+            self.__ingredient_ids = []
+            self.__ingredient_cols = {}
+            self.__favorite_cols = []
+            self.__aversion_cols = []
+            for user in users:
+                self.__set_user(user["id"], user.get("favorites", []), user.get("allergens_and_not_preferred", []))
+            self.__generation += 1
+            self.__user_versions = {}
+            self.__is_loaded = True
+            self.__is_dirty = True
+
+    def update_user(self, user_id, favorites=None, allergens=None):
+        # Users who are not loaded yet are picked up from the database by the next load()
+        with self.__lock:
+            if not self.__is_loaded:
+                return
+            self.__set_user(user_id, favorites, allergens)
+            self.__user_versions[str(user_id)] = self.__user_versions.get(str(user_id), 0) + 1
+            self.__is_dirty = True
+
+    def get_user_version(self, user_id):
+        # Changes whenever this user's favorites or allergens are written, or the whole index is reloaded
+        return self.__generation, self.__user_versions.get(str(user_id), 0)
+
+    def get_user(self, user_id):
+        with self.__lock:
+            row = self.__row_by_user.get(str(user_id))
+            if row is None:
+                return None
+            return {
+                "id": str(user_id),
+                "favorites": [self.__recipe_ids[col] for col in self.__favorite_cols[row]],
+                "allergens_and_not_preferred": [self.__ingredient_ids[col] for col in self.__aversion_cols[row]]
+            }
+
+    def similar_users(self, user, top_k):
+        favorites, aversions = self.__matrices()
+        rows, similarity = self.__similar_rows(favorites, aversions, user, top_k)
+        return [(self.__user_ids[row], int(score)) for row, score in zip(rows, similarity)]
+
+    def recommend_recipes(self, user, top_k):
+        return [recipe_id for recipe_id, _ in self.recommend_recipe_scores(user, top_k)]
+
+    def recommend_recipe_scores(self, user, top_k):
+        # (recipe id, score) pairs best first; scores are scaled so the best recipe scores 1
+        favorites, aversions = self.__matrices()
+        rows, similarity = self.__similar_rows(favorites, aversions, user, top_k)
+        if len(rows) == 0:
+            return []
+
+        # A recipe ranks by its most similar fan, which keeps the order of walking similar users best-first
+        weights = (similarity - similarity.min() + 1).astype(np.float64)
+        recipe_scores = favorites[rows].multiply(weights[:, np.newaxis]).tocsr().max(axis=0).toarray().ravel()
+        recipe_cols = np.flatnonzero(recipe_scores)
+        recipe_cols = recipe_cols[np.argsort(-recipe_scores[recipe_cols], kind='stable')]
+        recipe_scores = recipe_scores[recipe_cols] / recipe_scores[recipe_cols[0]]
+        return [(self.__recipe_ids[col], float(score)) for col, score in zip(recipe_cols, recipe_scores)]
+
+    def __set_user(self, user_id, favorites, allergens):
+        user_id = str(user_id)
+        row = self.__row_by_user.get(user_id)
+        if row is None:
+            row = len(self.__user_ids)
+            self.__row_by_user[user_id] = row
+            self.__user_ids.append(user_id)
+            self.__favorite_cols.append(np.array([], dtype=np.int32))
+            self.__aversion_cols.append(np.array([], dtype=np.int32))
+        if favorites is not None:
+            self.__favorite_cols[row] = self.__columns(favorites, self.__recipe_cols, self.__recipe_ids)
+        if allergens is not None:
+            self.__aversion_cols[row] = self.__columns(allergens, self.__ingredient_cols, self.__ingredient_ids)
+
+    @staticmethod
+    def __columns(values, col_map, col_names):
+        cols = set()
+        for value in values:
+            value = str(value)
+            col = col_map.get(value)
+            if col is None:
+                col = len(col_map)
+                col_map[value] = col
+                col_names.append(value)
+            cols.add(col)
+        return np.array(sorted(cols), dtype=np.int32)
+
+    @staticmethod
+    def __build_csr(row_cols, col_count):
+        indptr = np.zeros(len(row_cols) + 1, dtype=np.int64)
+        np.cumsum([len(cols) for cols in row_cols], out=indptr[1:])
+        indices = np.concatenate(row_cols) if row_cols else np.array([], dtype=np.int32)
+        data = np.ones(len(indices), dtype=np.int32)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(row_cols), col_count))
+
+    def __matrices(self):
+        with self.__lock:
+            if self.__is_dirty or self.__favorites is None:
+                self.__favorites = self.__build_csr(self.__favorite_cols, len(self.__recipe_cols))
+                self.__aversions = self.__build_csr(self.__aversion_cols, len(self.__ingredient_cols))
+                self.__is_dirty = False
+            return self.__favorites, self.__aversions
+
+    @staticmethod
+    def __query_vector(values, col_map, size):
+        # Columns created after the last rebuild are not in the matrix yet, so they are left out of the query
+        query = np.zeros(size, dtype=np.int32)
+        cols = [col_map[str(value)] for value in values if col_map.get(str(value), size) < size]
+        query[cols] = 1
+        return query
+
+    def __similar_rows(self, favorites, aversions, user, top_k):
+        common_favorites = favorites @ self.__query_vector(user["favorites"], self.__recipe_cols,
+                                                           favorites.shape[1])
+        common_not_preferred = aversions @ self.__query_vector(user["allergens_and_not_preferred"],
+                                                               self.__ingredient_cols, aversions.shape[1])
+
+        is_similar = (common_favorites > 0) | (common_not_preferred > 0)
+        own_row = self.__row_by_user.get(str(user["id"]))
+        if own_row is not None and own_row < len(is_similar):
+            is_similar[own_row] = False
+        rows = np.flatnonzero(is_similar)
+        similarity = common_favorites[rows] - common_not_preferred[rows]
+
+        if len(rows) > top_k:
+            top_rows = np.argpartition(-similarity, top_k - 1)[:top_k]
+            rows, similarity = rows[top_rows], similarity[top_rows]
+        order = np.argsort(-similarity, kind='stable')
+        return rows[order], similarity[order]
@@ -0,0 +1,16 @@
+from service.user_preference_index_service import UserPreferenceIndexService
+
+
+class UserPreferenceIndexServiceSingleton:
+    __instance = None
+
+    @staticmethod
+    def get_instance():
+        if UserPreferenceIndexServiceSingleton.__instance is None:
+            UserPreferenceIndexServiceSingleton()
+        return UserPreferenceIndexServiceSingleton.__instance
+
+    def __init__(self):
+        if UserPreferenceIndexServiceSingleton.__instance is not None:
+            raise Exception("This class is a singleton! Use 'get_instance()' to get the instance.")
+        UserPreferenceIndexServiceSingleton.__instance = UserPreferenceIndexService()
@@ -3,12 +3,13 @@ from service.meal_planner_service import MealPlannerService
 from service.cart_service import CartService
 from service.store_service import StoreService
 from service.order_service import OrderService
+from service.user_preference_index_service_singleton import UserPreferenceIndexServiceSingleton
 
 from flask_bcrypt import Bcrypt
 import logging
 from datetime import timedelta, datetime
 import jwt
-from schemas.users import user_entity
+from schemas.users import user_entity, user_preferences_entity, users_preferences_entity
 from enums.roles import Roles
 
 
@@ -25,6 +26,7 @@ class UserService:
         self.__cart_service = CartService()
         self.__store_service = StoreService()
         self.__order_service = OrderService()
+        self.__user_index = UserPreferenceIndexServiceSingleton.get_instance()
 
     def register_user(self, user):
         existing_user = self.repo.get_user(user["email"])
@@ -128,6 +130,18 @@ class UserService:
         result = self.repo.get_all({"role": Roles.USER.value})
         return list(result)
 
+    def get_users_preferences(self, updated_since=None):
+        query = {"role": Roles.USER.value}
+        if updated_since:
+            query["preferences_updated_on"] = {"$gte": updated_since}
+        return users_preferences_entity(self.repo.get_all_preferences(query))
+
+    def get_user_preferences(self, user_id):
+        result = self.repo.get_user_preferences(user_id)
+        if result:
+            return user_preferences_entity(result)
+        return None
+
     def get_user_details(self, user_id, is_raw_data):
         retrieved_user = self.repo.get_user_by_id(user_id)
 
@@ -156,7 +170,11 @@ class UserService:
         if existing_user:
             user_preferences = existing_user["preferences"]
             user_preferences.update(data)
-            self.repo.update_user_details(user_id, {"preferences": user_preferences})
+            self.repo.update_user_details(user_id, {"preferences": user_preferences,
+                                                    "preferences_updated_on": datetime.now()})
+            if "favorites" in data or "allergens_and_not_preferred" in data:
+                self.__user_index.update_user(user_id, favorites=user_preferences.get("favorites"),
+                                              allergens=user_preferences.get("allergens_and_not_preferred"))
             res.update({"message": "Successfully updated user preferences", "status": "success"})
             code = 200
         else:
@@ -174,7 +192,9 @@ class UserService:
                 favorites.remove(recipe_id)
             else:
                 favorites.append(recipe_id)
-            self.repo.update_user_details(user_id, {"preferences.favorites": favorites})
+            self.repo.update_user_details(user_id, {"preferences.favorites": favorites,
+                                                    "preferences_updated_on": datetime.now()})
+            self.__user_index.update_user(user_id, favorites=favorites)
             res.update({"message": "Successfully updated user preferences", "status": "success"})
             code = 200
         else:
@@ -0,0 +1,38 @@
+import base64
+import csv
+import gzip
+import io
+import unittest
+
+from utils.csv_stream import iter_base64_lines, iter_stream_lines
+
+
+class TestCsvStream(unittest.TestCase):
+
+    def setUp(self):
+        self.csv_data = 'item_name,qty\r\n"Tomato, cherry",1 kg\r\n"Multi\nline",2\r\nCrème fraîche,3'
+        self.expected_rows = list(csv.reader(io.StringIO(self.csv_data, newline='')))
+
+    def test_base64_lines_across_chunk_boundaries(self):
+        data_url = "data:text/csv;base64," + base64.b64encode(self.csv_data.encode()).decode()
+
+        for chunk_size in (4, 8, 20, 1024):
+            self.assertEqual(list(csv.reader(iter_base64_lines(data_url, chunk_size=chunk_size))),
+                             self.expected_rows)
+
+    def test_base64_lines_of_empty_upload(self):
+        self.assertEqual(list(iter_base64_lines("base64_encoded_csv_data_here,")), [])
+
+    def test_stream_lines(self):
+        stream = io.BytesIO(self.csv_data.encode())
+
+        self.assertEqual(list(csv.reader(iter_stream_lines(stream))), self.expected_rows)
+
+    def test_gzip_stream_lines(self):
+        stream = io.BytesIO(gzip.compress(self.csv_data.encode()))
+
+        self.assertEqual(list(csv.reader(iter_stream_lines(stream, is_gzip=True))), self.expected_rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+from unittest.mock import MagicMock
+
+from db.indexes import INDEXES, ensure_collection_indexes
+
+
+class TestIndexes(unittest.TestCase):
+
+    def test_ingredient_names_are_backfilled_before_indexing(self):
+        collection = MagicMock()
+        collection.name = "ingredients"
+
+        ensure_collection_indexes(collection)
+
+        self.assertEqual([call[0] for call in collection.method_calls], ["update_many", "create_indexes"])
+        self.assertEqual(collection.update_many.call_args.args,
+                         ({"name_lc": {"$exists": False}}, [{"$set": {"name_lc": {"$toLower": "$name"}}}]))
+        collection.create_indexes.assert_called_once_with(INDEXES["ingredients"])
+
+    def test_other_collections_are_only_indexed(self):
+        collection = MagicMock()
+        collection.name = "orders"
+
+        ensure_collection_indexes(collection)
+
+        collection.update_many.assert_not_called()
+        collection.create_indexes.assert_called_once_with(INDEXES["orders"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import threading
+import unittest
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from flask_pymongo import ObjectId
+
+from service.ingredient_catalog_service import IngredientCatalogService
+
+
+class TestIngredientCatalogService(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = IngredientCatalogService()
+        self.repo_mock = MagicMock()
+        self.cache_repo_mock = MagicMock()
+        self.catalog._IngredientCatalogService__repo = self.repo_mock
+        self.catalog._IngredientCatalogService__cache_repo = self.cache_repo_mock
+        self.repo_mock.get_names.return_value = [
+            {"_id": ObjectId("64cc0e999abf42b6ae5fd6c5"), "name": "Sugar"},
+            {"_id": ObjectId("64cc0d590b089494d30111d0"), "name": "Soy Sauce"}]
+        self.cache_repo_mock.get_cache.return_value = 3
+
+    def __expire_refresh_interval(self):
+        checked_on = self.catalog._IngredientCatalogService__checked_on
+        self.catalog._IngredientCatalogService__checked_on = checked_on - timedelta(minutes=1)
+
+    def test_catalog_is_loaded_once(self):
+        self.assertEqual(self.catalog.get_ingredient_id("soy sauce"), "64cc0d590b089494d30111d0")
+        self.assertEqual(self.catalog.get_ingredient_id("sugar"), "64cc0e999abf42b6ae5fd6c5")
+
+        self.repo_mock.get_names.assert_called_once_with()
+
+    def test_add_ingredient_updates_catalog_in_place(self):
+        self.catalog.get_ingredient_id("sugar")
+
+        self.catalog.add_ingredient("Paprika", "64cc1995a77576259979153a")
+
+        self.assertEqual(self.catalog.get_ingredient_id("paprika"), "64cc1995a77576259979153a")
+        self.cache_repo_mock.increment_cache.assert_called_once_with("ingredient_catalog_version")
+        self.repo_mock.get_names.assert_called_once_with()
+
+    def test_changes_from_other_workers_are_delta_loaded(self):
+        self.catalog.get_ingredient_id("sugar")
+        self.repo_mock.get_names.return_value = [{"_id": ObjectId("64cc1995a77576259979153a"), "name": "Paprika"}]
+        self.cache_repo_mock.get_cache.return_value = 4
+        self.assertIsNone(self.catalog.get_ingredient_id("paprika"))
+
+        self.__expire_refresh_interval()
+
+        self.assertEqual(self.catalog.get_ingredient_id("paprika"), "64cc1995a77576259979153a")
+        since_id = self.repo_mock.get_names.call_args.args[0]
+        self.assertLess(since_id, ObjectId("64cc0e999abf42b6ae5fd6c5"))
+
+    def test_unchanged_version_skips_delta_load(self):
+        self.catalog.get_ingredient_id("sugar")
+        self.__expire_refresh_interval()
+
+        self.catalog.get_ingredient_id("sugar")
+
+        self.repo_mock.get_names.assert_called_once_with()
+
+    def test_delta_load_does_not_block_adds(self):
+        self.catalog.get_ingredient_id("sugar")
+        delta_started, release_delta = threading.Event(), threading.Event()
+
+        def get_names(since_id=None):
+            delta_started.set()
+            release_delta.wait(5)
+            return [{"_id": ObjectId("64cc1995a77576259979153a"), "name": "Paprika"}]
+
+        self.repo_mock.get_names.side_effect = get_names
+        self.cache_repo_mock.get_cache.return_value = 4
+        self.__expire_refresh_interval()
+        refresh = threading.Thread(target=self.catalog.get_ingredient_id, args=("paprika",))
+        refresh.start()
+        self.assertTrue(delta_started.wait(5))
+
+        adder = threading.Thread(target=self.catalog.add_ingredient, args=("Cumin", "64cc1995a77576259979153c"))
+        adder.start()
+        adder.join(1)
+        is_add_blocked = adder.is_alive()
+        release_delta.set()
+        refresh.join(5)
+        adder.join(5)
+
+        self.assertFalse(is_add_blocked)
+        self.assertEqual(self.catalog.get_ingredient_id("paprika"), "64cc1995a77576259979153a")
+        self.assertEqual(self.catalog.get_ingredient_id("cumin"), "64cc1995a77576259979153c")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import threading
+import unittest
+
+from fuzzywuzzy import process
+
+from utils.ingredient_matcher import IngredientMatcher
+
+
+class TestIngredientMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.ingredient_ids = {"sugar": "64cc0e999abf42b6ae5fd6c5", "brown sugar": "64cc0e999abf42b6ae5fd6c6",
+                               "soy sauce": "64cc0d590b089494d30111d0", "chicken breast": "64cc1983da014172ef6b7852",
+                               "chicken stock": "64cc1995a77576259979157a", "olive oil": "64cc1995a77576259979153a"}
+        self.matcher = IngredientMatcher(self.ingredient_ids)
+
+    def test_match_exact_and_fuzzy_names(self):
+        self.assertEqual(self.matcher.match("Soy Sauce"), "64cc0d590b089494d30111d0")
+        self.assertEqual(self.matcher.match("chiken breast"), "64cc1983da014172ef6b7852")
+        self.assertIsNone(self.matcher.match("paprika"))
+        self.assertIsNone(self.matcher.match("!!"))
+        self.assertIsNone(IngredientMatcher({}).match("sugar"))
+
+    def test_match_agrees_with_extract_one(self):
+        names = list(self.ingredient_ids.keys())
+        for query in ["sugar", "Sugar, to taste", "brwn sugar", "sauce soy", "extra virgin olive oil",
+                      "chicken", "chicken stock cube", "breast chicken", "oil", "star anise"]:
+            matched_name, confidence = process.extractOne(query.lower(), names)
+            expected = self.ingredient_ids[matched_name] if confidence > 86 else None
+            self.assertEqual(self.matcher.match(query), expected, query)
+
+    def test_add_makes_new_names_matchable(self):
+        self.assertIsNone(self.matcher.match("smoked paprika"))
+
+        self.matcher.add("Smoked Paprika", "64cc1995a77576259979153b")
+
+        self.assertEqual(self.matcher.match("smoked paprika"), "64cc1995a77576259979153b")
+        self.assertEqual(self.matcher.match("smokd paprika"), "64cc1995a77576259979153b")
+        self.assertEqual(len(self.matcher), 7)
+
+    def test_match_is_memoised(self):
+        self.matcher.match("chiken breast")
+        self.matcher.match("Chiken Breast")
+
+        self.assertEqual(self.matcher.get_stats()["hits"], 1)
+
+    def test_match_while_adding(self):
+        errors = []
+
+        def add_ingredients():
+            for i in range(300):
+                self.matcher.add(f"spice blend {i}", f"64cc1995a7757625997{i:05d}")
+
+        def match_ingredients():
+            try:
+                for i in range(300):
+                    self.matcher.match(f"spice blend {i} mix")
+            except Exception as ex:
+                errors.append(ex)
+
+        threads = [threading.Thread(target=add_ingredients)] + \
+            [threading.Thread(target=match_ingredients) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self.matcher.match("spice blend 299"), "64cc1995a775762599700299")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+from unittest.mock import MagicMock
+
+from repo.ingredient_repository import IngredientRepository
+
+
+class TestIngredientRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.ingredient_repository = IngredientRepository()
+        self.ingredient_repository.ingredients = MagicMock()
+
+    def test_search_by_prefix_is_anchored_and_escaped(self):
+        self.ingredient_repository.search_by_prefix("Chilli (Red", 10, "SPICE")
+
+        self.ingredient_repository.ingredients.find.assert_called_once_with(
+            {"name_lc": {"$regex": "^chilli\\ \\(red"}, "type": "SPICE"}, {"name": 1, "type": 1})
+        cursor = self.ingredient_repository.ingredients.find.return_value
+        cursor.sort.assert_called_once_with("name_lc", 1)
+        cursor.sort.return_value.limit.assert_called_once_with(10)
+
+    def test_get_ingredient_matches_lowercased_name(self):
+        self.ingredient_repository.get_ingredient("Tomato.*")
+
+        self.ingredient_repository.ingredients.find_one.assert_called_once_with({"name_lc": "tomato.*"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,8 @@
 import unittest
 from service.ingredient_service import IngredientService
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 from schemas.ingredients import ingredient_list_entity
+from pymongo.errors import BulkWriteError
 
 
 class TestIngredientService(unittest.TestCase):
@@ -50,6 +51,79 @@ class TestIngredientService(unittest.TestCase):
 
     # Add more test cases for the remaining methods in IngredientService class
 
+    def test_add_ingredient_updates_catalog(self):
+        catalog_mock = MagicMock()
+        self.ingredient_service._IngredientService__catalog = catalog_mock
+        self.ingredient_service.repo.add_ingredient = MagicMock(return_value=MagicMock(inserted_id="64cc1995a7757625"))
+
+        self.ingredient_service.add_ingredient("Paprika", "SPICE")
+
+        catalog_mock.add_ingredient.assert_called_once_with("Paprika", "64cc1995a7757625")
+
+    def test_get_or_add_ingredient_ids_inserts_unknown_names_once(self):
+        catalog_mock = MagicMock()
+        catalog_mock.get_ingredient_id.side_effect = lambda name: "64cc1995a77576259979157a" \
+            if name == "Tomato" else None
+        self.ingredient_service._IngredientService__catalog = catalog_mock
+        self.ingredient_service.repo.add_ingredients = MagicMock(
+            return_value=MagicMock(inserted_ids=["64cc1995a77576259979153a"]))
+
+        result = self.ingredient_service.get_or_add_ingredient_ids(
+            [("Tomato", "VEGETABLE"), ("Paprika", "SPICE"), ("paprika", "SPICE")])
+
+        self.assertEqual(result, ({"Tomato": "64cc1995a77576259979157a", "Paprika": "64cc1995a77576259979153a",
+                                   "paprika": "64cc1995a77576259979153a"}, 1))
+        self.ingredient_service.repo.add_ingredients.assert_called_once_with(
+            [{"name": "Paprika", "name_lc": "paprika", "type": "SPICE", "calorie": 0}])
+        catalog_mock.add_ingredients.assert_called_once_with([("Paprika", "64cc1995a77576259979153a")])
+
+    def test_get_or_add_ingredient_ids_keeps_inserts_that_did_not_fail(self):
+        catalog_mock = MagicMock()
+        catalog_mock.get_ingredient_id.return_value = None
+        self.ingredient_service._IngredientService__catalog = catalog_mock
+
+        def add_ingredients(documents):
+            documents[0]["_id"] = "64cc1995a77576259979153a"
+            documents[1]["_id"] = "64cc1995a77576259979153b"
+            raise BulkWriteError({"writeErrors": [{"index": 1, "code": 11000}], "nInserted": 1})
+
+        self.ingredient_service.repo.add_ingredients = MagicMock(side_effect=add_ingredients)
+        self.ingredient_service.repo.get_ingredient = MagicMock(
+            side_effect=lambda name: {"_id": "64cc1995a77576259979153c"} if name == "Cumin" else None)
+
+        result = self.ingredient_service.get_or_add_ingredient_ids(
+            [("Paprika", "SPICE"), ("Cumin", "SPICE")])
+
+        self.assertEqual(result, ({"Paprika": "64cc1995a77576259979153a", "Cumin": "64cc1995a77576259979153c"}, 1))
+        catalog_mock.add_ingredients.assert_called_once_with([("Paprika", "64cc1995a77576259979153a")])
+
+    def test_autocomplete_returns_prefix_matches(self):
+        self.ingredient_service.repo.search_by_prefix = MagicMock(return_value=[
+            {"_id": "64cbd6fa66d0e5fe2f4b1b90", "name": "Tomato", "type": "VEGETABLE"},
+            {"_id": "64cbd701d9b42f2182a72c17", "name": "Tomato paste", "type": "CONDIMENT"}])
+
+        result = self.ingredient_service.autocomplete(" Tom ", limit="500")
+
+        self.assertEqual(result["code"], 200)
+        self.assertEqual([item["name"] for item in result["response"]["data"]], ["Tomato", "Tomato paste"])
+        self.ingredient_service.repo.search_by_prefix.assert_called_once_with("Tom", 50, None)
+
+    def test_autocomplete_requires_search_text(self):
+        self.ingredient_service.repo.search_by_prefix = MagicMock()
+
+        result = self.ingredient_service.autocomplete("  ")
+
+        self.assertEqual(result["code"], 400)
+        self.ingredient_service.repo.search_by_prefix.assert_not_called()
+
+    def test_autocomplete_rejects_invalid_limit(self):
+        self.ingredient_service.repo.search_by_prefix = MagicMock()
+
+        result = self.ingredient_service.autocomplete("tom", limit="abc")
+
+        self.assertEqual(result["code"], 400)
+        self.ingredient_service.repo.search_by_prefix.assert_not_called()
+
 
 if __name__ == '__main__':
     unittest.main()
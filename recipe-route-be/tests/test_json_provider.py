@@ -0,0 +1,78 @@
+import datetime
+import json
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+from bson import ObjectId
+from flask import Flask
+
+from utils.json_provider import FastJSONProvider
+
+
+class TestFastJSONProvider(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.json = FastJSONProvider(self.app)
+        self.payload = {
+            "id": ObjectId("64cbfcd25d7a7a77b7fd475e"),
+            "created_on": datetime.datetime(2023, 8, 3, 10, 30),
+            "similarity_score": np.float32(0.5),
+            "calories": np.int64(500),
+            "scores": np.array([1.5, 2.5]),
+            "title": "Tomato Soup",
+        }
+        self.expected = {"id": "64cbfcd25d7a7a77b7fd475e", "created_on": "Thu, 03 Aug 2023 10:30:00 GMT",
+                         "similarity_score": 0.5, "calories": 500, "scores": [1.5, 2.5], "title": "Tomato Soup"}
+
+    def test_dumps_encodes_objectid_datetime_and_numpy(self):
+        self.assertEqual(json.loads(self.app.json.dumps(self.payload)), self.expected)
+
+    def test_response_decodes_like_standard_encoder(self):
+        with self.app.app_context():
+            response = self.app.json.response(self.payload)
+            with patch('utils.json_provider.orjson', None):
+                fallback_response = self.app.json.response(self.payload)
+
+        self.assertEqual(response.mimetype, "application/json")
+        self.assertEqual(response.get_json(), self.expected)
+        self.assertEqual(fallback_response.get_json(), self.expected)
+
+    def test_text_is_sent_as_utf8_on_both_paths(self):
+        payload = {"title": "Crème brûlée"}
+        with self.app.app_context():
+            response = self.app.json.response(payload)
+            with patch('utils.json_provider.orjson', None):
+                fallback_response = self.app.json.response(payload)
+
+        self.assertIn("Crème brûlée".encode(), response.get_data())
+        self.assertEqual(response.get_data(), fallback_response.get_data())
+
+    def test_non_finite_floats_are_sent_as_null_on_both_paths(self):
+        payload = {"score": float("nan"), "scores": [float("inf"), np.float64("-inf")], "array": np.array([np.nan])}
+        expected = {"score": None, "scores": [None, None], "array": [None]}
+        with self.app.app_context():
+            response = self.app.json.response(payload)
+            with patch('utils.json_provider.orjson', None):
+                fallback_response = self.app.json.response(payload)
+
+        self.assertEqual(response.get_json(), expected)
+        self.assertEqual(fallback_response.get_json(), expected)
+
+    def test_response_without_legacy_jsonify_settings(self):
+        # Flask 2.3 no longer defines the JSONIFY_* config keys
+        del self.app.config["JSONIFY_PRETTYPRINT_REGULAR"]
+        del self.app.config["JSONIFY_MIMETYPE"]
+        with self.app.app_context():
+            response = self.app.json.response(self.payload)
+
+        self.assertEqual(response.get_json(), self.expected)
+
+    def test_unknown_types_still_raise(self):
+        with self.assertRaises(TypeError):
+            self.app.json.dumps({"value": object()})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+from unittest.mock import patch
+
+from utils.lru_cache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.get_stats(), {"hits": 3, "misses": 1, "size": 2, "max_size": 2})
+
+    @patch("utils.lru_cache.time.monotonic")
+    def test_entries_expire_after_ttl(self, monotonic_mock):
+        cache = LRUCache(2, ttl=10)
+        monotonic_mock.return_value = 100
+        cache.set("a", 1)
+
+        monotonic_mock.return_value = 109
+        self.assertEqual(cache.get("a"), 1)
+        monotonic_mock.return_value = 111
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get_stats()["size"], 0)
+
+    def test_invalidate(self):
+        cache = LRUCache(2)
+        cache.set("a", 1)
+        cache.invalidate("a")
+
+        self.assertIsNone(cache.get("a"))
+
+
+if __name__ == '__main__':
+    unittest.main()
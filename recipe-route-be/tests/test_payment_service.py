@@ -47,6 +47,14 @@ class TestPaymentService(unittest.TestCase):
         self.assertEqual(result["response"]["message"], "Failed to setup stripe environment")
         self.assertEqual(result["response"]["status"], "fail")
 
+    @patch("stripe.Refund.create")
+    def test_refund_payment(self, mock_refund_create):
+        self.assertTrue(PaymentService.refund_payment("pi_123"))
+        mock_refund_create.assert_called_once_with(payment_intent="pi_123", idempotency_key="refund-pi_123")
+
+        mock_refund_create.side_effect = Exception("Test exception")
+        self.assertFalse(PaymentService.refund_payment("pi_123"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,22 @@
+import unittest
+
+from utils.postcode_locations import get_postcode_area, get_postcode_location
+
+
+class TestPostcodeLocations(unittest.TestCase):
+
+    def test_get_postcode_area(self):
+        self.assertEqual(get_postcode_area("CV1 2AB"), "CV")
+        self.assertEqual(get_postcode_area("sw1a1aa"), "SW")
+        self.assertEqual(get_postcode_area(" B15 "), "B")
+        self.assertIsNone(get_postcode_area("QQ1 1AA"))
+        self.assertIsNone(get_postcode_area("AB-1234"))
+        self.assertIsNone(get_postcode_area(None))
+
+    def test_get_postcode_location_is_geojson_point(self):
+        self.assertEqual(get_postcode_location("CV4 7AL"), {"type": "Point", "coordinates": [-1.5, 52.4]})
+        self.assertIsNone(get_postcode_location(""))
+
+
+if __name__ == '__main__':
+    unittest.main()
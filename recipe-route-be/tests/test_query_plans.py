@@ -0,0 +1,253 @@
+import inspect
+import unittest
+from unittest.mock import MagicMock
+
+import pymongo
+from bson import ObjectId
+from pymongo.collection import Collection
+from pymongo.errors import PyMongoError
+
+from db import db
+from repo.cache_repository import CacheRepository
+from repo.cart_repository import CartRepository
+from repo.ingredient_repository import IngredientRepository
+from repo.meal_planner_repository import MealPlannerRepo
+from repo.order_repository import OrderRepository
+from repo.recipe_repository import RecipeRepository
+from repo.store_inventory_item_repository import StoreInventoryItemRepository
+from repo.store_inventory_repository import StoreInventoryRepository
+from repo.store_repository import StoreRepository
+from repo.user_repository import UserRepository
+
+SAMPLE_ID = ObjectId("64cbf9709fc3f317f81a0f86")
+SAMPLE_STR_ID = str(SAMPLE_ID)
+
+# Repository method -> the arguments it is called with when serving a request. Methods that take a query use the
+# query their service passes in. The queries themselves are recorded from the methods, so they cannot drift.
+REPOSITORY_CALLS = {
+    CacheRepository: [
+        ("get_cache", ("ingredient_catalog_version",)),
+        ("update_cache", ("recipe_preprocessing_version", 1)),
+        ("increment_cache", ("ingredient_catalog_version",))],
+    CartRepository: [
+        ("get_user_cart", (SAMPLE_STR_ID,)),
+        ("add_to_shopping_list", ({"user_id": SAMPLE_STR_ID}, {SAMPLE_STR_ID: {"qty": 1}})),
+        ("update_cart_list", ({"user_id": SAMPLE_STR_ID}, {"cart_list": []}))],
+    IngredientRepository: [
+        ("get_ingredient", ("Tomato",)),
+        ("search_by_prefix", ("tom", 10)),
+        ("search_by_prefix", ("tom", 10, "VEGETABLE")),
+        ("get_by_id_list", ([SAMPLE_ID],)),
+        ("get_by_type", ("VEGETABLE",)),
+        ("get_names", (SAMPLE_ID,))],
+    MealPlannerRepo: [
+        ("get_meal_plan", ({"user_id": SAMPLE_STR_ID},)),
+        ("update_meal_plan", ({"user_id": SAMPLE_STR_ID}, {"8_2023": {}}))],
+    OrderRepository: [
+        ("get_user_orders", (SAMPLE_STR_ID, 0, 10)),
+        ("count_user_orders", (SAMPLE_STR_ID,)),
+        ("get_store_orders", (SAMPLE_STR_ID, 0, 10)),
+        ("count_store_orders", (SAMPLE_STR_ID,)),
+        ("update_order", ({"_id": SAMPLE_ID, "store_id": SAMPLE_STR_ID}, {"status": "COMPLETED"}))],
+    RecipeRepository: [
+        ("get_recipe", (SAMPLE_STR_ID,)),
+        ("get_recipes_by_ids", ([SAMPLE_STR_ID],)),
+        ("get_page", (10,)),
+        ("get_page", (10, SAMPLE_STR_ID)),
+        ("search_text", ("tomato soup", [SAMPLE_STR_ID], 0, 10)),
+        ("update_all", ([{"_id": SAMPLE_STR_ID, "title": "Soup"}],)),
+        ("remove_one", (SAMPLE_ID,))],
+    StoreInventoryItemRepository: [
+        ("get_items", (SAMPLE_STR_ID,)),
+        ("get_items", (SAMPLE_STR_ID, [SAMPLE_STR_ID])),
+        ("get_items_page", (SAMPLE_STR_ID, "VEGETABLE")),
+        ("get_items_page", (SAMPLE_STR_ID, None, "tom")),
+        ("get_items_page", (SAMPLE_STR_ID, None, None, "stock", True)),
+        ("get_store_matches", ([SAMPLE_STR_ID], 10)),
+        ("is_exist", (SAMPLE_STR_ID, SAMPLE_STR_ID)),
+        ("update_item", (SAMPLE_STR_ID, SAMPLE_STR_ID, {"item_name": "Tomato"})),
+        ("upsert_items", (SAMPLE_STR_ID, {SAMPLE_STR_ID: {"item_name": "Tomato"}}, "import1")),
+        ("decrement_stock", (SAMPLE_STR_ID, {SAMPLE_STR_ID: 1})),
+        ("remove_items_not_imported", (SAMPLE_STR_ID, "import1"))],
+    StoreInventoryRepository: [
+        ("mark_inventory_migrated", (SAMPLE_STR_ID, "2023-08-01"))],
+    StoreRepository: [
+        ("get_store", ({"user_id": SAMPLE_STR_ID},)),
+        ("get_store", ({"_id": SAMPLE_ID},)),
+        ("get_stores_by_ids", ([SAMPLE_STR_ID],)),
+        ("get_page", (10,)),
+        ("get_page", (10, 0, SAMPLE_STR_ID)),
+        ("get_nearest", ({"type": "Point", "coordinates": [-1.5, 52.4]}, 20)),
+        ("update_store", (SAMPLE_STR_ID, {"store_name": "Store"}))],
+    UserRepository: [
+        ("get_user", ("user@example.com",)),
+        ("get_all", ({"role": "USER"},)),
+        ("get_users_by_ids", ([SAMPLE_STR_ID],)),
+        ("get_all_preferences", ({"role": "USER"},)),
+        ("get_all_preferences", ({"role": "USER", "preferences_updated_on": {"$gte": "2023-08-01"}},)),
+        ("get_user_preferences", (SAMPLE_STR_ID,)),
+        ("get_user_by_id", (SAMPLE_STR_ID,)),
+        ("update_user_details", (SAMPLE_STR_ID, {"name": "User"}))],
+}
+
+# Inserts, index setup, whole-collection reads (get_all, the recipe preprocessing job, the recommendation index
+# loads) and one-off migrations, which are full scans by design
+UNFILTERED_METHODS = {
+    CacheRepository: {"set_cache"},
+    CartRepository: {"add_user_cart"},
+    IngredientRepository: {"add_ingredient", "add_ingredients", "get_all"},
+    MealPlannerRepo: {"add_meal_plan"},
+    OrderRepository: {"ensure_indexes", "add_order", "get_all"},
+    RecipeRepository: {"add_recipe", "iter_recipes", "get_search_documents", "get_all", "get_recipes_to_preprocess",
+                       "get_collection_size", "get_estimated_size"},
+    StoreInventoryItemRepository: {"ensure_indexes", "add_item"},
+    StoreInventoryRepository: {"add_inventory", "get_unmigrated_inventories"},
+    StoreRepository: {"add_store", "get_all", "ensure_indexes", "get_stores_without_location", "count"},
+    UserRepository: {"add_user"},
+}
+
+
+class RecordingCursor:
+    def __init__(self, query):
+        self.__query = query
+
+    def sort(self, key_or_list, direction=pymongo.ASCENDING):
+        self.__query["sort"] = [(key_or_list, direction)] if isinstance(key_or_list, str) else key_or_list
+        return self
+
+    def skip(self, skip):
+        return self
+
+    def limit(self, limit):
+        return self
+
+    def batch_size(self, batch_size):
+        return self
+
+    def __iter__(self):
+        return iter([])
+
+
+class RecordingCollection:
+    # Stands in for a pymongo collection and records the filter of every read and write made through it
+    def __init__(self, name, queries, pipelines):
+        self.name = name
+        self.__queries = queries
+        self.__pipelines = pipelines
+
+    def find(self, filter, projection=None, **kwargs):
+        query = {"collection": self.name, "filter": filter, "projection": projection, "sort": None}
+        self.__queries.append(query)
+        return RecordingCursor(query)
+
+    def find_one(self, filter, projection=None, **kwargs):
+        self.find(filter, projection)
+        return None
+
+    def count_documents(self, filter, **kwargs):
+        self.find(filter)
+        return 0
+
+    def update_one(self, filter, update, **kwargs):
+        self.find(filter)
+        return MagicMock(matched_count=1)
+
+    def delete_one(self, filter, **kwargs):
+        self.find(filter)
+
+    def delete_many(self, filter, **kwargs):
+        self.find(filter)
+
+    def bulk_write(self, operations, **kwargs):
+        for operation in operations:
+            self.find(operation._filter)
+        return MagicMock(matched_count=len(operations), bulk_api_result={})
+
+    def aggregate(self, pipeline, **kwargs):
+        self.__pipelines.append({"collection": self.name, "pipeline": pipeline})
+        return iter([])
+
+
+def record_repository_queries():
+    # Runs REPOSITORY_CALLS against recording collections; returns the find-style queries and the aggregations
+    queries, pipelines = [], []
+    session = MagicMock()
+    session.with_transaction.side_effect = lambda callback: callback(session)
+    client = MagicMock()
+    client.start_session.return_value.__enter__.return_value = session
+    for repository_class, calls in REPOSITORY_CALLS.items():
+        repository = repository_class()
+        for attribute, value in vars(repository).items():
+            if isinstance(value, Collection):
+                setattr(repository, attribute, RecordingCollection(value.name, queries, pipelines))
+            elif isinstance(value, pymongo.MongoClient):
+                setattr(repository, attribute, client)
+        for method, args in calls:
+            getattr(repository, method)(*args)
+    return queries, pipelines
+
+
+def find_collscans(plan, path="plan"):
+    # Walks every nested stage of an explain document, classic or slot-based engine alike
+    found = []
+    if isinstance(plan, dict):
+        if plan.get("stage") == "COLLSCAN":
+            found.append(path)
+        for key, value in plan.items():
+            found.extend(find_collscans(value, f"{path}.{key}"))
+    elif isinstance(plan, list):
+        for i, value in enumerate(plan):
+            found.extend(find_collscans(value, f"{path}[{i}]"))
+    return found
+
+
+class TestRepositoryQueries(unittest.TestCase):
+
+    def test_every_repository_method_is_explained_or_unfiltered(self):
+        for repository_class, calls in REPOSITORY_CALLS.items():
+            methods = {name for name, _ in inspect.getmembers(repository_class, inspect.isfunction)
+                       if not name.startswith("_")}
+            called = {method for method, _ in calls}
+            with self.subTest(repository=repository_class.__name__):
+                self.assertEqual(methods - called - UNFILTERED_METHODS[repository_class], set())
+
+    def test_recorded_queries_come_from_the_repositories(self):
+        queries, pipelines = record_repository_queries()
+
+        self.assertIn({"collection": "ingredients", "filter": {"_id": {"$gt": SAMPLE_ID}},
+                       "projection": {"name": 1}, "sort": None}, queries)
+        self.assertIn({"collection": "stores", "filter": {"_id": SAMPLE_ID}, "projection": None, "sort": None},
+                      queries)
+        self.assertEqual([pipeline["collection"] for pipeline in pipelines], ["store-inventory-items", "stores"])
+
+
+class TestQueryPlans(unittest.TestCase):
+    # Needs a reachable database with the indexes from `python -m db.indexes`; skipped otherwise
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            with pymongo.timeout(5):
+                db.command("ping")
+        except PyMongoError as ex:
+            raise unittest.SkipTest(f"Database is not reachable: {ex}")
+        cls.queries, cls.pipelines = record_repository_queries()
+
+    def test_find_queries_use_an_index(self):
+        for query in self.queries:
+            with self.subTest(collection=query["collection"], query=query["filter"]):
+                cursor = db[query["collection"]].find(query["filter"], query["projection"])
+                if query["sort"]:
+                    cursor = cursor.sort(query["sort"])
+                self.assertEqual(find_collscans(cursor.explain()), [])
+
+    def test_aggregations_use_an_index(self):
+        for aggregation in self.pipelines:
+            pipeline = aggregation["pipeline"]
+            with self.subTest(collection=aggregation["collection"], pipeline=pipeline[0]):
+                explain = db.command("aggregate", aggregation["collection"], pipeline=pipeline, explain=True)
+                self.assertEqual(find_collscans(explain), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from service.recipe_index_service import RecipeIndexService, INDEX_FILE
+
+
+class TestRecipeIndexService(unittest.TestCase):
+
+    def setUp(self):
+        self.recipe_ids = ["64cbfd31c7812a6675bdd052", "64cbffeb9526faa1acf0dec4", "64cbffeb9526faa1acf0dea8"]
+        self.documents = ["sugar water", "chilli powder soy sauce", "cucumber tomato"]
+
+    def test_score_matches_profile(self):
+        index = RecipeIndexService()
+        index.sync(self.recipe_ids, self.documents)
+
+        scores = index.score("soy sauce")
+
+        self.assertEqual(len(scores), 3)
+        self.assertEqual(scores.argmax(), 1)
+        self.assertEqual(scores[0], 0)
+
+    def test_add_recipe_appends_row_and_notifies(self):
+        index = RecipeIndexService()
+        listener = MagicMock()
+        index.add_listener(listener)
+        index.sync(self.recipe_ids, self.documents)
+        version = index.version
+        recipe = {"_id": "64cc2cfda45a1bd66d363ef7", "all_ingredients": "tomato sugar"}
+
+        self.assertTrue(index.add_recipe(recipe))
+        self.assertFalse(index.add_recipe(recipe))
+
+        scores = index.score("tomato sugar")
+        self.assertEqual(len(scores), 4)
+        self.assertEqual(scores.argmax(), 3)
+        self.assertGreater(index.version, version)
+        listener.assert_called_once_with(recipe, 3)
+
+    def test_add_recipe_before_sync_is_ignored(self):
+        index = RecipeIndexService()
+        self.assertFalse(index.add_recipe({"_id": "64cc2cfda45a1bd66d363ef7", "all_ingredients": "tomato"}))
+        self.assertFalse(index.is_ready())
+
+    def test_persisted_index_is_reloaded_and_realigned(self):
+        with tempfile.TemporaryDirectory() as model_dir:
+            first = RecipeIndexService(model_dir=model_dir)
+            first.rebuild(self.recipe_ids, self.documents)
+            expected = first.score("cucumber")
+
+            reloaded = RecipeIndexService(model_dir=model_dir)
+            new_ids = [self.recipe_ids[2], self.recipe_ids[0], "64cc2cfda45a1bd66d363ef7"]
+            reloaded.sync(new_ids, ["ignored", "ignored", "cucumber onion"])
+
+            self.assertEqual(reloaded.get_recipe_ids(), new_ids)
+            scores = reloaded.score("cucumber")
+            self.assertAlmostEqual(scores[0], expected[2])
+            self.assertAlmostEqual(scores[1], expected[0])
+            self.assertGreater(scores[2], 0)
+
+    def test_only_rebuild_writes_the_index_file(self):
+        with tempfile.TemporaryDirectory() as model_dir:
+            index = RecipeIndexService(model_dir=model_dir)
+            index.sync(self.recipe_ids, self.documents)
+            index.add_recipe({"_id": "64cc2cfda45a1bd66d363ef7", "all_ingredients": "tomato sugar"})
+            self.assertEqual(os.listdir(model_dir), [])
+
+            index.rebuild(self.recipe_ids, self.documents)
+            self.assertEqual(os.listdir(model_dir), [INDEX_FILE])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+from utils.recipe_preprocessing import convert_ingredients, preprocess_recipe
+
+
+class TestRecipePreprocessing(unittest.TestCase):
+
+    def setUp(self):
+        self.ingredient_ids = {"sugar": "64cc0e999abf42b6ae5fd6c5", "soy sauce": "64cc0d590b089494d30111d0"}
+        self.stop_words = {"of", "the", "a", "with"}
+
+    def test_convert_ingredients_parses_quantity_and_measurement(self):
+        result, ingredients_str = convert_ingredients(["1 1/2 cups sugar", "Equipment: wok", "2 tbsp soy sauce"],
+                                                      lambda name: self.ingredient_ids.get(name))
+
+        self.assertEqual(result, [
+            {"ingredient": "sugar", "qty": "1.5", "measurement": "cups", "id": "64cc0e999abf42b6ae5fd6c5"},
+            {"ingredient": "soy sauce", "qty": "2", "measurement": "tbsp", "id": "64cc0d590b089494d30111d0"}])
+        self.assertEqual(ingredients_str, " sugar soy sauce")
+
+    def test_preprocess_recipe_cleans_text(self):
+        recipe = {"title": "Sugar, with the Soy!", "ingredients": ["1 cup of sugar.", "2 tbsp of soy sauce"],
+                  "directions": ["Mix the sugar, gently."]}
+
+        result = preprocess_recipe(recipe, self.stop_words, lambda name: self.ingredient_ids.get(name),
+                                   tokenize=str.split)
+
+        self.assertEqual(result["title"], "Sugar Soy")
+        self.assertEqual(result["ingredients"], ["1 cup sugar", "2 tbsp soy sauce"])
+        self.assertEqual(result["directions"], ["Mix sugar gently"])
+        self.assertEqual([i["id"] for i in result["formatted_ingredients"]],
+                         ["64cc0e999abf42b6ae5fd6c5", "64cc0d590b089494d30111d0"])
+        self.assertEqual(result["all_ingredients"], " sugar soy sauce")
+
+    def test_preprocess_recipe_without_ingredients(self):
+        result = preprocess_recipe({"title": None}, self.stop_words, lambda name: None, tokenize=str.split)
+
+        self.assertEqual(result["formatted_ingredients"], [])
+        self.assertEqual(result["all_ingredients"], "")
+
+
+if __name__ == '__main__':
+    unittest.main()
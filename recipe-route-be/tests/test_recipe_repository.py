@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import MagicMock
+
+from bson import ObjectId
+from pymongo import ASCENDING
+from pymongo.errors import BulkWriteError
+
+from repo.recipe_repository import RecipeRepository
+
+
+class TestRecipeRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.recipe_repository = RecipeRepository()
+        self.recipe_repository.recipes = MagicMock()
+        self.recipes = [{"_id": f"64cbfd31c7812a6675bdd05{i}", "title": f"Recipe {i}"} for i in range(5)]
+
+    def test_update_all_writes_unordered_batches(self):
+        self.recipe_repository.recipes.bulk_write.side_effect = lambda batch, ordered: MagicMock(
+            bulk_api_result={"nMatched": len(batch), "nModified": len(batch) - 1})
+        progress_callback = MagicMock()
+
+        result = self.recipe_repository.update_all(iter(self.recipes), batch_size=2,
+                                                   progress_callback=progress_callback)
+
+        self.assertEqual(result, {"matched": 5, "modified": 2, "errors": 0, "processed": 5})
+        self.assertEqual([len(call.args[0]) for call in self.recipe_repository.recipes.bulk_write.call_args_list],
+                         [2, 2, 1])
+        for call in self.recipe_repository.recipes.bulk_write.call_args_list:
+            self.assertFalse(call.kwargs["ordered"])
+        self.assertEqual(progress_callback.call_count, 3)
+
+    def test_update_all_does_not_set_id(self):
+        recipe_id = ObjectId("64cbfd31c7812a6675bdd052")
+        self.recipe_repository.recipes.bulk_write.return_value = MagicMock(
+            bulk_api_result={"nMatched": 1, "nModified": 1})
+
+        self.recipe_repository.update_all([{"_id": str(recipe_id), "all_ingredients": " tomato"}])
+
+        update = self.recipe_repository.recipes.bulk_write.call_args.args[0][0]
+        self.assertEqual(update._filter, {"_id": recipe_id})
+        self.assertEqual(update._doc, {"$set": {"all_ingredients": " tomato"}})
+        self.assertNotIn("_id", update._doc["$set"])
+
+    def test_update_all_counts_write_errors(self):
+        self.recipe_repository.recipes.bulk_write.side_effect = BulkWriteError(
+            {"nMatched": 4, "nModified": 4, "writeErrors": [{"index": 2, "code": 11000}]})
+
+        result = self.recipe_repository.update_all(self.recipes)
+
+        self.assertEqual(result, {"matched": 4, "modified": 4, "errors": 1, "processed": 4})
+        self.recipe_repository.recipes.bulk_write.assert_called_once()
+
+    def test_get_page_continues_after_cursor(self):
+        self.recipe_repository.get_page(20, after_id="64cbfd31c7812a6675bdd052")
+
+        query, projection = self.recipe_repository.recipes.find.call_args.args
+        self.assertEqual(query, {"_id": {"$gt": ObjectId("64cbfd31c7812a6675bdd052")}})
+        self.assertNotIn("all_ingredients", projection)
+        self.recipe_repository.recipes.find.return_value.sort.assert_called_once_with("_id", ASCENDING)
+        self.recipe_repository.recipes.find.return_value.sort.return_value.limit.assert_called_once_with(20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from service.recipe_search_service import RecipeSearchService
+
+STOP_WORDS = {"a", "and", "with", "the"}
+
+
+class TestRecipeSearchService(unittest.TestCase):
+
+    def setUp(self):
+        self.recipes = [
+            {"_id": "64cbfd31c7812a6675bdd050", "title": "Tomato Soup", "desc": "A warm soup",
+             "all_ingredients": " tomato onion", "formatted_ingredients": [{"id": "tomato_id"}, {"id": "onion_id"}]},
+            {"_id": "64cbfd31c7812a6675bdd051", "title": "Chicken Curry", "desc": "Curry with tomato",
+             "all_ingredients": " chicken tomato", "formatted_ingredients": [{"id": "chicken_id"}, {"id": "tomato_id"}]},
+            {"_id": "64cbfd31c7812a6675bdd052", "title": "Peanut Noodles", "desc": "Noodles and soup",
+             "all_ingredients": " peanut noodles", "formatted_ingredients": [{"id": "peanut_id"}]},
+            {"_id": "64cbfd31c7812a6675bdd053", "title": "Green Salad", "desc": "Fresh leaves",
+             "all_ingredients": " lettuce", "formatted_ingredients": [{"id": "lettuce_id"}]},
+        ]
+        self.recipe_repo = MagicMock()
+        self.recipe_repo.get_search_documents.return_value = self.recipes
+        self.recipe_repo.get_estimated_size.return_value = len(self.recipes)
+        self.search_service = RecipeSearchService(self.recipe_repo, stop_words=STOP_WORDS)
+
+    def test_search_ranks_title_matches_first(self):
+        self.search_service.load()
+
+        recipe_ids, total = self.search_service.search("Tomato!")
+
+        self.assertEqual(recipe_ids, ["64cbfd31c7812a6675bdd050", "64cbfd31c7812a6675bdd051"])
+        self.assertEqual(total, 2)
+
+    def test_search_skips_recipes_with_allergens(self):
+        self.search_service.load()
+
+        recipe_ids, total = self.search_service.search("soup", excluded_ingredient_ids=["tomato_id"])
+
+        self.assertEqual(recipe_ids, ["64cbfd31c7812a6675bdd052"])
+        self.assertEqual(total, 1)
+
+    def test_search_pages_do_not_overlap(self):
+        self.search_service.load()
+
+        first_page, total = self.search_service.search("tomato soup noodles", skip=0, limit=2)
+        second_page, _ = self.search_service.search("tomato soup noodles", skip=2, limit=2)
+        all_ids, _ = self.search_service.search("tomato soup noodles", skip=0, limit=10)
+
+        self.assertEqual(total, 3)
+        self.assertEqual(first_page + second_page, all_ids)
+        self.assertEqual(len(second_page), 1)
+
+    def test_search_ignores_stop_words_and_unknown_terms(self):
+        self.search_service.load()
+
+        self.assertEqual(self.search_service.search("the and with"), ([], 0))
+        self.assertEqual(self.search_service.search("lasagne"), ([], 0))
+
+    def test_added_recipe_is_searchable(self):
+        self.search_service.load()
+
+        is_added = self.search_service.add_recipe({"_id": "64cbfd31c7812a6675bdd054", "title": "Lettuce Wraps",
+                                                   "desc": "", "all_ingredients": " lettuce",
+                                                   "formatted_ingredients": [{"id": "lettuce_id"}]})
+        recipe_ids, total = self.search_service.search("lettuce wraps")
+
+        self.assertTrue(is_added)
+        self.assertEqual(recipe_ids, ["64cbfd31c7812a6675bdd054", "64cbfd31c7812a6675bdd053"])
+        self.assertEqual(total, 2)
+
+    @patch('service.recipe_search_service.threading.Thread')
+    def test_search_uses_text_index_until_loaded(self, thread_mock):
+        self.recipe_repo.search_text.return_value = (["64cbfd31c7812a6675bdd050"], 1)
+
+        result = self.search_service.search("tomato", excluded_ingredient_ids=["peanut_id"], skip=0, limit=20)
+
+        self.assertEqual(result, (["64cbfd31c7812a6675bdd050"], 1))
+        self.recipe_repo.search_text.assert_called_once_with("tomato", ["peanut_id"], 0, 20)
+        thread_mock.return_value.start.assert_called_once()
+
+        # A second search while the load is running does not start another one
+        self.search_service.search("tomato")
+        thread_mock.return_value.start.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
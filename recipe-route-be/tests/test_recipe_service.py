@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from service.recipe_service import RecipeService
 
 
@@ -48,6 +48,37 @@ class TestRecipeService(unittest.TestCase):
         self.assertEqual(result["response"]["message"], "Something went wrong. Please try again.")
         self.assertEqual(result["response"]["status"], "fail")
 
+    def test_get_recipes_page_returns_next_cursor(self):
+        recipes = [dict(self.mock_recipe_data, _id=f"64cbfcd25d7a7a77b7fd47{i:02d}") for i in range(20)]
+        self.recipe_service._RecipeService__repo.get_page = MagicMock(return_value=iter(recipes))
+        self.recipe_service._RecipeService__repo.get_estimated_size = MagicMock(return_value=45)
+
+        result = self.recipe_service.get_recipes_page(after="64cbfcd25d7a7a77b7fd475e")
+
+        self.recipe_service._RecipeService__repo.get_page.assert_called_once_with(
+            20, after_id="64cbfcd25d7a7a77b7fd475e")
+        self.assertEqual(result["code"], 200)
+        self.assertEqual(len(result["response"]["data"]), 20)
+        self.assertEqual(result["response"]["total_records"], 45)
+        self.assertEqual(result["response"]["next_cursor"], "64cbfcd25d7a7a77b7fd4719")
+
+    def test_get_recipes_page_last_page_and_invalid_cursor(self):
+        self.recipe_service._RecipeService__repo.get_page = MagicMock(return_value=iter([self.mock_recipe_data]))
+        self.recipe_service._RecipeService__repo.get_estimated_size = MagicMock(return_value=1)
+
+        self.assertIsNone(self.recipe_service.get_recipes_page()["response"]["next_cursor"])
+        self.assertEqual(self.recipe_service.get_recipes_page(after="not-an-id")["code"], 400)
+
+    def test_export_recipes_reads_the_cursor_lazily(self):
+        cursor = iter([self.mock_recipe_data, dict(self.mock_recipe_data, _id="64cbfcd25d7a7a77b7fd475f")])
+        self.recipe_service._RecipeService__repo.iter_recipes = MagicMock(return_value=cursor)
+
+        export = self.recipe_service.export_recipes()
+
+        self.assertEqual(next(export)["id"], "64cbfcd25d7a7a77b7fd475e")
+        self.assertEqual(next(cursor)["_id"], "64cbfcd25d7a7a77b7fd475f")
+        self.assertEqual(list(export), [])
+
     def test_update_all_recipes_success(self):
         # Mock RecipeRepository's update_all() method
         self.recipe_service._RecipeService__repo.update_all = MagicMock()
@@ -103,7 +134,36 @@ class TestRecipeService(unittest.TestCase):
         self.recipe_service._RecipeService__repo.get_recipe.assert_called_once_with(recipe_id)
         self.assertEqual(result, self.mock_recipe_data)
 
-    def test_add_recipe_success(self):
+    def test_get_recipes_by_ids_keeps_requested_order(self):
+        second_recipe = dict(self.mock_recipe_data, _id="64cbfcd25d7a7a77b7fd475f")
+        self.recipe_service._RecipeService__repo.get_recipes_by_ids = MagicMock(
+            return_value=[self.mock_recipe_data, second_recipe])
+
+        result = self.recipe_service.get_recipes_by_ids(
+            ["64cbfcd25d7a7a77b7fd475f", "64cbfcd25d7a7a77b7fd4750", "64cbfcd25d7a7a77b7fd475e"])
+
+        self.assertEqual([recipe["_id"] for recipe in result], ["64cbfcd25d7a7a77b7fd475f", "64cbfcd25d7a7a77b7fd475e"])
+
+    @patch('service.recipe_service.RecipeSearchServiceSingleton.get_instance')
+    def test_search_recipes_returns_ranked_page(self, get_search_instance):
+        get_search_instance.return_value.search.return_value = (["64cbfcd25d7a7a77b7fd475e"], 21)
+        self.recipe_service._RecipeService__repo.get_recipes_by_ids = MagicMock(return_value=[self.mock_recipe_data])
+
+        result = self.recipe_service.search_recipes("test", page="2", allergens=["64cc0e8ad5b0a20fd40101d1"])
+
+        get_search_instance.return_value.search.assert_called_once_with(
+            "test", excluded_ingredient_ids=["64cc0e8ad5b0a20fd40101d1"], skip=20, limit=20)
+        self.assertEqual(result["code"], 200)
+        self.assertEqual(result["response"]["total_records"], 21)
+        self.assertEqual([recipe["id"] for recipe in result["response"]["data"]], ["64cbfcd25d7a7a77b7fd475e"])
+
+    def test_search_recipes_without_text(self):
+        result = self.recipe_service.search_recipes("  ")
+
+        self.assertEqual(result["code"], 400)
+
+    @patch('service.recipe_service.RecipeSearchServiceSingleton.get_instance')
+    def test_add_recipe_success(self, get_search_instance):
         user_id = "64cbfd31c7812a6675bdd052"
         recipe_data = {
             "title": "New Recipe",
@@ -124,6 +184,7 @@ class TestRecipeService(unittest.TestCase):
         self.assertEqual(result["code"], 200)
         self.assertEqual(result["response"]["message"], "Successfully added your recipe.")
         self.assertEqual(result["response"]["data"], "64cbfcd25d7a7a77b7fd475e")
+        get_search_instance.return_value.add_recipe.assert_called_once()
 
     def test_add_recipe_failure(self):
         user_id = "user123"
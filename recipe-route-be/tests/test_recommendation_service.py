@@ -1,24 +1,14 @@
 import unittest
-from unittest.mock import patch, MagicMock
-from service.recommendation_service import RecommendationService
-import pandas as pd
+from unittest.mock import MagicMock
+from service.recommendation_service import RecommendationService, COLLABORATIVE_WEIGHT
+from service.recipe_index_service import RecipeIndexService
+from service.user_preference_index_service import UserPreferenceIndexService
 from flask_pymongo import ObjectId
 
 
 class TestRecommendationService(unittest.TestCase):
 
     def setUp(self):
-        self.mock_ingredients = {
-            "soy sauce": "64cc0d590b089494d30111d0",
-            "water": "64cc0e8ad5b0a20fd40101d1",
-            "chilli powder": "64cc0e92849431bb9f1f6e7b",
-            "sugar": "64cc0e999abf42b6ae5fd6c5",
-            "cucumber": "64cc1983da014172ef6b7852",
-            "tomato": "64cc1995a77576259979157a",
-            "onion": "64cc1995a77576259979153l",
-            "paprika": "64cc1995a77576259979153a"
-        }
-
         self.recipes = [
             {
                 "_id": ObjectId("64cbfd31c7812a6675bdd052"),
@@ -81,40 +71,104 @@ class TestRecommendationService(unittest.TestCase):
         self.mock_cache_service = MagicMock()
         self.mock_cache_service.get_cache.return_value = True
         self.mock_recipe_service = MagicMock()
-        self.mock_ingredient_service = MagicMock()
         self.mock_user_service = MagicMock()
-        self.mock_ingredient_service.get_ingredient_id = lambda ingredient_name: self.mock_ingredients.get(
-            ingredient_name)
 
         self.mock_recipe_service.get_all_recipes.return_value = self.recipes
+        self.mock_recipe_service.get_recipes_by_ids.side_effect = lambda recipe_ids: [
+            dict(recipe) for r_id in recipe_ids for recipe in self.recipes if str(recipe["_id"]) == r_id]
+        self.user_index = UserPreferenceIndexService()
         self.recommendation_service = RecommendationService(cache_service=self.mock_cache_service,
                                                             recipe_service=self.mock_recipe_service,
-                                                            ingredient_service=self.mock_ingredient_service,
                                                             user_service=self.mock_user_service,
-                                                            is_service_provided=True
+                                                            is_service_provided=True,
+                                                            user_index=self.user_index
                                                             )
 
-    def test_content_based_filtering(self):
+    def ranked_ids(self, user, top_k=None, recommendation_service=None):
+        recommendation_service = recommendation_service or self.recommendation_service
+        rows, scores, total = recommendation_service._RecommendationService__rank_recipes(user, top_k)
+        recipe_ids = recommendation_service._RecommendationService__df["_id"].values[rows]
+        return [str(recipe_id) for recipe_id in recipe_ids], scores, total
+
+    def test_rank_recipes_filters_allergens_and_sorts_by_score(self):
+        self.user_index.load([])
         user_data = {
+            "id": "64cc28ca219a2cca4e3d87aa",
             "allergens_and_not_preferred": ["64cc0e8ad5b0a20fd40101d1", "64cc14932e23c7bb458ac65e"],
             "favorites": ["64cbffeb9526faa1acf0dec4"]
         }
 
-        # Call the content_based_filtering method
-        result_df = self.recommendation_service._RecommendationService__content_based_filtering(user_data)
+        recipe_ids, scores, total = self.ranked_ids(user_data)
+
+        # Recipe 1 has water, one of the user's allergens
+        self.assertNotIn("64cbfd31c7812a6675bdd052", recipe_ids)
+        self.assertIn("64cbffeb9526faa1acf0dea8", recipe_ids)
+        # The favorite itself is still ranked, first as it is the most similar
+        self.assertEqual(recipe_ids[0], "64cbffeb9526faa1acf0dec4")
+        self.assertEqual(total, 3)
+        self.assertTrue(all(scores[i] >= scores[i + 1] for i in range(len(scores) - 1)))
+
+    def test_rank_recipes_excludes_every_allergen(self):
+        self.user_index.load([])
+        user_data = {
+            "id": "64cc28ca219a2cca4e3d87aa",
+            "allergens_and_not_preferred": ["64cc1995a77576259979157a", "64cc1995a77576259979153a"],
+            "favorites": []
+        }
 
+        recipe_ids, _, total = self.ranked_ids(user_data)
 
+        self.assertNotIn("64cbffeb9526faa1acf0dea8", recipe_ids)
+        self.assertNotIn("64cc2cfda45a1bd66d363ef7", recipe_ids)
+        self.assertEqual(total, 2)
 
-        self.assertIsInstance(result_df, pd.DataFrame)
-        # Ensure that Recipe 1 is not in the filtered results as it is in the user's favorites
-        self.assertNotIn(ObjectId("64cbfd31c7812a6675bdd052"), result_df["_id"].values)
-        self.assertIn(ObjectId("64cbffeb9526faa1acf0dea8"), result_df['_id'].values)
-        # Ensure that Recipe 2 is in the filtered results as it does not contain allergens_and_not_preferred ingredients
-        self.assertIn(ObjectId("64cbffeb9526faa1acf0dec4"), result_df["_id"].values)
+    def test_rank_recipes_includes_added_recipes(self):
+        recipe_index = RecipeIndexService()
+        recommendation_service = RecommendationService(cache_service=self.mock_cache_service,
+                                                       recipe_service=self.mock_recipe_service,
+                                                       user_service=self.mock_user_service,
+                                                       is_service_provided=True, recipe_index=recipe_index,
+                                                       user_index=self.user_index)
+        self.user_index.load([])
+        new_recipe = dict(self.recipes[0], _id=ObjectId("64cc2cfda45a1bd66d363ef8"), all_ingredients='sugar')
+        recipe_index.add_recipe(new_recipe)
 
-        # Ensure that the filtered results are sorted by similarity_score in descending order
-        self.assertTrue(all(result_df.iloc[i]["similarity_score"] >= result_df.iloc[i + 1]["similarity_score"]
-                            for i in range(len(result_df) - 1)))
+        recipe_ids, _, _ = self.ranked_ids({"id": "64cc28ca219a2cca4e3d87aa", "allergens_and_not_preferred": [],
+                                            "favorites": ["64cbfd31c7812a6675bdd052"]},
+                                           recommendation_service=recommendation_service)
+        self.assertIn("64cc2cfda45a1bd66d363ef8", recipe_ids)
+
+        recipe_ids, _, _ = self.ranked_ids({"id": "64cc28ca219a2cca4e3d87aa",
+                                            "allergens_and_not_preferred": ["64cc0e999abf42b6ae5fd6c5"],
+                                            "favorites": []}, recommendation_service=recommendation_service)
+        self.assertNotIn("64cc2cfda45a1bd66d363ef8", recipe_ids)
+
+    def test_recipes_notified_out_of_order_keep_index_rows(self):
+        recipe_index = RecipeIndexService()
+        recommendation_service = RecommendationService(cache_service=self.mock_cache_service,
+                                                       recipe_service=self.mock_recipe_service,
+                                                       user_service=self.mock_user_service,
+                                                       is_service_provided=True, recipe_index=recipe_index)
+        notifications = []
+        recipe_index._RecipeIndexService__listeners = [lambda recipe, row: notifications.append((recipe, row))]
+        recipe_index.add_recipe(dict(self.recipes[0], _id=ObjectId("64cc2cfda45a1bd66d363ef8"),
+                                     all_ingredients='sugar'))
+        recipe_index.add_recipe(dict(self.recipes[2], _id=ObjectId("64cc2cfda45a1bd66d363ef9"),
+                                     all_ingredients='tomato'))
+        on_recipe_added = recommendation_service._RecommendationService__on_recipe_added
+        rank_recipes = recommendation_service._RecommendationService__rank_recipes
+        user = {"id": "64cc28ca219a2cca4e3d87aa", "favorites": ["64cbffeb9526faa1acf0dea8"],
+                "allergens_and_not_preferred": []}
+
+        # The index already holds both recipes; the DataFrame only takes them once they can go in index order
+        on_recipe_added(*notifications[1])
+        self.assertEqual(rank_recipes(user)[2], 4)
+
+        on_recipe_added(*notifications[0])
+        rows, scores, total = rank_recipes(user)
+        self.assertEqual(total, 6)
+        ranked_ids = [str(r_id) for r_id in recommendation_service._RecommendationService__df["_id"].values[rows]]
+        self.assertEqual(ranked_ids[:2], ["64cbffeb9526faa1acf0dea8", "64cc2cfda45a1bd66d363ef9"])
 
     def test_collaborative_filtering(self):
         # Define mock user data
@@ -124,7 +178,7 @@ class TestRecommendationService(unittest.TestCase):
             "allergens_and_not_preferred": ["64cc1995a77576259979153a", "64cc1995a77576259979153l"]
         }
 
-        result = self.recommendation_service._RecommendationService__collaborative_filtering([
+        self.user_index.load([
             {
                 "id": ObjectId("64cc28d5616e5921c40dbe68"),
                 "favorites": ["64cbfd31c7812a6675bdd052", "64cbffeb9526faa1acf0dea8"],
@@ -140,11 +194,14 @@ class TestRecommendationService(unittest.TestCase):
                 "favorites": ["64cc2cfda45a1bd66d363ef7"],
                 "allergens_and_not_preferred": ["64cc0e8ad5b0a20fd40101d1"]
             }
-        ], current_user)
+        ])
+        result = self.recommendation_service._RecommendationService__collaborative_scores(current_user, 4)
 
-        self.assertIn('64cbffeb9526faa1acf0dea8', result)
+        # Recipe 3 is a favorite of both similar users, Recipe 4 only of the dissimilar one
+        self.assertEqual(result[2], 1)
+        self.assertEqual(result[3], 0)
 
-    def test_recommendation_system(self):
+    def test_rank_recipes_combines_both_sources(self):
         other_users = [
             {
                 "id": ObjectId("64cc28d5616e5921c40dbe68"),
@@ -169,12 +226,108 @@ class TestRecommendationService(unittest.TestCase):
             "allergens_and_not_preferred": ["64cc1995a77576259979153a", "64cc1995a77576259979153l"]
         }
 
-        result = self.recommendation_service._RecommendationService__recommendation_system(other_users, current_user)
+        self.user_index.load(other_users)
+        recipe_ids, _, _ = self.ranked_ids(current_user)
+
+        for e_recipe in [self.recipes[0], self.recipes[1], self.recipes[2]]:
+            self.assertIn(str(e_recipe["_id"]), recipe_ids)
+        self.assertNotIn(str(self.recipes[3]["_id"]), recipe_ids)
+
+    def test_similar_users_favorites_move_up_the_ranking(self):
+        rank_recipes = self.recommendation_service._RecommendationService__rank_recipes
+        current_user = {"id": "64cc28ca219a2cca4e3d87aa", "favorites": ["64cbffeb9526faa1acf0dea8"],
+                        "allergens_and_not_preferred": []}
+        self.user_index.load([])
+        content_rows, _, _ = rank_recipes(current_user)
+
+        self.user_index.load([{"id": "64cc28d5616e5921c40dbe68",
+                               "favorites": ["64cbffeb9526faa1acf0dea8", "64cc2cfda45a1bd66d363ef7"],
+                               "allergens_and_not_preferred": []}])
+        blended_rows, blended_scores, total = rank_recipes(current_user)
+
+        self.assertEqual(content_rows.tolist(), [2, 0, 1, 3])
+        self.assertEqual(blended_rows.tolist(), [2, 3, 0, 1])
+        self.assertAlmostEqual(blended_scores[1], COLLABORATIVE_WEIGHT)
+        self.assertEqual(total, 4)
+
+        # A similar user's favorite is still dropped when it has one of the user's allergens
+        current_user["allergens_and_not_preferred"] = ["64cc1995a77576259979153a"]
+        self.assertEqual(rank_recipes(current_user)[0].tolist(), [2, 0, 1])
+
+    def test_rank_recipes_scores_follow_their_recipes(self):
+        self.user_index.load([])
+        current_user = {"id": "64cc28ca219a2cca4e3d87aa", "favorites": ["64cbffeb9526faa1acf0dea8"],
+                        "allergens_and_not_preferred": ["64cc0e999abf42b6ae5fd6c5"]}
+
+        rows, final_scores, _ = self.recommendation_service._RecommendationService__rank_recipes(current_user)
+        _, content_scores = self.recommendation_service._RecommendationService__content_scores(current_user)
+        recipe_ids, _, _ = self.ranked_ids(current_user)
+
+        self.assertEqual(recipe_ids[0], "64cbffeb9526faa1acf0dea8")
+        self.assertNotIn("64cbfd31c7812a6675bdd052", recipe_ids)
+        for row, score in zip(rows, final_scores):
+            self.assertAlmostEqual(score, (1 - COLLABORATIVE_WEIGHT) * content_scores[row])
+        self.assertTrue(all(final_scores[i] >= final_scores[i + 1] for i in range(len(final_scores) - 1)))
+
+        top_ids, _, total = self.ranked_ids(current_user, top_k=1)
+        self.assertEqual(top_ids, ["64cbffeb9526faa1acf0dea8"])
+        self.assertEqual(total, 3)
+
+    def test_get_user_recommendations_uses_preference_snapshot(self):
+        user_index = UserPreferenceIndexService()
+        recommendation_service = RecommendationService(cache_service=self.mock_cache_service,
+                                                       recipe_service=self.mock_recipe_service,
+                                                       user_service=self.mock_user_service,
+                                                       is_service_provided=True, user_index=user_index)
+        self.mock_user_service.get_users_preferences.return_value = [
+            {"id": "64cc28ca219a2cca4e3d87aa", "favorites": ["64cbfd31c7812a6675bdd052"],
+             "allergens_and_not_preferred": []},
+            {"id": "64cc28d5616e5921c40dbe68", "favorites": ["64cbfd31c7812a6675bdd052"],
+             "allergens_and_not_preferred": []}
+        ]
+
+        result = recommendation_service.get_user_recommendations("64cc28ca219a2cca4e3d87aa", page_no=None)
+        recommendation_service.get_user_recommendations("64cc28ca219a2cca4e3d87aa", page_no=None)
+
+        self.assertEqual(result["code"], 200)
+        self.assertEqual(result["response"]["total_records"], 4)
+        self.mock_user_service.get_users_preferences.assert_called_once_with()
+        self.mock_user_service.get_all_users.assert_not_called()
+        self.mock_user_service.get_user_details.assert_not_called()
+
+    def test_get_user_recommendations_reuses_cached_ranking(self):
+        self.user_index.load([
+            {"id": "64cc28ca219a2cca4e3d87aa", "favorites": ["64cbfd31c7812a6675bdd052"],
+             "allergens_and_not_preferred": []}
+        ])
+        rank_recipes = MagicMock(wraps=self.recommendation_service._RecommendationService__rank_recipes)
+        self.recommendation_service._RecommendationService__rank_recipes = rank_recipes
+
+        first = self.recommendation_service.get_user_recommendations("64cc28ca219a2cca4e3d87aa", page_no=None)
+        second = self.recommendation_service.get_user_recommendations("64cc28ca219a2cca4e3d87aa", page_no="1")
+
+        self.assertEqual(rank_recipes.call_count, 1)
+        rank_recipes.assert_called_with(self.user_index.get_user("64cc28ca219a2cca4e3d87aa"), 20)
+        self.assertEqual(first["response"]["total_records"], 4)
+        self.mock_recipe_service.get_recipes_by_ids.assert_called_with(
+            [r["id"] for r in first["response"]["data"]])
+        self.assertEqual([r["id"] for r in first["response"]["data"]],
+                         [r["id"] for r in second["response"]["data"]])
+        self.assertEqual(self.recommendation_service.get_ranking_cache_stats()["hits"], 1)
+
+        self.user_index.update_user("64cc28ca219a2cca4e3d87aa", allergens=["64cc0e999abf42b6ae5fd6c5"])
+        third = self.recommendation_service.get_user_recommendations("64cc28ca219a2cca4e3d87aa", page_no=None)
+
+        self.assertEqual(rank_recipes.call_count, 2)
+        self.assertNotIn("64cbfd31c7812a6675bdd052", [r["id"] for r in third["response"]["data"]])
+
+    def test_get_user_recommendations_unknown_user(self):
+        self.user_index.load([])
+        self.mock_user_service.get_user_preferences.return_value = None
+
+        result = self.recommendation_service.get_user_recommendations("64cc28ca219a2cca4e3d87aa", page_no=None)
 
-        actual_recommendation_list = result.to_dict(orient="records")
-        e_recipe_list = [self.recipes[0], self.recipes[1], self.recipes[2]]
-        for e_recipe in e_recipe_list:
-            self.assertTrue(any(str(recipe["_id"]) == str(e_recipe["_id"]) for recipe in actual_recommendation_list))
+        self.assertEqual(result["code"], 404)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import MagicMock
+
+from repo.store_inventory_item_repository import StoreInventoryItemRepository
+
+
+class TestStoreInventoryItemRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.item_repository = StoreInventoryItemRepository()
+        self.items = MagicMock()
+        self.session = MagicMock()
+        self.session.with_transaction.side_effect = lambda callback: callback(self.session)
+        client = MagicMock()
+        client.start_session.return_value.__enter__.return_value = self.session
+        self.item_repository._StoreInventoryItemRepository__items = self.items
+        self.item_repository._StoreInventoryItemRepository__client = client
+        self.store_id = "64cbf9709fc3f317f81a0f86"
+
+    def test_decrement_stock_writes_conditional_increments_in_one_bulk(self):
+        self.items.find.return_value = [{"item_id": "item1", "stock_qty": 5}, {"item_id": "item2", "stock_qty": 3}]
+        self.items.bulk_write.return_value = MagicMock(matched_count=2)
+
+        result = self.item_repository.decrement_stock(self.store_id, {"item1": 2, "item2": 3})
+
+        self.assertEqual(result, {})
+        self.items.bulk_write.assert_called_once()
+        operations = self.items.bulk_write.call_args.args[0]
+        self.assertEqual([(operation._filter, operation._doc) for operation in operations], [
+            ({"store_id": self.store_id, "item_id": "item1", "stock_qty": {"$gte": 2}}, {"$inc": {"stock_qty": -2}}),
+            ({"store_id": self.store_id, "item_id": "item2", "stock_qty": {"$gte": 3}}, {"$inc": {"stock_qty": -3}})])
+        self.assertIs(self.items.bulk_write.call_args.kwargs["session"], self.session)
+        self.session.abort_transaction.assert_not_called()
+
+    def test_decrement_stock_reports_shortfalls_without_writing(self):
+        self.items.find.return_value = [{"item_id": "item1", "stock_qty": 1}, {"item_id": "item2", "stock_qty": 3}]
+
+        result = self.item_repository.decrement_stock(self.store_id, {"item1": 2, "item2": 3, "item3": 1})
+
+        self.assertEqual(result, {"item1": {"requested": 2, "available": 1},
+                                  "item3": {"requested": 1, "available": 0}})
+        self.items.bulk_write.assert_not_called()
+        self.session.abort_transaction.assert_called_once()
+
+    def test_decrement_stock_retries_when_stock_changes_after_read(self):
+        self.items.find.return_value = [{"item_id": "item1", "stock_qty": 5}]
+        self.items.bulk_write.side_effect = [MagicMock(matched_count=0), MagicMock(matched_count=1)]
+
+        result = self.item_repository.decrement_stock(self.store_id, {"item1": 2})
+
+        self.assertEqual(result, {})
+        self.assertEqual(self.items.bulk_write.call_count, 2)
+        self.session.abort_transaction.assert_called_once()
+
+    def test_decrement_stock_runs_callback_in_the_transaction(self):
+        self.items.find.return_value = [{"item_id": "item1", "stock_qty": 5}]
+        self.items.bulk_write.return_value = MagicMock(matched_count=1)
+        on_decremented = MagicMock()
+
+        self.item_repository.decrement_stock(self.store_id, {"item1": 2}, on_decremented=on_decremented)
+
+        on_decremented.assert_called_once_with(self.session)
+
+        # Short of stock: nothing is written, so the callback does not run either
+        on_decremented.reset_mock()
+        self.item_repository.decrement_stock(self.store_id, {"item1": 6}, on_decremented=on_decremented)
+        on_decremented.assert_not_called()
+
+    def test_decrement_stock_callback_failure_aborts(self):
+        self.items.find.return_value = [{"item_id": "item1", "stock_qty": 5}]
+        self.items.bulk_write.return_value = MagicMock(matched_count=1)
+
+        # with_transaction aborts when the callback raises, which rolls the decrement back
+        with self.assertRaises(ValueError):
+            self.item_repository.decrement_stock(self.store_id, {"item1": 2},
+                                                 on_decremented=MagicMock(side_effect=ValueError))
+
+    def test_get_items_page_filters_sorts_and_pages_in_the_query(self):
+        cursor = self.items.find.return_value
+        cursor.sort.return_value.skip.return_value.limit.return_value = [{"item_id": "item1"}]
+        self.items.count_documents.return_value = 30
+
+        items, total = self.item_repository.get_items_page(self.store_id, item_type="VEGETABLE", name_prefix="Red (",
+                                                           sort_by="stock", descending=True, skip=25, limit=25)
+
+        self.assertEqual((items, total), ([{"item_id": "item1"}], 30))
+        query = {"store_id": self.store_id, "item_type": "VEGETABLE", "item_name_lc": {"$regex": "^red\\ \\("}}
+        self.assertEqual(self.items.find.call_args.args[0], query)
+        cursor.sort.assert_called_once_with([("stock_qty", -1), ("item_id", -1)])
+        cursor.sort.return_value.skip.assert_called_once_with(25)
+        cursor.sort.return_value.skip.return_value.limit.assert_called_once_with(25)
+        self.items.count_documents.assert_called_once_with(query)
+
+    def test_writes_keep_lowercase_name(self):
+        self.item_repository.upsert_items(self.store_id, {"item1": {"item_name": "Tomato", "stock_qty": 3}})
+
+        operation = self.items.bulk_write.call_args.args[0][0]
+        self.assertEqual(operation._doc, {"$set": {"item_name": "Tomato", "stock_qty": 3, "item_name_lc": "tomato"}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
-from service.store_inventory_service import StoreInventoryService
+from service.store_inventory_service import StoreInventoryService, IMPORT_BATCH_SIZE, MAX_REPORTED_ERRORS
 from unittest.mock import MagicMock
+import base64
+from pymongo.errors import BulkWriteError
 from pymongo.results import UpdateResult, InsertOneResult
 
 
@@ -9,6 +11,7 @@ class TestStoreInventoryService(unittest.TestCase):
     def setUp(self):
         self.store_inventory_service = StoreInventoryService()
         self.store_inventory_service._StoreInventoryService__repo = MagicMock()
+        self.store_inventory_service._StoreInventoryService__item_repo = MagicMock()
 
     def test_add_store_inventory(self):
         store_id = "64cc28da1c5236ab484f0627"
@@ -26,6 +29,102 @@ class TestStoreInventoryService(unittest.TestCase):
 
         self.assertEqual(result["code"], 200)
 
+    def test_update_store_inventory_imports_rows_in_batches(self):
+        store_id = "64cc28da1c5236ab484f0627"
+        ingredient_service_mock = MagicMock()
+        ingredient_service_mock.get_or_add_ingredient_ids.return_value = (
+            {"Tomato": "64cc1995a77576259979157a", "Onion": "64cc1995a77576259979153l"}, 1)
+        self.store_inventory_service._StoreInventoryService__ingredient_service = ingredient_service_mock
+        csv_data = ("item_name,qty,stock,price,type,supplier\n"
+                    "Tomato,1 kg,10,2.5,VEGETABLE,Farm\n"
+                    "Onion,1 kg,ten,1.0,VEGETABLE,Farm\n"
+                    "Onion,1 kg,5\n"
+                    "\n"
+                    "Onion,500 g,4,1.2,VEGETABLE,Farm\n")
+        data_url = "data:text/csv;base64," + base64.b64encode(csv_data.encode()).decode()
+
+        result = self.store_inventory_service.update_store_inventory(store_id, data_url)
+
+        self.assertEqual(result["code"], 200)
+        self.assertEqual(result["response"]["data"]["imported"], 2)
+        self.assertEqual(result["response"]["data"]["ingredients_added"], 1)
+        self.assertEqual([error["row"] for error in result["response"]["data"]["errors"]], [3, 4])
+        ingredient_service_mock.get_or_add_ingredient_ids.assert_called_once_with(
+            [("Tomato", "VEGETABLE"), ("Onion", "VEGETABLE")])
+        item_repo = self.store_inventory_service._StoreInventoryService__item_repo
+        item_repo.upsert_items.assert_called_once()
+        self.assertEqual(item_repo.upsert_items.call_args.args, (store_id, {
+            "64cc1995a77576259979157a": {"item_name": "Tomato", "qty_measurement": "1 kg", "stock_qty": 10,
+                                         "item_type": "VEGETABLE", "unit_price": 2.5, "stock_supplier": "Farm"},
+            "64cc1995a77576259979153l": {"item_name": "Onion", "qty_measurement": "500 g", "stock_qty": 4,
+                                         "item_type": "VEGETABLE", "unit_price": 1.2, "stock_supplier": "Farm"}}))
+        # Rows 3 and 4 were rejected, so items missing from this import are kept
+        item_repo.remove_items_not_imported.assert_not_called()
+
+    def test_import_inventory_removes_unlisted_items_after_a_clean_import(self):
+        store_id = "64cc28da1c5236ab484f0627"
+        ingredient_service_mock = MagicMock()
+        ingredient_service_mock.get_or_add_ingredient_ids.return_value = ({"Tomato": "64cc1995a77576259979157a"}, 0)
+        self.store_inventory_service._StoreInventoryService__ingredient_service = ingredient_service_mock
+
+        result = self.store_inventory_service.import_inventory(store_id, ["item_name,qty,stock,price,type,supplier",
+                                                                          "Tomato,1 kg,10,2.5,VEGETABLE,Farm"])
+
+        self.assertEqual(result["code"], 200)
+        item_repo = self.store_inventory_service._StoreInventoryService__item_repo
+        import_id = item_repo.upsert_items.call_args.kwargs["import_id"]
+        item_repo.remove_items_not_imported.assert_called_once_with(store_id, import_id)
+
+    def test_import_inventory_keeps_existing_item_whose_row_fails_to_parse(self):
+        store_id = "64cc28da1c5236ab484f0627"
+        ingredient_service_mock = MagicMock()
+        ingredient_service_mock.get_or_add_ingredient_ids.return_value = ({"Tomato": "64cc1995a77576259979157a"}, 0)
+        self.store_inventory_service._StoreInventoryService__ingredient_service = ingredient_service_mock
+        # Onion is already stocked; its row has a typo in the price
+        lines = ["item_name,qty,stock,price,type,supplier",
+                 "Tomato,1 kg,10,2.5,VEGETABLE,Farm",
+                 "Onion,1 kg,5,1.o,VEGETABLE,Farm"]
+
+        result = self.store_inventory_service.import_inventory(store_id, lines)
+
+        report = result["response"]["data"]
+        self.assertEqual(result["code"], 200)
+        self.assertEqual(report["imported"], 1)
+        self.assertEqual([error["row"] for error in report["errors"]], [3])
+        self.store_inventory_service._StoreInventoryService__item_repo.remove_items_not_imported.assert_not_called()
+
+    def test_import_inventory_reports_batches_that_fail_to_save(self):
+        store_id = "64cc28da1c5236ab484f0627"
+        ingredient_service_mock = MagicMock()
+        ingredient_service_mock.get_or_add_ingredient_ids.side_effect = [
+            BulkWriteError({"writeErrors": [{"index": 0, "code": 11000}]}),
+            ({"Onion": "64cc1995a77576259979153l"}, 0)]
+        self.store_inventory_service._StoreInventoryService__ingredient_service = ingredient_service_mock
+        lines = ["item_name,qty,stock,price,type,supplier"] + \
+                [f"Tomato {i},1 kg,10,2.5,VEGETABLE,Farm" for i in range(IMPORT_BATCH_SIZE)] + \
+                ["Onion,1 kg,5,1.0,VEGETABLE,Farm"]
+
+        result = self.store_inventory_service.import_inventory(store_id, lines)
+
+        report = result["response"]["data"]
+        self.assertEqual(result["code"], 200)
+        self.assertEqual(report["imported"], 1)
+        self.assertEqual(report["error_count"], IMPORT_BATCH_SIZE)
+        self.assertEqual(len(report["errors"]), MAX_REPORTED_ERRORS)
+        self.assertEqual(report["errors"][0], {"row": 2, "error": "Row could not be saved."})
+        item_repo = self.store_inventory_service._StoreInventoryService__item_repo
+        item_repo.upsert_items.assert_called_once()
+        # Items of the failed batch may still be in the file, so nothing is removed
+        item_repo.remove_items_not_imported.assert_not_called()
+
+    def test_update_store_inventory_rejects_invalid_file(self):
+        result = self.store_inventory_service.update_store_inventory("64cc28da1c5236ab484f0627",
+                                                                     "data:text/csv;base64,not*base64")
+
+        self.assertEqual(result["code"], 400)
+        self.store_inventory_service._StoreInventoryService__item_repo.upsert_items.assert_not_called()
+        self.store_inventory_service._StoreInventoryService__item_repo.remove_items_not_imported.assert_not_called()
+
     def test_update_inventory_item(self):
         # Test updating inventory item
         store_id = "64cc28da1c5236ab484f0627"
@@ -38,19 +137,24 @@ class TestStoreInventoryService(unittest.TestCase):
             "unit_price": 10.0,
             "stock_supplier": "Supplier1"
         }
-        self.store_inventory_service._StoreInventoryService__repo.update_inventory.return_value = UpdateResult(None, True)
+        self.store_inventory_service._StoreInventoryService__item_repo.update_item.return_value = UpdateResult(None,
+                                                                                                             True)
         result = self.store_inventory_service.update_inventory_item(store_id, item_id, inventory_data)
         self.assertEqual(result["code"], 200)
+        self.store_inventory_service._StoreInventoryService__item_repo.update_item.assert_called_once_with(
+            store_id, item_id, inventory_data)
 
     def test_get_inventory(self):
         # Test getting inventory for a given store ID
         store_id = "64cc28da1c5236ab484f0627"
 
-        self.store_inventory_service._StoreInventoryService__repo.get_inventory.return_value = {"_id": "ABC"}
+        self.store_inventory_service._StoreInventoryService__item_repo.get_items.return_value = [
+            {"item_id": "ABC", "item_name": "Sample Item", "stock_qty": 100}]
 
         result = self.store_inventory_service.get_inventory(store_id)
         self.assertIsNotNone(result)
-        self.assertEqual('ABC', result.get('_id'))
+        self.assertEqual({"store_id": store_id, "inventory": {"ABC": {"item_name": "Sample Item", "stock_qty": 100}}},
+                         result)
 
     def test_add_existing_inventory_item(self):
         # Test adding an inventory item
@@ -63,13 +167,14 @@ class TestStoreInventoryService(unittest.TestCase):
             "unit_price": 5.0,
             "stock_supplier": "Supplier2"
         }
-        self.store_inventory_service._StoreInventoryService__repo.is_exist.return_value = 1
+        self.store_inventory_service._StoreInventoryService__ingredient_service = MagicMock()
+        self.store_inventory_service._StoreInventoryService__item_repo.is_exist.return_value = 1
 
         result = self.store_inventory_service.add_inventory_item(store_id, inventory_item)
 
         self.assertEqual(400, result["code"])
         self.assertEqual('Item already exists.', result.get('response').get('message'))
-        self.store_inventory_service._StoreInventoryService__repo.update_inventory.assert_not_called()
+        self.store_inventory_service._StoreInventoryService__item_repo.add_item.assert_not_called()
 
     def test_add_inventory_item(self):
         # Test adding an inventory item
@@ -82,12 +187,16 @@ class TestStoreInventoryService(unittest.TestCase):
             "unit_price": 5.0,
             "stock_supplier": "Supplier2"
         }
-        self.store_inventory_service._StoreInventoryService__repo.is_exist.return_value = 0
-        self.store_inventory_service._StoreInventoryService__repo.update_inventory.return_value = UpdateResult(
-            {"ok": 1, "updatedExisting": True}, True)
+        self.store_inventory_service._StoreInventoryService__ingredient_service = MagicMock()
+        self.store_inventory_service._StoreInventoryService__ingredient_service.get_ingredient_id.return_value = \
+            "64cc1995a77576259979157a"
+        self.store_inventory_service._StoreInventoryService__item_repo.is_exist.return_value = 0
+        self.store_inventory_service._StoreInventoryService__item_repo.add_item.return_value = InsertOneResult('ABC',
+                                                                                                             True)
         result = self.store_inventory_service.add_inventory_item(store_id, inventory_item)
         self.assertEqual(result["code"], 200)
-        self.store_inventory_service._StoreInventoryService__repo.update_inventory.assert_called_once()
+        self.store_inventory_service._StoreInventoryService__item_repo.add_item.assert_called_once_with(
+            store_id, "64cc1995a77576259979157a", inventory_item)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,55 @@
+import unittest
+from unittest.mock import MagicMock
+
+from service.store_match_service import StoreMatchService
+
+
+class TestStoreMatchService(unittest.TestCase):
+
+    def setUp(self):
+        self.store_match_service = StoreMatchService()
+        self.store_match_service._StoreMatchService__item_repo = MagicMock()
+        self.store_match_service._StoreMatchService__store_repo = MagicMock()
+        self.store_match_service._StoreMatchService__cart_service = MagicMock()
+
+    def test_match_user_shopping_list_ranks_stores_from_one_aggregation(self):
+        self.store_match_service._StoreMatchService__cart_service.get_user_cart_items.return_value = {
+            "shoppingList": {"ing1": {"name": "Tomato"}, "ing2": {"name": "Onion"}, "ing3": {"name": "Basil"}}}
+        self.store_match_service._StoreMatchService__item_repo.get_store_matches.return_value = [
+            {"_id": "64cbf9709fc3f317f81a0f86", "matched_count": 3, "total_price": 6.456,
+             "item_ids": ["ing1", "ing2", "ing3"]},
+            {"_id": "64cbf9709fc3f317f81a0f87", "matched_count": 2, "total_price": 3.0, "item_ids": ["ing3", "ing1"]}]
+        self.store_match_service._StoreMatchService__store_repo.get_stores_by_ids.return_value = [
+            {"_id": "64cbf9709fc3f317f81a0f87", "store_name": "Store B", "address": {},
+             "business_phonenumber": "555-2222"},
+            {"_id": "64cbf9709fc3f317f81a0f86", "store_name": "Store A", "address": {},
+             "business_phonenumber": "555-1111"}]
+
+        result = self.store_match_service.match_user_shopping_list("user1", None)
+
+        self.assertEqual(result["code"], 200)
+        stores = result["response"]["data"]
+        self.assertEqual([store["storeName"] for store in stores], ["Store A", "Store B"])
+        self.assertEqual(stores[0]["coverage"], 1.0)
+        self.assertEqual(stores[0]["total_price"], 6.46)
+        self.assertEqual(stores[1]["missing_items"], ["ing2"])
+        self.store_match_service._StoreMatchService__item_repo.get_store_matches.assert_called_once_with(
+            ["ing1", "ing2", "ing3"], 20)
+
+    def test_match_stores_with_empty_shopping_list(self):
+        result = self.store_match_service.match_stores([], None)
+
+        self.assertEqual(result["code"], 200)
+        self.assertEqual(result["response"]["data"], [])
+        self.store_match_service._StoreMatchService__item_repo.get_store_matches.assert_not_called()
+
+    def test_match_user_shopping_list_rejects_invalid_limit(self):
+        result = self.store_match_service.match_user_shopping_list("64cbd701d9b42f2182a72c17", "abc")
+
+        self.assertEqual(result["code"], 400)
+        self.store_match_service._StoreMatchService__cart_service.get_user_cart_items.assert_not_called()
+        self.store_match_service._StoreMatchService__item_repo.get_store_matches.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+import unittest
+from unittest.mock import MagicMock
+
+from repo.store_repository import StoreRepository
+
+
+class TestStoreRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.store_repository = StoreRepository()
+        self.store_repository.stores = MagicMock()
+
+    def test_get_nearest_breaks_distance_ties_by_id_before_limiting(self):
+        location = {"type": "Point", "coordinates": [-1.5, 52.4]}
+
+        self.store_repository.get_nearest(location, 5)
+
+        pipeline = self.store_repository.stores.aggregate.call_args.args[0]
+        self.assertEqual(pipeline[0]["$geoNear"]["near"], location)
+        self.assertEqual(pipeline[1], {"$sort": {"distance": 1, "_id": 1}})
+        self.assertEqual(pipeline[2], {"$limit": 5})
+
+
+if __name__ == '__main__':
+    unittest.main()
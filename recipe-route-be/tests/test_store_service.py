@@ -1,6 +1,7 @@
 import unittest
 from service.store_service import StoreService
 from unittest.mock import MagicMock
+from service import store_service as store_service_module
 from pymongo.results import InsertOneResult
 
 
@@ -72,6 +73,120 @@ class TestStoreService(unittest.TestCase):
         self.assertEqual(result["response"]["status"], "fail")
         self.store_service.repo.update_store.assert_called_once_with(store_id, store_details)
 
+    def test_update_store_onboarding_with_streamed_inventory(self):
+        inventory_service_mock = MagicMock()
+        inventory_service_mock.import_inventory.return_value = {
+            "response": {"status": "success", "data": {"imported": 2, "ingredients_added": 0, "errors": []}},
+            "code": 200}
+        self.store_service._StoreService__store_inventory_service = inventory_service_mock
+        lines = iter(["item_name,qty,stock,price,type,supplier\n"])
+
+        result = self.store_service.update_store_onboarding("64cc28da1c5236ab484f0627", store_image=None,
+                                                            store_inventory_file=None, store_inventory_lines=lines)
+
+        self.assertEqual(result["code"], 200)
+        self.assertEqual(result["response"]["inventory_report"]["imported"], 2)
+        inventory_service_mock.import_inventory.assert_called_once_with("64cc28da1c5236ab484f0627", lines)
+        inventory_service_mock.update_store_inventory.assert_not_called()
+
+    def test_get_store_inventory_pages_in_query(self):
+        inventory_service = MagicMock()
+        inventory_service.get_inventory_page.return_value = ([
+            {"item_id": "64cc1995a77576259979157a", "item_name": "Tomato", "item_type": "VEGETABLE",
+             "qty_measurement": "1 kg", "unit_price": 2.5, "stock_supplier": "Farm", "stock_qty": 10}], 26)
+        self.store_service._StoreService__store_inventory_service = inventory_service
+
+        result = self.store_service.get_store_inventory("store1", "2", item_type="VEGETABLE", name_prefix="tom",
+                                                        sort_by="stock", order="desc")
+
+        self.assertEqual(result["code"], 200)
+        self.assertEqual(result["response"]["data"]["total_records"], 26)
+        self.assertEqual(result["response"]["data"]["list"][0]["item_id"], "64cc1995a77576259979157a")
+        inventory_service.get_inventory_page.assert_called_once_with(
+            "store1", 25, 25, item_type="VEGETABLE", name_prefix="tom", sort_by="stock", descending=True)
+
+    def test_get_store_inventory_rejects_unknown_sort(self):
+        self.store_service._StoreService__store_inventory_service = MagicMock()
+
+        result = self.store_service.get_store_inventory("store1", None, sort_by="price")
+
+        self.assertEqual(result["code"], 400)
+        self.store_service._StoreService__store_inventory_service.get_inventory_page.assert_not_called()
+
+    def test_get_all_stores_pages_in_query_and_caches_count(self):
+        store_service_module._store_count_cache.clear()
+        self.store_service.repo = MagicMock()
+        stores = [{"_id": f"64cbf9709fc3f317f81a0f{i:02d}", "store_name": f"Store {i}", "address": {},
+                   "business_phonenumber": "555-1234"} for i in range(20)]
+        self.store_service.repo.get_page.return_value = stores
+        self.store_service.repo.count.return_value = 45
+
+        result = self.store_service.get_all_stores("2", False)
+        self.store_service.get_all_stores(None, False, after="64cbf9709fc3f317f81a0f19")
+
+        data = result["response"]["data"]
+        self.assertEqual(len(data["list"]), 20)
+        self.assertEqual(data["total_records"], 45)
+        self.assertEqual(data["next_cursor"], "64cbf9709fc3f317f81a0f19")
+        self.assertEqual(self.store_service.repo.get_page.call_args_list[0].kwargs, {"skip": 20, "after_id": None})
+        self.assertEqual(self.store_service.repo.get_page.call_args_list[1].kwargs,
+                         {"skip": 0, "after_id": "64cbf9709fc3f317f81a0f19"})
+        self.store_service.repo.count.assert_called_once()
+        self.store_service.repo.get_all.assert_not_called()
+
+    def test_get_all_stores_rejects_invalid_cursor(self):
+        self.store_service.repo = MagicMock()
+
+        result = self.store_service.get_all_stores(None, False, after="not-an-id")
+
+        self.assertEqual(result["code"], 400)
+        self.store_service.repo.get_page.assert_not_called()
+
+    def test_get_nearest_stores_caches_per_postcode_area(self):
+        store_service_module._nearest_stores_cache.clear()
+        self.store_service.repo = MagicMock()
+        self.store_service.repo.get_nearest.return_value = [
+            {"_id": "64cbf9709fc3f317f81a0f86", "store_name": "Store ABC", "address": {"post_code": "CV1 2AB"},
+             "business_phonenumber": "555-1234", "distance": 1234.0}]
+
+        result = self.store_service.get_nearest_stores("CV1 2AB", "5")
+        cached_result = self.store_service.get_nearest_stores("CV4 7AL", "5")
+
+        self.assertEqual(result["code"], 200)
+        self.assertEqual(result["response"]["data"]["list"][0]["distance_km"], 1.2)
+        self.assertEqual(cached_result["response"]["data"], result["response"]["data"])
+        self.store_service.repo.get_nearest.assert_called_once_with({"type": "Point", "coordinates": [-1.5, 52.4]},
+                                                                    5)
+
+    def test_get_nearest_stores_rejects_unknown_postcode(self):
+        self.store_service.repo = MagicMock()
+
+        result = self.store_service.get_nearest_stores("not a postcode", None)
+
+        self.assertEqual(result["code"], 400)
+        self.store_service.repo.get_nearest.assert_not_called()
+
+    def test_get_nearest_stores_rejects_invalid_limit(self):
+        self.store_service.repo = MagicMock()
+
+        result = self.store_service.get_nearest_stores("CV1 2AB", "abc")
+
+        self.assertEqual(result["code"], 400)
+        self.store_service.repo.get_nearest.assert_not_called()
+
+    def test_register_store_sets_location_from_postcode(self):
+        self.store_service.repo = MagicMock()
+        self.store_service.repo.get_store.return_value = None
+        self.store_service.repo.add_store.return_value = InsertOneResult('ABC', True)
+        self.store_service._StoreService__store_inventory_service = MagicMock()
+
+        self.store_service.register_store({"user_id": "user1", "store_name": "My Store",
+                                           "address": {"street": "1 Main St", "post_code": "CV1 2AB"},
+                                           "business_phonenumber": "555-1234"})
+
+        stored = self.store_service.repo.add_store.call_args.args[0]
+        self.assertEqual(stored["location"], {"type": "Point", "coordinates": [-1.5, 52.4]})
+
 
 if __name__ == '__main__':
     unittest.main()
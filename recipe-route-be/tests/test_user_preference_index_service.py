@@ -0,0 +1,70 @@
+import unittest
+
+from service.user_preference_index_service import UserPreferenceIndexService
+
+
+class TestUserPreferenceIndexService(unittest.TestCase):
+
+    def setUp(self):
+        self.user_index = UserPreferenceIndexService()
+        self.user_index.load([
+            {"id": "u1", "favorites": ["r1", "r2", "r3"], "allergens_and_not_preferred": ["i1"]},
+            {"id": "u2", "favorites": ["r1", "r4"], "allergens_and_not_preferred": []},
+            {"id": "u3", "favorites": ["r5"], "allergens_and_not_preferred": ["i1", "i2"]},
+            {"id": "u4", "favorites": ["r6"], "allergens_and_not_preferred": []},
+        ])
+        self.current_user = {"id": "u1", "favorites": ["r1", "r2"], "allergens_and_not_preferred": ["i1"]}
+
+    def test_similar_users_are_ranked_and_exclude_current_user(self):
+        result = self.user_index.similar_users(self.current_user, top_k=10)
+
+        self.assertEqual(result, [("u2", 1), ("u3", -1)])
+
+    def test_similar_users_top_k(self):
+        result = self.user_index.similar_users(self.current_user, top_k=1)
+
+        self.assertEqual(result, [("u2", 1)])
+
+    def test_recommend_recipes_orders_by_most_similar_user(self):
+        result = self.user_index.recommend_recipes(self.current_user, top_k=10)
+
+        self.assertEqual(result[:2], ["r1", "r4"])
+        self.assertEqual(result[2], "r5")
+        self.assertNotIn("r6", result)
+
+    def test_update_user_changes_similarity(self):
+        self.user_index.update_user("u4", favorites=["r2", "r6"])
+
+        result = self.user_index.similar_users(self.current_user, top_k=10)
+
+        self.assertIn(("u4", 1), result)
+
+    def test_get_user_returns_snapshot(self):
+        self.user_index.update_user("u2", allergens=["i2"])
+
+        self.assertEqual(self.user_index.get_user("u2"),
+                         {"id": "u2", "favorites": ["r1", "r4"], "allergens_and_not_preferred": ["i2"]})
+        self.assertIsNone(self.user_index.get_user("u9"))
+
+    def test_user_version_changes_on_write_and_reload(self):
+        version = self.user_index.get_user_version("u1")
+
+        self.user_index.update_user("u2", favorites=["r1"])
+        self.assertEqual(self.user_index.get_user_version("u1"), version)
+
+        self.user_index.update_user("u1", favorites=["r1"])
+        updated_version = self.user_index.get_user_version("u1")
+        self.assertNotEqual(updated_version, version)
+
+        self.user_index.load([])
+        self.assertNotEqual(self.user_index.get_user_version("u1"), updated_version)
+
+    def test_update_user_before_load_is_ignored(self):
+        user_index = UserPreferenceIndexService()
+        user_index.update_user("u1", favorites=["r1"])
+
+        self.assertFalse(user_index.is_loaded())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -136,6 +136,17 @@ class TestUserService(unittest.TestCase):
         self.assertEqual(len(result), 3)
         self.user_repository_mock.get_all.assert_called_once()
 
+    def test_get_users_preferences_uses_projection(self):
+        self.user_repository_mock.get_all_preferences.return_value = [
+            {"_id": "64ccb7c4802f124e25eab5a0", "preferences": {"favorites": ["64cbfd31c7812a6675bdd052"]}}]
+
+        result = self.user_service.get_users_preferences(updated_since="2023-08-01")
+
+        self.assertEqual(result, [{"id": "64ccb7c4802f124e25eab5a0", "favorites": ["64cbfd31c7812a6675bdd052"],
+                                   "allergens_and_not_preferred": []}])
+        self.user_repository_mock.get_all_preferences.assert_called_once_with(
+            {"role": "USER", "preferences_updated_on": {"$gte": "2023-08-01"}})
+
     def test_get_user_details(self):
         # Test the get_user_details method with an existing user
         test_user_id = "64ccb7c4802f124e25eab5a0"
@@ -168,6 +179,33 @@ class TestUserService(unittest.TestCase):
         self.assertEqual(result["code"], 404)
         self.user_repository_mock.get_user_by_id.assert_called_once_with(test_user_id)
 
+    def test_update_favorites_updates_user_index(self):
+        test_user_id = "64ccb7c4802f124e25eab5a0"
+        user_index_mock = MagicMock()
+        self.user_service._UserService__user_index = user_index_mock
+        self.user_repository_mock.get_user_by_id.return_value = {
+            "_id": test_user_id, "preferences": {"favorites": ["64cbfd31c7812a6675bdd052"]}}
+
+        result = self.user_service.update_favorites("64cbffeb9526faa1acf0dec4", test_user_id)
+
+        self.assertEqual(result["code"], 200)
+        user_index_mock.update_user.assert_called_once_with(
+            test_user_id, favorites=["64cbfd31c7812a6675bdd052", "64cbffeb9526faa1acf0dec4"])
+
+    def test_update_preferences_updates_user_index_for_allergens(self):
+        test_user_id = "64ccb7c4802f124e25eab5a0"
+        user_index_mock = MagicMock()
+        self.user_service._UserService__user_index = user_index_mock
+        self.user_repository_mock.get_user_by_id.return_value = {
+            "_id": test_user_id, "preferences": {"favorites": [], "allergens_and_not_preferred": []}}
+
+        self.user_service.update_preferences({"allergens_and_not_preferred": ["64cc0e8ad5b0a20fd40101d1"]},
+                                             test_user_id)
+        self.user_service.update_preferences({"is_onboarding_complete": True}, test_user_id)
+
+        user_index_mock.update_user.assert_called_once_with(test_user_id, favorites=[],
+                                                            allergens=["64cc0e8ad5b0a20fd40101d1"])
+
 
 if __name__ == '__main__':
     unittest.main()
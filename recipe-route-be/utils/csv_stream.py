@@ -0,0 +1,31 @@
+import base64
+import codecs
+import gzip
+import io
+
+DECODE_CHUNK_SIZE = 64 * 1024
+GZIP_MIMETYPES = ("application/gzip", "application/x-gzip")
+
+
+def iter_base64_lines(data_url, chunk_size=DECODE_CHUNK_SIZE):
+    # Decodes a "data:text/csv;base64,..." string a slice at a time and yields text lines for csv.reader
+    start = data_url.find(",") + 1
+    chunk_size -= chunk_size % 4
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ''
+    for offset in range(start, len(data_url), chunk_size):
+        text = decoder.decode(base64.b64decode(data_url[offset:offset + chunk_size], validate=True))
+        lines = (pending + text).splitlines(keepends=True)
+        # Hold back a trailing partial line, including a "\r" whose "\n" may start the next slice
+        pending = lines.pop() if lines and not lines[-1].endswith("\n") else ''
+        yield from lines
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+
+def iter_stream_lines(stream, is_gzip=False, encoding="utf-8"):
+    # Reads a binary upload stream, optionally gzip compressed, as text lines without buffering it whole
+    if is_gzip:
+        stream = gzip.GzipFile(fileobj=stream, mode="rb")
+    yield from io.TextIOWrapper(stream, encoding=encoding, newline='')
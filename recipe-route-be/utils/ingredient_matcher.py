@@ -0,0 +1,103 @@
+import threading
+
+import numpy as np
+from fuzzywuzzy import fuzz, utils
+
+from utils.lru_cache import LRUCache
+
+# Confidence threshold is 86, below which ingredient is not considered
+MATCH_THRESHOLD = 86
+CANDIDATE_COUNT = 20
+MEMO_SIZE = 10000
+
+_NOT_CACHED = object()
+
+
+class IngredientMatcher:
+    # Gives the same answers as process.extractOne(name, names) with fuzz.WRatio above MATCH_THRESHOLD.
+    # WRatio only clears the threshold for names of similar length or for a name contained almost verbatim in
+    # the other, so candidates are the names sharing the most character trigrams with the query.
+    def __init__(self, ingredient_ids, candidate_count=CANDIDATE_COUNT, memo_size=MEMO_SIZE):
+        # ingredient_ids maps ingredient names to ids
+        self.__ids = [str(ingredient_id) for ingredient_id in ingredient_ids.values()]
+        self.__names = [utils.full_process(name) for name in ingredient_ids.keys()]
+        self.__candidate_count = candidate_count
+        self.__memo = LRUCache(memo_size)
+        # add() grows several structures that __match reads together, so the two never run at the same time
+        self.__lock = threading.Lock()
+        self.__row_by_name = {}
+        postings = {}
+        for row, name in enumerate(self.__names):
+            self.__row_by_name.setdefault(name, row)
+            for trigram in self.__trigrams(name):
+                postings.setdefault(trigram, []).append(row)
+        self.__postings = {trigram: np.array(rows, dtype=np.int64) for trigram, rows in postings.items()}
+        self.__trigram_counts = np.array([len(self.__trigrams(name)) for name in self.__names], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.__ids)
+
+    def add(self, name, ingredient_id):
+        name = utils.full_process(name)
+        with self.__lock:
+            row = len(self.__ids)
+            self.__ids.append(str(ingredient_id))
+            self.__names.append(name)
+            self.__row_by_name.setdefault(name, row)
+            for trigram in self.__trigrams(name):
+                rows = self.__postings.get(trigram, np.array([], dtype=np.int64))
+                self.__postings[trigram] = np.append(rows, row)
+            self.__trigram_counts = np.append(self.__trigram_counts, len(self.__trigrams(name)))
+            # A name that missed before may match the new ingredient
+            self.__memo.clear()
+
+    def match(self, name):
+        key = str(name).lower()
+        ingredient_id = self.__memo.get(key, _NOT_CACHED)
+        if ingredient_id is _NOT_CACHED:
+            # Memoised under the lock too, so a miss computed before an add cannot land after its clear()
+            with self.__lock:
+                ingredient_id = self.__match(key)
+                self.__memo.set(key, ingredient_id)
+        return ingredient_id
+
+    def get_stats(self):
+        return self.__memo.get_stats()
+
+    @staticmethod
+    def __trigrams(text):
+        if len(text) < 3:
+            return {text} if text else set()
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def __candidates(self, query):
+        trigrams = self.__trigrams(query)
+        postings = [self.__postings[trigram] for trigram in trigrams if trigram in self.__postings]
+        if not postings:
+            return np.array([], dtype=np.int64)
+        shared = np.bincount(np.concatenate(postings), minlength=len(self.__ids))
+        rows = np.flatnonzero(shared)
+        shared = shared[rows]
+        name_counts = self.__trigram_counts[rows]
+        containment = shared / np.minimum(len(trigrams), name_counts)
+        dice = 2 * shared / (len(trigrams) + name_counts)
+        top = np.lexsort((rows, -dice, -containment))[:self.__candidate_count]
+        return np.sort(rows[top])
+
+    def __match(self, name):
+        query = utils.full_process(name)
+        if not query:
+            return None
+        row = self.__row_by_name.get(query)
+        if row is not None:
+            return self.__ids[row]
+
+        # Rows are scored in catalog order so ties resolve to the same name extractOne would pick
+        best_row, best_score = None, -1
+        for row in self.__candidates(query):
+            score = fuzz.WRatio(query, self.__names[row])
+            if score > best_score:
+                best_row, best_score = row, score
+        if best_score > MATCH_THRESHOLD:
+            return self.__ids[best_row]
+        return None
@@ -0,0 +1,63 @@
+import math
+
+import numpy as np
+from bson import ObjectId
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Dates keep the HTTP date format Flask's encoder has always sent, so clients see the same payloads
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY \
+    if orjson else 0
+
+
+def _finite(o):
+    # NaN and Infinity are not valid JSON; orjson sends them as null, so the standard encoder path does too
+    if isinstance(o, float):
+        return o if math.isfinite(o) else None
+    if isinstance(o, dict):
+        return {key: _finite(value) for key, value in o.items()}
+    if isinstance(o, (list, tuple)):
+        return [_finite(value) for value in o]
+    return o
+
+
+def _default(o):
+    if isinstance(o, ObjectId):
+        return str(o)
+    if isinstance(o, np.generic):
+        return _finite(o.item())
+    if isinstance(o, np.ndarray):
+        return _finite(o.tolist())
+    return DefaultJSONProvider.default(o)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    # Serializes with orjson when it is installed and falls back to the standard library encoder otherwise.
+    # Both paths decode to the same values: ObjectId, datetime and NumPy values are encoded alike, text is sent
+    # as UTF-8 rather than \u escapes and non-finite floats become null. The bytes can still differ, e.g. orjson
+    # writes 0.00001 where the standard encoder writes 1e-05.
+    default = staticmethod(_default)
+    ensure_ascii = False
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(_finite(obj), **kwargs)
+        return self.__encode(obj).decode()
+
+    def response(self, *args, **kwargs):
+        # Pretty printed debug responses and the deprecated JSONIFY_* settings go through the standard encoder.
+        # Flask 2.3 dropped those settings, so they are read with get().
+        if orjson is None or self.compact is False or (self.compact is None and self._app.debug) \
+                or self._app.config.get("JSONIFY_PRETTYPRINT_REGULAR") is not None \
+                or self._app.config.get("JSONIFY_MIMETYPE") is not None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.__encode(obj) + b"\n", mimetype=self.mimetype)
+
+    def __encode(self, obj):
+        options = ORJSON_OPTIONS | orjson.OPT_SORT_KEYS if self.sort_keys else ORJSON_OPTIONS
+        return orjson.dumps(obj, default=_default, option=options)
@@ -0,0 +1,151 @@
+import re
+
+# Approximate centre (latitude, longitude) of every UK postcode area, so stores can be placed on the map without
+# calling a geocoding service. Area level is coarse (roughly a county): every postcode in an area maps to the same
+# point, so "nearest" orders stores by area and stores within one area are not ranked against each other.
+POSTCODE_AREA_CENTROIDS = {
+    "AB": (57.20, -2.40),
+    "AL": (51.76, -0.33),
+    "B": (52.48, -1.89),
+    "BA": (51.30, -2.50),
+    "BB": (53.76, -2.40),
+    "BD": (53.83, -1.85),
+    "BH": (50.75, -1.90),
+    "BL": (53.58, -2.43),
+    "BN": (50.85, -0.15),
+    "BR": (51.38, 0.05),
+    "BS": (51.45, -2.60),
+    "BT": (54.60, -6.50),
+    "CA": (54.75, -3.00),
+    "CB": (52.20, 0.15),
+    "CF": (51.52, -3.25),
+    "CH": (53.20, -2.95),
+    "CM": (51.75, 0.45),
+    "CO": (51.90, 0.90),
+    "CR": (51.36, -0.10),
+    "CT": (51.28, 1.10),
+    "CV": (52.40, -1.50),
+    "CW": (53.10, -2.45),
+    "DA": (51.43, 0.20),
+    "DD": (56.50, -2.95),
+    "DE": (52.90, -1.50),
+    "DG": (55.10, -3.70),
+    "DH": (54.80, -1.60),
+    "DL": (54.45, -1.65),
+    "DN": (53.55, -0.95),
+    "DT": (50.72, -2.45),
+    "DY": (52.48, -2.12),
+    "E": (51.53, -0.03),
+    "EC": (51.52, -0.10),
+    "EH": (55.92, -3.20),
+    "EN": (51.67, -0.08),
+    "EX": (50.75, -3.55),
+    "FK": (56.05, -3.90),
+    "FY": (53.83, -3.00),
+    "G": (55.86, -4.25),
+    "GL": (51.85, -2.20),
+    "GU": (51.25, -0.75),
+    "GY": (49.45, -2.58),
+    "HA": (51.58, -0.35),
+    "HD": (53.63, -1.80),
+    "HG": (54.00, -1.55),
+    "HP": (51.70, -0.70),
+    "HR": (52.08, -2.75),
+    "HS": (57.80, -7.00),
+    "HU": (53.78, -0.40),
+    "HX": (53.72, -1.90),
+    "IG": (51.57, 0.08),
+    "IM": (54.23, -4.55),
+    "IP": (52.15, 1.15),
+    "IV": (57.50, -4.70),
+    "JE": (49.21, -2.13),
+    "KA": (55.55, -4.60),
+    "KT": (51.38, -0.30),
+    "KW": (58.60, -3.50),
+    "KY": (56.20, -3.15),
+    "L": (53.41, -2.95),
+    "LA": (54.10, -2.70),
+    "LD": (52.25, -3.40),
+    "LE": (52.63, -1.10),
+    "LL": (53.05, -3.80),
+    "LN": (53.23, -0.45),
+    "LS": (53.80, -1.55),
+    "LU": (51.88, -0.45),
+    "M": (53.48, -2.24),
+    "ME": (51.35, 0.55),
+    "MK": (52.05, -0.75),
+    "ML": (55.75, -3.90),
+    "N": (51.57, -0.11),
+    "NE": (55.00, -1.65),
+    "NG": (53.00, -1.10),
+    "NN": (52.30, -0.85),
+    "NP": (51.65, -3.00),
+    "NR": (52.65, 1.30),
+    "NW": (51.55, -0.18),
+    "OL": (53.55, -2.10),
+    "OX": (51.75, -1.30),
+    "PA": (55.90, -5.20),
+    "PE": (52.60, -0.10),
+    "PH": (56.60, -3.80),
+    "PL": (50.40, -4.20),
+    "PO": (50.82, -1.05),
+    "PR": (53.75, -2.70),
+    "RG": (51.43, -1.00),
+    "RH": (51.15, -0.15),
+    "RM": (51.55, 0.20),
+    "S": (53.38, -1.47),
+    "SA": (51.80, -4.10),
+    "SE": (51.47, -0.06),
+    "SG": (51.90, -0.20),
+    "SK": (53.37, -2.10),
+    "SL": (51.50, -0.65),
+    "SM": (51.36, -0.18),
+    "SN": (51.55, -1.85),
+    "SO": (50.92, -1.40),
+    "SP": (51.10, -1.80),
+    "SR": (54.90, -1.40),
+    "SS": (51.55, 0.65),
+    "ST": (52.95, -2.10),
+    "SW": (51.46, -0.17),
+    "SY": (52.60, -3.00),
+    "TA": (51.02, -3.10),
+    "TD": (55.60, -2.50),
+    "TF": (52.68, -2.45),
+    "TN": (51.10, 0.30),
+    "TQ": (50.45, -3.60),
+    "TR": (50.20, -5.20),
+    "TS": (54.57, -1.25),
+    "TW": (51.45, -0.35),
+    "UB": (51.53, -0.42),
+    "W": (51.51, -0.19),
+    "WA": (53.40, -2.55),
+    "WC": (51.52, -0.12),
+    "WD": (51.66, -0.40),
+    "WF": (53.68, -1.45),
+    "WN": (53.55, -2.65),
+    "WR": (52.20, -2.20),
+    "WS": (52.60, -1.95),
+    "WV": (52.58, -2.12),
+    "YO": (54.00, -1.00),
+    "ZE": (60.30, -1.30),
+}
+
+POSTCODE_PATTERN = re.compile(r"^([A-Z]{1,2})[0-9][0-9A-Z]?\s*[0-9][A-Z]{2}$|^([A-Z]{1,2})[0-9][0-9A-Z]?$")
+
+
+def get_postcode_area(post_code):
+    # Accepts a full postcode ("CV1 2AB") or an outward code ("CV1")
+    match = POSTCODE_PATTERN.match(str(post_code or "").strip().upper())
+    if not match:
+        return None
+    area = match.group(1) or match.group(2)
+    return area if area in POSTCODE_AREA_CENTROIDS else None
+
+
+def get_postcode_location(post_code):
+    # GeoJSON Point for the 2dsphere index; coordinates are [longitude, latitude]
+    area = get_postcode_area(post_code)
+    if area is None:
+        return None
+    latitude, longitude = POSTCODE_AREA_CENTROIDS[area]
+    return {"type": "Point", "coordinates": [longitude, latitude]}
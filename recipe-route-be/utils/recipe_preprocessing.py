@@ -0,0 +1,81 @@
+import re
+import string
+from fractions import Fraction
+
+from nltk.tokenize import word_tokenize
+
+# Bump when the parsing below changes so web workers report recipes that still need reprocessing
+PREPROCESSING_VERSION = 1
+PREPROCESSING_VERSION_KEY = 'recipe_preprocessing_version'
+
+MEASUREMENT_TERMS = [
+    "sprigs", "cups", "cup", "cloves", "teaspoon", "teaspoons", "tsp",
+    "tablespoon", "tablespoons", "tbsp", "ribs", "pound", "pounds",
+    "piece", "pieces", "ounce", "pinch", "lb", "clove", "stick", "ounces", "heads", "head"
+]
+SKIPPED_INGREDIENT_TERMS = ["equipment", "garnish", "accompaniment", "water", "ice", "optional"]
+
+AMOUNT_PATTERN = re.compile(r"((\d+\s+)?\d+\s+\d+/\d+|\d+/\d+|\d+)")
+MEASUREMENT_PATTERN = re.compile(r"\b(" + "|".join(MEASUREMENT_TERMS) + r")\b")
+NAME_PATTERN = re.compile(r"(\d+(\s+\d+\/\d+)?)\s*(\b(" + "|".join(MEASUREMENT_TERMS) + r")\b)?")
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+# Fractions such as 1/2 have to survive until the quantity is parsed
+INGREDIENT_PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation.replace('/', ''))
+
+
+def remove_stopwords(stop_text, stop_words):
+    return ' '.join([word for word in stop_text.split() if word.lower() not in stop_words])
+
+
+def search_terms(text, stop_words):
+    # Lowercased, punctuation-free words without stop words, the same clean-up preprocess_recipe applies, so search
+    # queries and stored recipe text produce matching terms
+    return [word for word in str(text or '').lower().translate(PUNCTUATION_TABLE).split() if word not in stop_words]
+
+
+def convert_ingredients(ingredients, get_ingredient_id):
+    converted_data = []
+    ingredients_str = ''
+
+    for ingredient in ingredients:
+        # Skip equipment, garnish, accompaniment and other lines that are not shopping ingredients
+        if any(term in ingredient.lower() for term in SKIPPED_INGREDIENT_TERMS):
+            continue
+        ingredient_obj = {"ingredient": "", "qty": "", "measurement": ""}
+
+        amount_match = AMOUNT_PATTERN.match(ingredient)
+        if amount_match:
+            qty = amount_match.group(0)
+            # Convert fraction to float
+            if "/" in qty:
+                qty = str(round(float(sum(Fraction(s) for s in qty.split())), 2)).rstrip("0").rstrip(".")
+            ingredient_obj["qty"] = qty.strip()
+
+        measurement_match = MEASUREMENT_PATTERN.search(ingredient)
+        if measurement_match:
+            ingredient_obj["measurement"] = measurement_match.group(0).strip()
+
+        ingredient_name = NAME_PATTERN.sub("", ingredient).strip().lstrip("/")
+        ingredient_obj["ingredient"] = ingredient_name
+        ingredient_obj["id"] = get_ingredient_id(ingredient_name)
+        ingredients_str = ingredients_str + " " + ingredient_name
+        converted_data.append(ingredient_obj)
+    return converted_data, ingredients_str
+
+
+def _clean_lines(lines, stop_words):
+    if not isinstance(lines, list):
+        return lines
+    return [remove_stopwords(line.translate(INGREDIENT_PUNCTUATION_TABLE), stop_words) for line in lines]
+
+
+def preprocess_recipe(recipe, stop_words, get_ingredient_id, tokenize=word_tokenize):
+    # Returns the fields to $set on the recipe document
+    title = (recipe.get("title") or '').translate(PUNCTUATION_TABLE)
+    title = ' '.join([word for word in tokenize(title) if word not in stop_words])
+    ingredients = _clean_lines(recipe.get("ingredients") or '', stop_words)
+    directions = _clean_lines(recipe.get("directions") or '', stop_words)
+
+    formatted_ingredients, all_ingredients = convert_ingredients(ingredients, get_ingredient_id)
+    return {"title": title, "ingredients": ingredients, "directions": directions,
+            "formatted_ingredients": formatted_ingredients, "all_ingredients": all_ingredients}